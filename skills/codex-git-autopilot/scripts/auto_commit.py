@@ -8,12 +8,13 @@ import argparse
 import json
 import os
 import re
+import shutil
 import subprocess
 import sys
-import textwrap
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 COMMIT_TYPES = {
     "feat": ["models", "controllers", "services", "routes", "components", "pages"],
@@ -27,6 +28,16 @@ COMMIT_TYPES = {
     "perf": ["perf", "optimize", "cache", "workers"],
 }
 
+# Per commit type, in COMMIT_TYPES order: extension suffixes (from "*.x" hints) and (dir-pattern, substring) pairs.
+_COMMIT_TYPE_MATCHERS: List[Tuple[str, Tuple[str, ...], Tuple[Tuple[str, str], ...]]] = [
+    (
+        ctype,
+        tuple(hint[1:] for hint in hints if hint.startswith("*.")),
+        tuple((f"/{hint.lower()}/", hint.lower()) for hint in hints if not hint.startswith("*.")),
+    )
+    for ctype, hints in COMMIT_TYPES.items()
+]
+
 SKIP_DIRS = {
     ".git",
     "node_modules",
@@ -40,9 +51,27 @@ SKIP_DIRS = {
 }
 
 _GPG_PATH: str = ""
+_SECRET_KEYS: Optional[List[Dict[str, Any]]] = None
+GPG_PATH_CACHE = Path.home() / ".codex" / "gpg_path"
+_SP_DEFAULTS: Dict[str, Any] = {
+    "capture_output": True,
+    "text": True,
+    "encoding": "utf-8",
+    "errors": "replace",
+    "check": False,
+}
+# CREATE_NO_WINDOW keeps Windows from attaching a console host to every child process.
+_SP_CREATION: Dict[str, Any] = {"creationflags": 0x08000000} if sys.platform == "win32" else {}
+# Agents consume stdout through a pipe; only pretty-print for an interactive terminal.
+_COMPACT_OUTPUT = not sys.stdout.isatty()
+# A "{" can only open a JSON object if the next non-space char starts a key or closes it.
+_GPG_KEY_SPEC = re.compile(r"(?:0[xX])?([0-9A-Fa-f]{40}|[0-9A-Fa-f]{16}|[0-9A-Fa-f]{8})")
+_JSON_OBJECT_START = re.compile(r"\{\s*[\"}]")
 
 
 def parse_args() -> argparse.Namespace:
+    import textwrap
+
     parser = argparse.ArgumentParser(
         description="Auto-commit with CI/CD gate, GPG signing, and conventional commits.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -68,26 +97,27 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--skip-tests", action="store_true", help="Skip test runner in pre-commit gate")
     parser.add_argument("--dry-run", action="store_true", help="Preview commit without executing")
     parser.add_argument("--no-push", action="store_true", help="Commit only, do not push")
+    parser.add_argument("--no-sign", action="store_true", help="Commit unsigned without probing GPG")
     parser.add_argument("--setup-gpg", action="store_true", help="Interactive GPG setup wizard")
     return parser.parse_args()
 
 
+def _sp_run(cmd: List[str], timeout: int = 10, **overrides: Any) -> subprocess.CompletedProcess:
+    """subprocess.run with the module's capture/encoding defaults; overrides win."""
+    return subprocess.run(cmd, timeout=timeout, **{**_SP_DEFAULTS, **_SP_CREATION, **overrides})
+
+
 def emit(payload: Dict[str, object]) -> None:
-    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    if _COMPACT_OUTPUT:
+        print(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+    else:
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
 
 
-def run_git(project_root: Path, args: List[str], timeout: int = 60) -> subprocess.CompletedProcess:
+def run_git(project_root: Union[str, Path], args: List[str], timeout: int = 60) -> subprocess.CompletedProcess:
+    cwd = project_root if isinstance(project_root, str) else str(project_root)
     try:
-        return subprocess.run(
-            ["git", *args],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            check=False,
-            timeout=timeout,
-        )
+        return _sp_run(["git", *args], timeout=timeout, cwd=cwd)
     except subprocess.TimeoutExpired:
         return subprocess.CompletedProcess(
             args=["git", *args],
@@ -97,28 +127,20 @@ def run_git(project_root: Path, args: List[str], timeout: int = 60) -> subproces
         )
 
 
-def git_ready(project_root: Path) -> bool:
+def git_ready(project_root: Union[str, Path]) -> bool:
     result = run_git(project_root, ["rev-parse", "--is-inside-work-tree"])
     return result.returncode == 0 and result.stdout.strip().lower() == "true"
 
 
 def get_git_config(key: str) -> str:
     try:
-        result = subprocess.run(
-            ["git", "config", "--global", key],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            check=False,
-            timeout=10,
-        )
+        result = _sp_run(["git", "config", "--global", key])
         return result.stdout.strip() if result.returncode == 0 else ""
     except (subprocess.TimeoutExpired, OSError):
         return ""
 
 
-def get_current_branch(project_root: Path) -> str:
+def get_current_branch(project_root: Union[str, Path]) -> str:
     result = run_git(project_root, ["branch", "--show-current"])
     return result.stdout.strip() if result.returncode == 0 else "unknown"
 
@@ -126,15 +148,7 @@ def get_current_branch(project_root: Path) -> str:
 def find_gpg_executable() -> str:
     """Find gpg executable, checking PATH and known install locations."""
     try:
-        result = subprocess.run(
-            ["gpg", "--version"],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            timeout=10,
-            check=False,
-        )
+        result = _sp_run(["gpg", "--version"])
         if result.returncode == 0:
             return "gpg"
     except (FileNotFoundError, subprocess.TimeoutExpired):
@@ -153,15 +167,7 @@ def find_gpg_executable() -> str:
             if not candidate.exists():
                 continue
             try:
-                result = subprocess.run(
-                    [str(candidate), "--version"],
-                    capture_output=True,
-                    text=True,
-                    encoding="utf-8",
-                    errors="replace",
-                    timeout=10,
-                    check=False,
-                )
+                result = _sp_run([str(candidate), "--version"])
                 if result.returncode == 0:
                     return str(candidate)
             except (subprocess.TimeoutExpired, OSError):
@@ -170,11 +176,34 @@ def find_gpg_executable() -> str:
     return ""
 
 
+def read_cached_gpg_path() -> str:
+    """Return the GPG path recorded by a previous run if it still exists."""
+    try:
+        cached = GPG_PATH_CACHE.read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+    if cached and (Path(cached).is_file() or shutil.which(cached)):
+        return cached
+    return ""
+
+
+def write_cached_gpg_path(path: str) -> None:
+    try:
+        GPG_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        GPG_PATH_CACHE.write_text(path, encoding="utf-8")
+    except OSError:
+        pass
+
+
 def get_gpg_cmd() -> str:
-    """Get resolved GPG command path. Cached after first call."""
+    """Get resolved GPG command path. Cached in-process and on disk after first discovery."""
     global _GPG_PATH
+    if not _GPG_PATH:
+        _GPG_PATH = read_cached_gpg_path()
     if not _GPG_PATH:
         _GPG_PATH = find_gpg_executable()
+        if _GPG_PATH:
+            write_cached_gpg_path(_GPG_PATH)
     return _GPG_PATH
 
 
@@ -186,6 +215,55 @@ def get_gpg_signing_key() -> str:
     return get_git_config("user.signingkey")
 
 
+def parse_secret_keys(output: str) -> List[Dict[str, Any]]:
+    """Parse `gpg --list-secret-keys --with-colons` into primary keys with subkeys, fingerprints, and uids."""
+    keys: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for line in output.splitlines():
+        fields = line.split(":")
+        record = fields[0]
+        if record == "sec":
+            current = {"keyid": fields[4] if len(fields) > 4 else "", "subkeys": [], "fingerprints": [], "uids": []}
+            keys.append(current)
+        elif current is not None and record == "ssb" and len(fields) > 4:
+            current["subkeys"].append(fields[4])
+        elif current is not None and record == "fpr" and len(fields) > 9:
+            current["fingerprints"].append(fields[9])
+        elif current is not None and record == "uid" and len(fields) > 9:
+            current["uids"].append(fields[9])
+    return keys
+
+
+def list_secret_keys(refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """List the secret keyring once per run; None when gpg could not be executed."""
+    global _SECRET_KEYS
+    if _SECRET_KEYS is not None and not refresh:
+        return _SECRET_KEYS
+    try:
+        result = _sp_run([get_gpg_cmd(), "--list-secret-keys", "--with-colons"])
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    _SECRET_KEYS = parse_secret_keys(result.stdout) if result.returncode == 0 else []
+    return _SECRET_KEYS
+
+
+def find_secret_key(keys: List[Dict[str, Any]], query: str) -> str:
+    """Match a key ID, fingerprint, or user-ID substring the way gpg resolves key specs."""
+    needle = query.strip().rstrip("!")
+    # gpg only reads 8, 16 or 40 hex digits (optionally 0x-prefixed) as a key ID or fingerprint;
+    # anything else, even "cafe", is a user-ID search and must not suffix-match a fingerprint.
+    hex_match = _GPG_KEY_SPEC.fullmatch(needle)
+    hex_id = hex_match.group(1).upper() if hex_match else ""
+    lowered = needle.lower()
+    for key in keys:
+        key_ids = [str(key["keyid"]).upper(), *(subkey.upper() for subkey in key["subkeys"])]
+        if hex_id and (hex_id in key_ids or any(fpr.upper().endswith(hex_id) for fpr in key["fingerprints"])):
+            return key["keyid"]
+        if lowered and any(lowered in uid.lower() for uid in key["uids"]):
+            return key["keyid"]
+    return ""
+
+
 def is_gpg_configured() -> Tuple[bool, str]:
     if not check_gpg_available():
         return False, "GPG not installed. Run: winget install GnuPG.GnuPG"
@@ -194,18 +272,11 @@ def is_gpg_configured() -> Tuple[bool, str]:
     if not key:
         return False, "No signing key configured. Run: python auto_commit.py --setup-gpg"
 
-    try:
-        result = subprocess.run(
-            [get_gpg_cmd(), "--list-secret-keys", key],
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=False,
-        )
-        if result.returncode != 0:
-            return False, f"Signing key {key} not found in GPG keyring"
-    except (subprocess.TimeoutExpired, OSError):
+    keys = list_secret_keys()
+    if keys is None:
         return False, "Failed to verify GPG key"
+    if not find_secret_key(keys, key):
+        return False, f"Signing key {key} not found in GPG keyring"
 
     return True, f"GPG ready (key: ...{key[-8:]})"
 
@@ -243,15 +314,7 @@ def setup_gpg_wizard() -> Dict[str, object]:
             ["choco", "install", "gnupg", "-y"],
         ]:
             try:
-                install_result = subprocess.run(
-                    installer_cmd,
-                    capture_output=True,
-                    text=True,
-                    encoding="utf-8",
-                    errors="replace",
-                    timeout=120,
-                    check=False,
-                )
+                install_result = _sp_run(installer_cmd, timeout=120)
                 if install_result.returncode == 0:
                     break
             except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
@@ -284,14 +347,9 @@ def setup_gpg_wizard() -> Dict[str, object]:
         result: Optional[subprocess.CompletedProcess[str]] = None
 
         try:
-            result = subprocess.run(
+            result = _sp_run(
                 [get_gpg_cmd(), "--batch", "--quick-generate-key", identity, "rsa4096", "sign", "never"],
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
                 timeout=60,
-                check=False,
             )
         except subprocess.TimeoutExpired:
             emit({"status": "error", "message": "GPG key generation timed out"})
@@ -302,7 +360,7 @@ def setup_gpg_wizard() -> Dict[str, object]:
 
         if result.returncode != 0:
             try:
-                result = subprocess.run(
+                result = _sp_run(
                     [
                         get_gpg_cmd(),
                         "--batch",
@@ -314,12 +372,7 @@ def setup_gpg_wizard() -> Dict[str, object]:
                         "sign",
                         "never",
                     ],
-                    capture_output=True,
-                    text=True,
-                    encoding="utf-8",
-                    errors="replace",
                     timeout=60,
-                    check=False,
                 )
             except subprocess.TimeoutExpired:
                 emit({"status": "error", "message": "GPG key generation timed out"})
@@ -339,7 +392,7 @@ def setup_gpg_wizard() -> Dict[str, object]:
                 )
                 return {"status": "error"}
 
-        key_id = find_existing_gpg_key(email)
+        key_id = find_existing_gpg_key(email, refresh=True)
         if not key_id:
             emit({"status": "error", "message": "Key generated but could not find key ID"})
             return {"status": "error"}
@@ -356,43 +409,19 @@ def setup_gpg_wizard() -> Dict[str, object]:
         configs.append(["config", "--global", "gpg.program", gpg_path])
 
     for config_args in configs:
-        subprocess.run(
-            ["git", *config_args],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            timeout=10,
-            check=False,
-        )
+        _sp_run(["git", *config_args])
     emit({"status": "progress", "step": "3/5", "message": "Git signing configured [OK]"})
 
     emit({"status": "exporting", "step": "4/5", "message": "Exporting public key..."})
     try:
-        export_result = subprocess.run(
-            [get_gpg_cmd(), "--armor", "--export", key_id],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            timeout=10,
-            check=False,
-        )
+        export_result = _sp_run([get_gpg_cmd(), "--armor", "--export", key_id])
         public_key = export_result.stdout.strip() if export_result.returncode == 0 else ""
     except (subprocess.TimeoutExpired, OSError):
         public_key = ""
 
     if public_key:
         try:
-            clip_result = subprocess.run(
-                ["clip"],
-                input=public_key,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                timeout=5,
-                check=False,
-            )
+            clip_result = _sp_run(["clip"], timeout=5, input=public_key, capture_output=False)
             clipboard_ok = clip_result.returncode == 0
         except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
             clipboard_ok = False
@@ -411,7 +440,7 @@ def setup_gpg_wizard() -> Dict[str, object]:
         if sys.platform == "win32":
             os.startfile(github_url)  # type: ignore[attr-defined]
         else:
-            subprocess.run(["xdg-open", github_url], check=False, timeout=5)
+            _sp_run(["xdg-open", github_url], timeout=5, capture_output=False)
         browser_opened = True
     except (OSError, subprocess.TimeoutExpired):
         browser_opened = False
@@ -432,27 +461,12 @@ def setup_gpg_wizard() -> Dict[str, object]:
     return {"status": "setup_complete", "key_id": key_id}
 
 
-def find_existing_gpg_key(email: str) -> str:
+def find_existing_gpg_key(email: str, refresh: bool = False) -> str:
     """Find existing GPG secret key ID for given email."""
-    try:
-        result = subprocess.run(
-            [get_gpg_cmd(), "--list-secret-keys", "--keyid-format=long", email],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            timeout=10,
-            check=False,
-        )
-        if result.returncode != 0:
-            return ""
-        for line in result.stdout.splitlines():
-            match = re.search(r"sec\s+\w+/([A-F0-9]+)", line, re.IGNORECASE)
-            if match:
-                return match.group(1)
-    except (subprocess.TimeoutExpired, OSError):
+    keys = list_secret_keys(refresh=refresh)
+    if not keys:
         return ""
-    return ""
+    return find_secret_key(keys, email)
 
 
 def detect_gpg_program_path() -> str:
@@ -462,34 +476,45 @@ def detect_gpg_program_path() -> str:
 
 
 def collect_task_files(project_root: Path, explicit_files: List[str]) -> List[str]:
+    root = project_root.resolve()
+    root_prefix = str(root).rstrip(os.sep) + os.sep
     valid: List[str] = []
     for item in explicit_files:
         fpath = Path(item)
         if not fpath.is_absolute():
-            fpath = project_root / item
-        if fpath.exists():
-            try:
-                rel = fpath.resolve().relative_to(project_root.resolve())
-                valid.append(rel.as_posix())
-            except ValueError:
-                continue
+            fpath = root / item
+        if not fpath.exists():
+            continue
+        abs_path = fpath.resolve()
+        if not str(abs_path).startswith(root_prefix):
+            continue
+        valid.append(abs_path.relative_to(root).as_posix())
     return sorted(set(valid))
 
 
-def get_modified_files(project_root: Path) -> List[str]:
+@dataclass
+class GitStatus:
+    """One `git status --porcelain` snapshot; downstream steps reuse `files` instead of re-querying git."""
+
+    files: List[str] = field(default_factory=list)
+    codes: Dict[str, str] = field(default_factory=dict)
+    raw: str = ""
+
+
+def read_git_status(project_root: Union[str, Path]) -> GitStatus:
     result = run_git(project_root, ["status", "--porcelain", "-uall"])
     if result.returncode != 0:
-        return []
+        return GitStatus()
 
-    files: List[str] = []
+    codes: Dict[str, str] = {}
     for line in result.stdout.splitlines():
         if len(line) < 4:
             continue
         fpath = line[3:].strip()
         if " -> " in fpath:
             fpath = fpath.split(" -> ")[-1]
-        files.append(fpath.replace("\\", "/"))
-    return sorted(set(files))
+        codes[fpath.replace("\\", "/")] = line[:2]
+    return GitStatus(files=sorted(codes), codes=codes, raw=result.stdout)
 
 
 def parse_json_from_output(stdout: str) -> Optional[Dict[str, Any]]:
@@ -502,17 +527,22 @@ def parse_json_from_output(stdout: str) -> Optional[Dict[str, Any]]:
     except json.JSONDecodeError:
         pass
 
+    # Single forward pass: decode in place from each plausible object start and keep
+    # the last top-level object, skipping past whatever a successful decode consumed.
     decoder = json.JSONDecoder()
-    for idx in range(len(text) - 1, -1, -1):
-        if text[idx] != "{":
-            continue
+    payload: Optional[Dict[str, Any]] = None
+    match = _JSON_OBJECT_START.search(text)
+    while match is not None:
+        idx = match.start()
         try:
-            obj, end = decoder.raw_decode(text[idx:])
+            obj, end = decoder.raw_decode(text, idx)
         except json.JSONDecodeError:
+            match = _JSON_OBJECT_START.search(text, idx + 1)
             continue
-        if isinstance(obj, dict) and idx + end <= len(text):
-            return obj
-    return None
+        if isinstance(obj, dict):
+            payload = obj
+        match = _JSON_OBJECT_START.search(text, end)
+    return payload
 
 
 def run_pre_commit_gate(project_root: Path, skip_tests: bool = False) -> Dict[str, Any]:
@@ -530,15 +560,7 @@ def run_pre_commit_gate(project_root: Path, skip_tests: bool = False) -> Dict[st
         cmd.append("--skip-tests")
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            timeout=120,
-            check=False,
-        )
+        result = _sp_run(cmd, timeout=120)
     except subprocess.TimeoutExpired:
         return {"passed": False, "blocking": ["Pre-commit gate timed out after 120s"]}
     except OSError as exc:
@@ -563,14 +585,9 @@ def run_security_scan(project_root: Path) -> Dict[str, Any]:
         return {"passed": True, "warnings": ["security_scan.py not found, skipping"]}
 
     try:
-        result = subprocess.run(
+        result = _sp_run(
             [sys.executable, str(scan_script), "--project-root", str(project_root)],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
             timeout=120,
-            check=False,
         )
     except subprocess.TimeoutExpired:
         return {"passed": False, "critical": ["Security scan timed out"]}
@@ -584,25 +601,30 @@ def run_security_scan(project_root: Path) -> Dict[str, Any]:
 
 
 def detect_commit_type(files: List[str]) -> str:
-    scores: Dict[str, int] = {ctype: 0 for ctype in COMMIT_TYPES}
+    scores = [0] * len(_COMMIT_TYPE_MATCHERS)
     for file_path in files:
         lowered = file_path.lower()
-        for ctype, hints in COMMIT_TYPES.items():
-            for hint in hints:
-                if hint.startswith("*."):
-                    if lowered.endswith(hint[1:]):
-                        scores[ctype] += 2
-                elif "/" + hint.lower() + "/" in "/" + lowered + "/":
-                    scores[ctype] += 2
-                elif hint.lower() in lowered:
-                    scores[ctype] += 1
-    best = max(scores.items(), key=lambda item: item[1])
-    return best[0] if best[1] > 0 else "chore"
+        padded = f"/{lowered}/"
+        for index, (_ctype, ext_suffixes, name_hints) in enumerate(_COMMIT_TYPE_MATCHERS):
+            if ext_suffixes and lowered.endswith(ext_suffixes):
+                scores[index] += 2
+            for dir_hint, sub_hint in name_hints:
+                if sub_hint in lowered:
+                    scores[index] += 2 if dir_hint in padded else 1
+    best = max(range(len(scores)), key=scores.__getitem__)
+    return _COMMIT_TYPE_MATCHERS[best][0] if scores[best] > 0 else "chore"
 
 
 def detect_scope(files: List[str]) -> str:
     if not files:
         return ""
+    if len(files) == 1:
+        parts = Path(files[0]).parts
+        if not parts:
+            return ""
+        if parts[0].lower() in ("src", "app", "lib"):
+            return parts[1].lower().split(".", 1)[0] if len(parts) > 1 else ""
+        return parts[0].lower().split(".", 1)[0]
     dirs: Set[str] = set()
     for file_path in files:
         parts = Path(file_path).parts
@@ -623,6 +645,8 @@ def build_commit_message(
     scope: str = "",
     description: str = "",
 ) -> str:
+    from datetime import datetime, timezone
+
     if not msg_type:
         msg_type = detect_commit_type(files)
     if not scope:
@@ -633,9 +657,7 @@ def build_commit_message(
 
     header = f"{msg_type}{f'({scope})' if scope else ''}: {description}"
 
-    body_lines = ["", "Files:"]
-    for file_path in files[:15]:
-        body_lines.append(f"- {file_path}")
+    body_lines = ["", "Files:", *[f"- {file_path}" for file_path in files[:15]]]
     if len(files) > 15:
         body_lines.append(f"- ... +{len(files) - 15} more")
 
@@ -644,7 +666,7 @@ def build_commit_message(
     return header + "\n" + "\n".join(body_lines) + "\n" + "\n".join(footer)
 
 
-def stage_files(project_root: Path, files: List[str]) -> Tuple[bool, str]:
+def stage_files(project_root: Union[str, Path], files: List[str]) -> Tuple[bool, str]:
     if not files:
         return False, "No files to stage"
     result = run_git(project_root, ["add", "--"] + files)
@@ -653,7 +675,31 @@ def stage_files(project_root: Path, files: List[str]) -> Tuple[bool, str]:
     return True, f"Staged {len(files)} file(s)"
 
 
-def git_commit(project_root: Path, message: str, sign: bool = True) -> Tuple[bool, str]:
+def reset_files(project_root: Union[str, Path], files: List[str]) -> Optional[subprocess.Popen]:
+    """Unstage files in the background; callers wait on the handle before exiting."""
+    try:
+        return subprocess.Popen(
+            ["git", "reset", "HEAD", "--", *files],
+            cwd=str(project_root),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **_SP_CREATION,
+        )
+    except OSError:
+        return None
+
+
+def wait_reset(proc: Optional[subprocess.Popen], timeout: int = 10) -> None:
+    if proc is None:
+        return
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def git_commit(project_root: Union[str, Path], message: str, sign: bool = True) -> Tuple[bool, str]:
     cmd = ["commit", "-m", message]
     if sign:
         cmd.append("-S")
@@ -673,7 +719,7 @@ def git_commit(project_root: Path, message: str, sign: bool = True) -> Tuple[boo
     return True, f"Committed ({'signed' if sign else 'unsigned'}): {commit_hash}"
 
 
-def git_push(project_root: Path) -> Tuple[bool, str]:
+def git_push(project_root: Union[str, Path]) -> Tuple[bool, str]:
     branch = get_current_branch(project_root)
     result = run_git(project_root, ["push", "origin", branch], timeout=120)
     if result.returncode != 0:
@@ -696,17 +742,24 @@ def main() -> int:
     if not project_root.exists() or not project_root.is_dir():
         emit({"status": "error", "message": f"Not a directory: {project_root}"})
         return 1
+    git_cwd = str(project_root)
+
+    # git and gpg probes are independent; overlap their subprocess latency.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        git_future = executor.submit(git_ready, git_cwd)
+        gpg_future = None if args.no_sign else executor.submit(is_gpg_configured)
 
-    if not git_ready(project_root):
+    if not git_future.result():
         emit({"status": "error", "message": "Not a git repository"})
         return 1
 
-    files = collect_task_files(project_root, args.files) if args.files else get_modified_files(project_root)
+    status = GitStatus(files=collect_task_files(project_root, args.files)) if args.files else read_git_status(git_cwd)
+    files = status.files
     if not files:
         emit({"status": "skip", "message": "No files to commit"})
         return 0
 
-    ok, stage_message = stage_files(project_root, files)
+    ok, stage_message = stage_files(git_cwd, files)
     if not ok:
         emit({"status": "error", "message": stage_message})
         return 1
@@ -714,7 +767,7 @@ def main() -> int:
     gate = run_pre_commit_gate(project_root, skip_tests=args.skip_tests)
     blocking = gate.get("blocking", [])
     if blocking:
-        run_git(project_root, ["reset", "HEAD", "--"] + files)
+        reset_proc = reset_files(git_cwd, files)
         emit(
             {
                 "status": "blocked",
@@ -723,12 +776,13 @@ def main() -> int:
                 "warnings": gate.get("warnings", []),
             }
         )
+        wait_reset(reset_proc)
         return 1
 
     sec = run_security_scan(project_root)
     sec_critical = sec.get("critical", [])
     if isinstance(sec_critical, list) and sec_critical:
-        run_git(project_root, ["reset", "HEAD", "--"] + files)
+        reset_proc = reset_files(git_cwd, files)
         emit(
             {
                 "status": "blocked",
@@ -736,6 +790,7 @@ def main() -> int:
                 "critical": sec_critical[:5],
             }
         )
+        wait_reset(reset_proc)
         return 1
 
     message = args.message or build_commit_message(
@@ -743,9 +798,11 @@ def main() -> int:
         msg_type=args.type or "",
         scope=args.scope,
     )
-    gpg_ready, gpg_message = is_gpg_configured()
+    gpg_ready, gpg_message = gpg_future.result() if gpg_future else (False, "Signing disabled (--no-sign)")
 
     if args.dry_run:
+        branch = get_current_branch(git_cwd)
+        reset_proc = reset_files(git_cwd, files)
         emit(
             {
                 "status": "dry_run",
@@ -754,20 +811,20 @@ def main() -> int:
                 "gpg": gpg_message,
                 "gate": "passed",
                 "would_push": not args.no_push,
-                "branch": get_current_branch(project_root),
+                "branch": branch,
             }
         )
-        run_git(project_root, ["reset", "HEAD", "--"] + files)
+        wait_reset(reset_proc)
         return 0
 
-    ok, commit_status = git_commit(project_root, message, sign=gpg_ready)
+    ok, commit_status = git_commit(git_cwd, message, sign=gpg_ready)
     if not ok:
         emit({"status": "error", "message": commit_status})
         return 1
 
     push_status = "skipped"
     if not args.no_push:
-        ok, push_message = git_push(project_root)
+        ok, push_message = git_push(git_cwd)
         push_status = push_message
         if not ok:
             emit(
@@ -788,7 +845,7 @@ def main() -> int:
             "files": files,
             "message": message.splitlines()[0],
             "gpg": gpg_message,
-            "branch": get_current_branch(project_root),
+            "branch": get_current_branch(git_cwd),
         }
     )
     return 0
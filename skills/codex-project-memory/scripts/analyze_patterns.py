@@ -6,15 +6,28 @@ Analyze project coding patterns and write .codex/project-profile.json.
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import math
+import mmap
+import operator
 import os
+import pickle
 import re
 import sys
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from json_output import print_json, render_json
 
 
 SKIP_DIRS = {
@@ -80,6 +93,7 @@ NODE_BUILTINS = {
     "zlib",
 }
 PYTHON_STDLIB = set(getattr(sys, "stdlib_module_names", set()))
+BUILTIN_MODULES = frozenset(NODE_BUILTINS | PYTHON_STDLIB)
 
 KNOWN_STRUCTURE_DIRS = [
     "controllers",
@@ -96,27 +110,59 @@ KNOWN_STRUCTURE_DIRS = [
     "stores",
 ]
 
-LESS_STRICT_FUNCTION_PATTERNS = [
-    re.compile(r"^\s*(?:export\s+)?(?:async\s+)?function\s+([A-Za-z_$][\w$]*)\s*\("),
-    re.compile(r"^\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s*)?\([^()]*\)\s*=>"),
-    re.compile(r"^\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s*)?[A-Za-z_$][\w$]*\s*=>"),
-    re.compile(r"^\s*(?:public|private|protected|static|async|\s)*([A-Za-z_$][\w$]*)\s*\([^;]*\)\s*\{"),
-]
-VARIABLE_JS_PATTERN = re.compile(r"\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)")
-VARIABLE_PY_PATTERN = re.compile(r"^\s*([A-Za-z_][\w]*)\s*=")
-FUNCTION_PY_PATTERN = re.compile(r"^\s*def\s+([A-Za-z_][\w]*)\s*\(")
-COMPONENT_PATTERN = re.compile(r"^\s*(?:export\s+default\s+)?(?:function|class|const)\s+([A-Za-z_][\w]*)")
-
-IMPORT_FROM_JS_PATTERN = re.compile(r"^\s*import\s+.+?\s+from\s+['\"]([^'\"]+)['\"]")
-IMPORT_SIDE_JS_PATTERN = re.compile(r"^\s*import\s+['\"]([^'\"]+)['\"]")
-REQUIRE_PATTERN = re.compile(r"require\(\s*['\"]([^'\"]+)['\"]\s*\)")
-EXPORT_PATTERN = re.compile(r"^\s*export\b")
-IMPORT_PY_PATTERN = re.compile(r"^\s*import\s+([A-Za-z_][\w.]*)")
-FROM_IMPORT_PY_PATTERN = re.compile(r"^\s*from\s+([A-Za-z_][\w.]*|\.+[\w.]*)\s+import\s+")
-
-QUOTE_SINGLE_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'")
-QUOTE_DOUBLE_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"')
-TRAILING_COMMA_PATTERN = re.compile(r",\s*(?:[}\]])")
+# Whole-file scanners. Each runs once over the joined file text instead of once per line per
+# pattern. Whitespace is horizontal-only ([^\S\n]) so no match straddles two lines, and every
+# per-line category is an optional lookahead so a single pass reports all of them for a line.
+_HS = r"[^\S\n]"
+_JS_IDENT = r"[A-Za-z_$][\w$]*"
+
+
+def _line_probe(name: str, body: str) -> str:
+    return rf"(?:(?={_HS}*(?P<{name}>{body})))?"
+
+
+JS_LINE_SCAN = re.compile(
+    "^"
+    # Function declarations: the first matching form wins, like the old ordered pattern list.
+    + rf"(?:(?={_HS}*(?:"
+    + rf"(?:export{_HS}+)?(?:async{_HS}+)?function{_HS}+(?P<fn_decl>{_JS_IDENT}){_HS}*\("
+    + rf"|(?:export{_HS}+)?(?:const|let|var){_HS}+(?P<fn_arrow>{_JS_IDENT}){_HS}*={_HS}*(?:async{_HS}*)?\([^()\n]*\){_HS}*=>"
+    + rf"|(?:export{_HS}+)?(?:const|let|var){_HS}+(?P<fn_arrow_bare>{_JS_IDENT}){_HS}*={_HS}*(?:async{_HS}*)?{_JS_IDENT}{_HS}*=>"
+    + rf"|(?:public|private|protected|static|async|{_HS})*(?P<fn_method>{_JS_IDENT}){_HS}*\([^;\n]*\){_HS}*\{{"
+    + ")))?"
+    + rf"(?:(?={_HS}*(?:export{_HS}+default{_HS}+)?(?:function|class|const){_HS}+(?P<component>[A-Za-z_]\w*)))?"
+    + rf"(?:(?={_HS}*import{_HS}+(?:.+?{_HS}+from{_HS}+['\"](?P<import_from>[^'\"\n]+)['\"]|['\"](?P<import_side>[^'\"\n]+)['\"])))?"
+    + _line_probe("export", r"export\b"),
+    re.MULTILINE,
+)
+JS_VARIABLE_SCAN = re.compile(rf"\b(?:const|let|var){_HS}+({_JS_IDENT})")
+JS_REQUIRE_SCAN = re.compile(rf"require\({_HS}*['\"]([^'\"\n]+)['\"]{_HS}*\)")
+JS_CJS_EXPORT_LINE_SCAN = re.compile(r"^.*?(?:module\.exports|exports\.)", re.MULTILINE)
+PY_LINE_SCAN = re.compile(
+    "^"
+    + _line_probe("variable", rf"[A-Za-z_]\w*(?={_HS}*=)")
+    + rf"(?:(?={_HS}*def{_HS}+(?P<function>[A-Za-z_]\w*){_HS}*\())?"
+    + rf"(?:(?={_HS}*import{_HS}+(?P<import>[A-Za-z_][\w.]*)))?"
+    + rf"(?:(?={_HS}*from{_HS}+(?P<from_import>[A-Za-z_][\w.]*|\.+[\w.]*){_HS}+import{_HS}+))?",
+    re.MULTILINE,
+)
+JS_FUNCTION_GROUPS = ("fn_decl", "fn_arrow", "fn_arrow_bare", "fn_method")
+PY_NON_VARIABLE_NAMES = {"if", "for", "while", "return", "class", "def"}
+TRACKED_IDENTIFIER_STYLES = {"camelCase", "snake_case", "PascalCase"}
+FILE_NAMING_STYLES = {"camelCase", "PascalCase", "kebab-case", "snake_case"}
+
+# Applied to whole-file text: string literals never cross a newline, and the trailing-comma
+# scan counts lines (one match per line at most), mirroring the original per-line checks.
+QUOTE_SINGLE_PATTERN = re.compile(r"'(?:[^'\\\n]|\\.)*'")
+QUOTE_DOUBLE_PATTERN = re.compile(r'"(?:[^"\\\n]|\\.)*"')
+TRAILING_COMMA_LINE_PATTERN = re.compile(r"^.*?,[^\S\n]*[}\]]", re.MULTILINE)
+IMPORT_CATEGORY_RANK = {"built-in": 0, "external": 1, "internal": 2}
+COMMENT_LINE_PREFIXES = ("//", "#", "/*", "*")
+NON_STATEMENT_LINE_ENDINGS = ("{", "}", ",", ":")
+INDENT_SPACES_PATTERN = re.compile(r"^( +)\S")
+CUSTOM_ERROR_JS_PATTERN = re.compile(r"class\s+[A-Za-z_]\w*Error\s+extends\s+Error")
+CUSTOM_ERROR_PY_PATTERN = re.compile(r"class\s+[A-Za-z_]\w*Error\s*\(.*exception.*\)")
+TEST_STEM_PATTERN = re.compile(r"\.(test|spec)$", re.IGNORECASE)
 
 STATE_PATTERNS = {
     "Redux": ["redux", "@reduxjs/toolkit", "createSlice", "configureStore", "useSelector(", "useDispatch("],
@@ -160,6 +206,47 @@ AUTH_PATTERNS = {
     "session": ["express-session", "req.session", "session(", "cookie-session"],
     "oauth": ["passport", "oauth", "openid", "google strategy"],
 }
+ERROR_STYLE_PATTERNS = {
+    "try-catch": ["try {", "try:"],
+    "promise-catch": [".catch("],
+    "error-middleware": ["next(err)", "(err, req, res, next)"],
+}
+ERROR_FORMAT_PATTERNS = {
+    "json": [".json(", "jsonify("],
+    "text": [".send(", "return response("],
+}
+KEYWORD_MAPPINGS = (
+    STATE_PATTERNS,
+    DATA_FETCH_PATTERNS,
+    ROUTING_PATTERNS,
+    ORM_PATTERNS,
+    AUTH_PATTERNS,
+    ERROR_STYLE_PATTERNS,
+    ERROR_FORMAT_PATTERNS,
+)
+KeywordContent = Union[str, bytes, bytearray]
+# Every distinct lowercased keyword across all mappings, counted once per analysis.
+ALL_KEYWORDS = tuple(
+    dict.fromkeys(keyword.lower() for mapping in KEYWORD_MAPPINGS for keywords in mapping.values() for keyword in keywords)
+)
+
+
+FILE_TOTAL_KEYS = (
+    "semicolon_yes",
+    "semicolon_no",
+    "quote_single",
+    "quote_double",
+    "trailing_commas",
+    "indent_tabs",
+    "module_es",
+    "module_cjs",
+    "alias_imports",
+    "relative_imports",
+    "custom_error_hits",
+)
+# Below this many files, worker start-up costs more than the regex work it would spread out.
+PARALLEL_MIN_FILES = 8
+NEWLINE_COUNT_CHUNK = 1 << 20
 
 
 def parse_args() -> argparse.Namespace:
@@ -189,72 +276,186 @@ def parse_args() -> argparse.Namespace:
 
 
 def emit(payload: Dict[str, object]) -> None:
-    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    print_json(payload)
 
 
 def rel_path(path: Path, root: Path) -> str:
     return path.resolve().relative_to(root.resolve()).as_posix()
 
 
-def is_candidate_file(path: Path) -> bool:
-    name_lower = path.name.lower()
+def is_candidate_file(name: str) -> bool:
+    """Check a bare file name, mirroring Path.suffix without building a Path."""
+    name_lower = name.lower()
     if name_lower in SKIP_FILE_NAMES:
         return False
     if name_lower.endswith(".min.js"):
         return False
-    if path.suffix.lower() not in CODE_EXTENSIONS:
+    dot = name_lower.rfind(".")
+    if not 0 < dot < len(name_lower) - 1:
         return False
-    return True
+    return name_lower[dot:] in CODE_EXTENSIONS
+
+
+def walk_project(project_root: Path, sample_size: int) -> Tuple[List[Path], Counter[str], Counter[str], Counter[str]]:
+    """Traverse the project once with os.scandir.
+
+    Returns the ``sample_size`` largest candidate code files (largest first), file-naming styles,
+    test-file naming patterns, and directory-name counts. Visit order matches a top-down os.walk
+    so equal-size files keep their relative order.
+    """
+    files_with_size: List[Tuple[int, str]] = []
+    src_naming: Counter[str] = Counter()
+    all_naming: Counter[str] = Counter()
+    src_files = 0
+    test_counter: Counter[str] = Counter()
+    dir_counter: Counter[str] = Counter()
+    root_in_tests = "/__tests__/" in project_root.as_posix().lower() + "/"
+    # (directory, under a __tests__ directory, under <root>/src)
+    stack: List[Tuple[str, bool, bool]] = [(str(project_root), root_in_tests, False)]
+    is_root = True
+    while stack:
+        current, in_tests, in_src = stack.pop()
+        try:
+            with os.scandir(current) as iterator:
+                entries = list(iterator)
+        except OSError:
+            is_root = False
+            continue
+        subdirs: List[Tuple[str, bool, bool]] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if entry.name in SKIP_DIRS:
+                    continue
+                dir_lower = entry.name.lower()
+                dir_counter[dir_lower] += 1
+                try:
+                    is_link = entry.is_symlink()
+                except OSError:
+                    is_link = False
+                if not is_link:
+                    subdirs.append(
+                        (entry.path, in_tests or dir_lower == "__tests__", in_src or (is_root and entry.name == "src"))
+                    )
+                continue
 
+            lower = entry.name.lower()
+            if ".test." in lower:
+                test_counter[f"*.test.{lower.rsplit('.test.', 1)[1]}"] += 1
+            if ".spec." in lower:
+                test_counter[f"*.spec.{lower.rsplit('.spec.', 1)[1]}"] += 1
+            if in_tests:
+                test_counter["__tests__/*"] += 1
 
-def collect_candidate_files(project_root: Path) -> List[Path]:
-    files_with_size: List[Tuple[int, Path]] = []
-    for current_root, dirs, names in os.walk(project_root):
-        dirs[:] = [item for item in dirs if item not in SKIP_DIRS]
-        root_path = Path(current_root)
-        for name in names:
-            path = root_path / name
-            if not is_candidate_file(path):
+            if not is_candidate_file(entry.name):
                 continue
             try:
-                size = path.stat().st_size
+                size = entry.stat().st_size
             except OSError:
                 continue
-            files_with_size.append((size, path))
-    files_with_size.sort(key=lambda item: item[0], reverse=True)
-    return [path for _, path in files_with_size]
+            files_with_size.append((size, entry.path))
+
+            style = classify_identifier_style(TEST_STEM_PATTERN.sub("", entry.name[: entry.name.rfind(".")]))
+            tracked = style in FILE_NAMING_STYLES
+            if tracked:
+                all_naming[style] += 1
+            if in_src and entry.is_file():
+                src_files += 1
+                if tracked:
+                    src_naming[style] += 1
+        is_root = False
+        stack.extend(reversed(subdirs))
+    # nlargest breaks ties by input order, matching a stable reverse sort.
+    largest = heapq.nlargest(max(1, sample_size), files_with_size, key=lambda item: item[0])
+    # File naming prefers files under <root>/src and falls back to every candidate.
+    naming = src_naming if src_files else all_naming
+    return [Path(path) for _, path in largest], naming, test_counter, dir_counter
+
+
+def collect_candidate_files(project_root: Path, sample_size: int) -> List[Path]:
+    return walk_project(project_root, sample_size)[0]
+
+
+def _count_newlines(data: Union[mmap.mmap, bytes]) -> int:
+    # mmap.count() only exists on 3.13+, so count bounded slices in C instead.
+    return sum(data[offset:offset + NEWLINE_COUNT_CHUNK].count(b"\n") for offset in range(0, len(data), NEWLINE_COUNT_CHUNK))
+
+
+def _split_analysis_window(data: Union[mmap.mmap, bytes]) -> Tuple[List[str], int, bool]:
+    if data.find(b"\r") != -1:
+        # Text-mode universal newlines apply after decoding, so dropped invalid
+        # bytes can join "\r" and "\n"; take the decoded path for these files.
+        text = data[:].decode("utf-8", "ignore").replace("\r\n", "\n").replace("\r", "\n")
+        lines = text.split("\n")
+        if lines[-1] == "":
+            lines.pop()
+        if len(lines) > 2000:
+            return lines[:500], len(lines), True
+        return lines, len(lines), False
+
+    size = len(data)
+    # An unterminated last line only counts when something survives decoding.
+    tail = data[data.rfind(b"\n") + 1:]
+    total = _count_newlines(data) + (1 if tail and tail.decode("utf-8", "ignore") else 0)
+    if total == 0:
+        return [], 0, False
+
+    truncated = total > 2000
+    end = size
+    if truncated:
+        end = -1
+        for _ in range(500):
+            end = data.find(b"\n", end + 1)
+    text = data[:end].decode("utf-8", "ignore")
+    if not truncated and text.endswith("\n"):
+        text = text[:-1]
+    return text.split("\n"), total, truncated
 
 
 def read_lines_for_analysis(path: Path) -> Tuple[List[str], int, bool]:
-    first_500: List[str] = []
-    first_2000: List[str] = []
-    total = 0
+    """Count lines on mapped bytes and decode only the kept 500/2000-line prefix."""
     try:
-        with path.open("r", encoding="utf-8", errors="ignore") as handle:
-            for raw in handle:
-                total += 1
-                line = raw.rstrip("\n\r")
-                if total <= 500:
-                    first_500.append(line)
-                if total <= 2000:
-                    first_2000.append(line)
+        with path.open("rb") as handle:
+            try:
+                data: Union[mmap.mmap, bytes] = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Empty files and non-mappable handles cannot be mmapped.
+                data = handle.read()
+            try:
+                return _split_analysis_window(data)
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
     except OSError:
         return [], 0, False
 
-    if total > 2000:
-        return first_500, total, True
-    return first_2000, total, False
-
 
+@lru_cache(maxsize=8192)
 def classify_identifier_style(name: str) -> str:
-    if re.match(r"^[a-z][a-z0-9]*(?:_[a-z0-9]+)+$", name):
-        return "snake_case"
-    if re.match(r"^[A-Z][A-Za-z0-9]*$", name):
-        return "PascalCase"
-    if re.match(r"^[a-z][A-Za-z0-9]*$", name):
-        return "camelCase"
-    if re.match(r"^[a-z0-9]+(?:-[a-z0-9]+)+$", name):
-        return "kebab-case"
+    """Classify naming style with ASCII str predicates instead of four regex matches."""
+    if not name or not name.isascii():
+        return "other"
+    first = name[0]
+    if "_" in name:
+        if "a" <= first <= "z" and not name.endswith("_") and "__" not in name:
+            bare = name.replace("_", "")
+            if bare.isalnum() and bare.islower():
+                return "snake_case"
+        return "other"
+    if "-" in name:
+        if first != "-" and not name.endswith("-") and "--" not in name:
+            bare = name.replace("-", "")
+            if bare.isalnum() and (bare.islower() or bare.isdigit()):
+                return "kebab-case"
+        return "other"
+    if name.isalnum():
+        if "A" <= first <= "Z":
+            return "PascalCase"
+        if "a" <= first <= "z":
+            return "camelCase"
     return "other"
 
 
@@ -267,46 +468,26 @@ def dominant_from_counter(counter: Counter[str], fallback: str = "mixed") -> str
     return common[0][0]
 
 
-def p90(values: Sequence[int]) -> int:
-    if not values:
+def p90(histogram: Counter[int]) -> int:
+    """Nearest-rank 90th percentile read off a value -> count histogram."""
+    total = sum(histogram.values())
+    if not total:
         return 0
-    sorted_values = sorted(values)
-    index = max(0, math.ceil(0.9 * len(sorted_values)) - 1)
-    return int(sorted_values[index])
-
-
-def detect_file_naming(project_root: Path, all_files: List[Path]) -> str:
-    src_root = project_root / "src"
-    targets = [path for path in all_files if path.is_file() and (src_root in path.parents)]
-    if not targets:
-        targets = all_files
-
-    styles: Counter[str] = Counter()
-    for path in targets:
-        stem = path.stem
-        stem = re.sub(r"\.(test|spec)$", "", stem, flags=re.IGNORECASE)
-        style = classify_identifier_style(stem)
-        if style in {"camelCase", "PascalCase", "kebab-case", "snake_case"}:
-            styles[style] += 1
-    return dominant_from_counter(styles)
-
-
-def detect_test_pattern(project_root: Path) -> str:
-    counter: Counter[str] = Counter()
-    for current_root, dirs, names in os.walk(project_root):
-        dirs[:] = [item for item in dirs if item not in SKIP_DIRS]
-        for name in names:
-            lower = name.lower()
-            full = (Path(current_root) / name).as_posix().lower()
-            if ".test." in lower:
-                ext = lower.rsplit(".test.", 1)[1]
-                counter[f"*.test.{ext}"] += 1
-            if ".spec." in lower:
-                ext = lower.rsplit(".spec.", 1)[1]
-                counter[f"*.spec.{ext}"] += 1
-            if "/__tests__/" in full:
-                counter["__tests__/*"] += 1
-    return dominant_from_counter(counter, fallback="mixed")
+    index = max(0, math.ceil(0.9 * total) - 1)
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen > index:
+            return int(value)
+    return 0
+
+
+def detect_file_naming(naming_counter: Counter[str]) -> str:
+    return dominant_from_counter(naming_counter)
+
+
+def detect_test_pattern(test_counter: Counter[str]) -> str:
+    return dominant_from_counter(test_counter, fallback="mixed")
 
 
 def detect_entry_point(project_root: Path) -> str:
@@ -344,13 +525,7 @@ def detect_entry_point(project_root: Path) -> str:
     return "unknown"
 
 
-def detect_structure_directories(project_root: Path) -> List[str]:
-    dir_counter: Counter[str] = Counter()
-    for current_root, dirs, _ in os.walk(project_root):
-        dirs[:] = [item for item in dirs if item not in SKIP_DIRS]
-        for directory in dirs:
-            dir_counter[directory.lower()] += 1
-
+def detect_structure_directories(dir_counter: Counter[str]) -> List[str]:
     picked = [name for name in KNOWN_STRUCTURE_DIRS if dir_counter.get(name, 0) > 0]
     if picked:
         return picked
@@ -361,14 +536,16 @@ def categorize_import(module: str) -> Tuple[str, bool, bool]:
     module = module.strip()
     if not module:
         return "external", False, False
-    if module.startswith("@/") or module.startswith("~/"):
+    first = module[0]
+    if first in "@~" and module[1:2] == "/":
         return "internal", True, False
-    if module.startswith(".") or module.startswith("/"):
+    if first == "." or first == "/":
         return "internal", False, True
     if module.startswith("node:"):
         return "built-in", False, False
-    base = module.split("/", 1)[0]
-    if base in NODE_BUILTINS or base in PYTHON_STDLIB:
+    slash = module.find("/")
+    base = module if slash < 0 else module[:slash]
+    if base in BUILTIN_MODULES:
         return "built-in", False, False
     return "external", False, False
 
@@ -376,213 +553,264 @@ def categorize_import(module: str) -> Tuple[str, bool, bool]:
 def detect_import_ordering(categories: List[str]) -> str:
     if len(categories) < 2:
         return "unknown"
-    ordering = {"built-in": 0, "external": 1, "internal": 2}
-    values = [ordering.get(cat, 1) for cat in categories]
-    return "ordered" if all(values[idx] >= values[idx - 1] for idx in range(1, len(values))) else "mixed"
-
-
-def count_keyword_score(content: str, mapping: Dict[str, List[str]]) -> str:
-    scores: Dict[str, int] = {}
-    for label, keywords in mapping.items():
-        score = 0
-        for keyword in keywords:
-            score += content.count(keyword.lower())
-        scores[label] = score
+    ranks = [IMPORT_CATEGORY_RANK.get(cat, 1) for cat in categories]
+    # Pairwise <= over shifted lists runs in C instead of an indexed generator.
+    return "ordered" if all(map(operator.le, ranks, ranks[1:])) else "mixed"
+
+
+def tally_keywords(content: KeywordContent, keywords: Iterable[str] = ALL_KEYWORDS) -> Dict[str, int]:
+    """Count each keyword once over lowercased content so mappings can share the totals.
+
+    Byte content is UTF-8; ASCII keywords cannot match inside multi-byte sequences, so byte
+    counts equal character counts.
+    """
+    if isinstance(content, str):
+        return {keyword: content.count(keyword) for keyword in keywords}
+    return {keyword: content.count(keyword.encode("utf-8")) for keyword in keywords}
+
+
+def keyword_scores(tally: Dict[str, int], mapping: Dict[str, List[str]]) -> Dict[str, int]:
+    return {label: sum(tally[keyword.lower()] for keyword in keywords) for label, keywords in mapping.items()}
+
+
+def _mapping_tally(content: KeywordContent, mapping: Dict[str, List[str]]) -> Dict[str, int]:
+    return tally_keywords(content, {keyword.lower() for keywords in mapping.values() for keyword in keywords})
+
+
+def count_keyword_score(content: KeywordContent, mapping: Dict[str, List[str]], tally: Optional[Dict[str, int]] = None) -> str:
+    scores = keyword_scores(tally if tally is not None else _mapping_tally(content, mapping), mapping)
     best = max(scores.items(), key=lambda item: item[1])
     return best[0] if best[1] > 0 else "unknown"
 
 
-def count_keyword_scores_multi(content: str, mapping: Dict[str, List[str]]) -> List[str]:
+def count_keyword_scores_multi(
+    content: KeywordContent,
+    mapping: Dict[str, List[str]],
+    tally: Optional[Dict[str, int]] = None,
+) -> List[str]:
     """Return all labels with positive match scores, sorted by score descending."""
-    scores: Dict[str, int] = {}
-    for label, keywords in mapping.items():
-        score = 0
-        for keyword in keywords:
-            score += content.count(keyword.lower())
-        if score > 0:
-            scores[label] = score
+    scores = keyword_scores(tally if tally is not None else _mapping_tally(content, mapping), mapping)
+    scores = {label: score for label, score in scores.items() if score > 0}
     if not scores:
         return []
     return [label for label, _ in sorted(scores.items(), key=lambda item: item[1], reverse=True)]
 
 
-def sanitize_line_for_semicolon(line: str) -> Optional[str]:
-    stripped = line.strip()
-    if not stripped:
-        return None
-    if stripped.startswith("//") or stripped.startswith("#") or stripped.startswith("/*") or stripped.startswith("*"):
-        return None
-    return stripped
+def count_tracked_styles(names: Iterable[str]) -> Counter[str]:
+    styles = Counter(map(classify_identifier_style, names))
+    return Counter({style: count for style, count in styles.items() if style in TRACKED_IDENTIFIER_STYLES})
 
 
-def analyze(project_root: Path, sample_size: int) -> Dict[str, object]:
-    all_candidates = collect_candidate_files(project_root)
-    sampled_files = all_candidates[: max(1, sample_size)]
-    warnings: List[str] = []
-
-    variable_styles: Counter[str] = Counter()
-    function_styles: Counter[str] = Counter()
-    component_styles: Counter[str] = Counter()
-    file_name_style = detect_file_naming(project_root, all_candidates)
-    test_pattern = detect_test_pattern(project_root)
+def analyze_file(path: Path) -> Dict[str, object]:
+    """Analyze one sampled file into independent counters that analyze() merges.
 
-    total_line_lengths: List[int] = []
-    total_file_lines = 0
-    function_counts: List[int] = []
-    files_analyzed = 0
+    Module-level so ProcessPoolExecutor workers can pickle it by reference.
+    """
+    analyzed_lines, total_lines, truncated = read_lines_for_analysis(path)
+    if total_lines == 0:
+        return {"path": path, "total_lines": 0}
 
+    # Names and indent widths are collected into lists and counted in bulk after the scans.
+    variable_names: List[str] = []
+    function_names: List[str] = []
+    component_names: List[str] = []
     semicolon_yes = 0
     semicolon_no = 0
-    quote_single = 0
-    quote_double = 0
-    trailing_commas = 0
     indent_tabs = 0
-    indent_spaces: Counter[int] = Counter()
-
+    indent_widths: List[int] = []
     module_es = 0
     module_cjs = 0
     alias_imports = 0
     relative_imports = 0
-    import_order_counter: Counter[str] = Counter()
-
-    error_style_counts: Counter[str] = Counter()
     custom_error_hits = 0
-    error_json_hits = 0
-    error_text_hits = 0
 
-    combined_content_parts: List[str] = []
+    ext = path.suffix.lower()
+    import_categories: List[str] = []
+    file_text = "\n".join(analyzed_lines)
+    lowered_content = file_text.lower()
+
+    quote_single = sum(1 for _ in QUOTE_SINGLE_PATTERN.finditer(file_text))
+    quote_double = sum(1 for _ in QUOTE_DOUBLE_PATTERN.finditer(file_text))
+    trailing_commas = sum(1 for _ in TRAILING_COMMA_LINE_PATTERN.finditer(file_text))
+
+    is_js = ext in JS_TS_EXTENSIONS
+    # Blank and comment-only lines still count toward lengths and indentation,
+    # but never reach the identifier/import scans below.
+    code_lines: List[str] = []
+    for line in analyzed_lines:
+        if line.startswith("\t"):
+            indent_tabs += 1
+        else:
+            space_match = INDENT_SPACES_PATTERN.match(line)
+            if space_match:
+                indent_widths.append(len(space_match.group(1)))
+
+        clean = line.strip()
+        if not clean or clean.startswith(COMMENT_LINE_PREFIXES):
+            continue
+        code_lines.append(line)
+        if is_js:
+            if clean.endswith(";"):
+                semicolon_yes += 1
+            elif not clean.endswith(NON_STATEMENT_LINE_ENDINGS):
+                semicolon_no += 1
+    code_text = "\n".join(code_lines)
+
+    if is_js:
+        variable_names.extend(JS_VARIABLE_SCAN.findall(code_text))
+
+        # (offset, module) pairs so ES imports and require() calls keep source order.
+        imports: List[Tuple[int, str]] = []
+        for match in JS_LINE_SCAN.finditer(code_text):
+            if match.lastindex is None:
+                continue
+            for group in JS_FUNCTION_GROUPS:
+                name = match.group(group)
+                if name:
+                    function_names.append(name)
+                    break
+            component = match.group("component")
+            if component:
+                component_names.append(component)
+            module = match.group("import_from") or match.group("import_side")
+            if module:
+                module_es += 1
+                imports.append((match.start(), module))
+            if match.group("export"):
+                module_es += 1
+
+        if "require(" in code_text:
+            for match in JS_REQUIRE_SCAN.finditer(code_text):
+                module_cjs += 1
+                imports.append((match.start(), match.group(1)))
+        if "exports" in code_text:
+            module_cjs += len(JS_CJS_EXPORT_LINE_SCAN.findall(code_text))
+
+        for _, module in sorted(imports):
+            category, is_alias, is_relative = categorize_import(module)
+            import_categories.append(category)
+            alias_imports += 1 if is_alias else 0
+            relative_imports += 1 if is_relative else 0
+
+    elif ext in PYTHON_EXTENSIONS:
+        for match in PY_LINE_SCAN.finditer(code_text):
+            if match.lastindex is None:
+                continue
+            name = match.group("variable")
+            if name and name not in PY_NON_VARIABLE_NAMES:
+                variable_names.append(name)
+
+            name = match.group("function")
+            if name:
+                function_names.append(name)
+
+            module = match.group("import") or match.group("from_import")
+            if module:
+                category, _, is_relative = categorize_import(module)
+                import_categories.append(category)
+                relative_imports += 1 if is_relative else 0
+
+    custom_error_hits += len(CUSTOM_ERROR_JS_PATTERN.findall(lowered_content))
+    custom_error_hits += len(CUSTOM_ERROR_PY_PATTERN.findall(lowered_content))
+
+    return {
+        "path": path,
+        "total_lines": total_lines,
+        "truncated": truncated,
+        "lowered_bytes": lowered_content.encode("utf-8", "ignore"),
+        "line_lengths": Counter(map(len, analyzed_lines)),
+        "function_count": len(function_names),
+        "import_order": detect_import_ordering(import_categories),
+        "variable_styles": count_tracked_styles(variable_names),
+        "function_styles": count_tracked_styles(function_names),
+        "component_styles": count_tracked_styles(component_names),
+        "indent_spaces": Counter(indent_widths),
+        "semicolon_yes": semicolon_yes,
+        "semicolon_no": semicolon_no,
+        "quote_single": quote_single,
+        "quote_double": quote_double,
+        "trailing_commas": trailing_commas,
+        "indent_tabs": indent_tabs,
+        "module_es": module_es,
+        "module_cjs": module_cjs,
+        "alias_imports": alias_imports,
+        "relative_imports": relative_imports,
+        "custom_error_hits": custom_error_hits,
+    }
+
+
+def map_file_analysis(paths: List[Path]) -> List[Dict[str, object]]:
+    """Analyze files across CPU cores, falling back to serial when a pool is not worth it or unavailable."""
+    workers = min(len(paths), os.cpu_count() or 1)
+    if len(paths) >= PARALLEL_MIN_FILES and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(analyze_file, paths, chunksize=2))
+        except (OSError, BrokenProcessPool, pickle.PicklingError):
+            # Only pool start-up and pickling failures fall back; errors raised by analyze_file itself propagate.
+            pass
+    return [analyze_file(path) for path in paths]
+
+
+def analyze(project_root: Path, sample_size: int) -> Dict[str, object]:
+    sampled_files, naming_counter, test_counter, dir_counter = walk_project(project_root, sample_size)
+    warnings: List[str] = []
+    file_name_style = detect_file_naming(naming_counter)
+    test_pattern = detect_test_pattern(test_counter)
+
+    variable_styles: Counter[str] = Counter()
+    function_styles: Counter[str] = Counter()
+    component_styles: Counter[str] = Counter()
+    indent_spaces: Counter[int] = Counter()
+    import_orders: List[str] = []
+    totals: Counter[str] = Counter()
+    line_length_hist: Counter[int] = Counter()
+    function_counts: List[int] = []
+    combined_content = bytearray()
+    total_file_lines = 0
+    files_analyzed = 0
 
-    for path in sampled_files:
-        analyzed_lines, total_lines, truncated = read_lines_for_analysis(path)
-        if total_lines == 0:
+    for result in map_file_analysis(sampled_files):
+        path = result["path"]
+        if result["total_lines"] == 0:
             warnings.append(f"Unable to read file: {rel_path(path, project_root)}")
             continue
         files_analyzed += 1
-        total_file_lines += total_lines
-        if truncated:
+        total_file_lines += result["total_lines"]
+        if result["truncated"]:
             warnings.append(f"Truncated analysis to first 500 lines for large file: {rel_path(path, project_root)}")
 
-        ext = path.suffix.lower()
-        file_function_count = 0
-        import_categories: List[str] = []
-        lowered_content = "\n".join(analyzed_lines).lower()
-        combined_content_parts.append(lowered_content)
-
-        for line in analyzed_lines:
-            total_line_lengths.append(len(line))
-            quote_single += len(QUOTE_SINGLE_PATTERN.findall(line))
-            quote_double += len(QUOTE_DOUBLE_PATTERN.findall(line))
-            if TRAILING_COMMA_PATTERN.search(line):
-                trailing_commas += 1
-            if line.startswith("\t"):
-                indent_tabs += 1
-            else:
-                space_match = re.match(r"^( +)\S", line)
-                if space_match:
-                    indent_spaces[len(space_match.group(1))] += 1
-
-            if ext in JS_TS_EXTENSIONS:
-                clean = sanitize_line_for_semicolon(line)
-                if clean is not None:
-                    if clean.endswith(";"):
-                        semicolon_yes += 1
-                    elif clean.endswith("{") or clean.endswith("}") or clean.endswith(",") or clean.endswith(":"):
-                        pass
-                    else:
-                        semicolon_no += 1
-
-                for match in VARIABLE_JS_PATTERN.finditer(line):
-                    style = classify_identifier_style(match.group(1))
-                    if style in {"camelCase", "snake_case", "PascalCase"}:
-                        variable_styles[style] += 1
-
-                for pattern in LESS_STRICT_FUNCTION_PATTERNS:
-                    found = pattern.search(line)
-                    if found:
-                        name = found.group(1)
-                        file_function_count += 1
-                        style = classify_identifier_style(name)
-                        if style in {"camelCase", "snake_case", "PascalCase"}:
-                            function_styles[style] += 1
-                        break
-
-                component_match = COMPONENT_PATTERN.search(line)
-                if component_match:
-                    name = component_match.group(1)
-                    style = classify_identifier_style(name)
-                    if style in {"camelCase", "snake_case", "PascalCase"}:
-                        component_styles[style] += 1
-
-                from_match = IMPORT_FROM_JS_PATTERN.search(line)
-                if from_match:
-                    module_es += 1
-                    category, is_alias, is_relative = categorize_import(from_match.group(1))
-                    import_categories.append(category)
-                    alias_imports += 1 if is_alias else 0
-                    relative_imports += 1 if is_relative else 0
-                else:
-                    side_match = IMPORT_SIDE_JS_PATTERN.search(line)
-                    if side_match:
-                        module_es += 1
-                        category, is_alias, is_relative = categorize_import(side_match.group(1))
-                        import_categories.append(category)
-                        alias_imports += 1 if is_alias else 0
-                        relative_imports += 1 if is_relative else 0
-
-                for req in REQUIRE_PATTERN.findall(line):
-                    module_cjs += 1
-                    category, is_alias, is_relative = categorize_import(req)
-                    import_categories.append(category)
-                    alias_imports += 1 if is_alias else 0
-                    relative_imports += 1 if is_relative else 0
-
-                if EXPORT_PATTERN.search(line):
-                    module_es += 1
-                if "module.exports" in line or "exports." in line:
-                    module_cjs += 1
-
-            elif ext in PYTHON_EXTENSIONS:
-                var_match = VARIABLE_PY_PATTERN.search(line)
-                if var_match:
-                    name = var_match.group(1)
-                    if name not in {"if", "for", "while", "return", "class", "def"}:
-                        style = classify_identifier_style(name)
-                        if style in {"camelCase", "snake_case", "PascalCase"}:
-                            variable_styles[style] += 1
-
-                fn_match = FUNCTION_PY_PATTERN.search(line)
-                if fn_match:
-                    file_function_count += 1
-                    style = classify_identifier_style(fn_match.group(1))
-                    if style in {"camelCase", "snake_case", "PascalCase"}:
-                        function_styles[style] += 1
-
-                import_match = IMPORT_PY_PATTERN.search(line)
-                if import_match:
-                    category, _, is_relative = categorize_import(import_match.group(1))
-                    import_categories.append(category)
-                    relative_imports += 1 if is_relative else 0
-                from_match = FROM_IMPORT_PY_PATTERN.search(line)
-                if from_match:
-                    category, _, is_relative = categorize_import(from_match.group(1))
-                    import_categories.append(category)
-                    relative_imports += 1 if is_relative else 0
-
-        function_counts.append(file_function_count)
-
-        order = detect_import_ordering(import_categories)
-        if order != "unknown":
-            import_order_counter[order] += 1
-
-        error_style_counts["try-catch"] += lowered_content.count("try {") + lowered_content.count("try:")
-        error_style_counts["promise-catch"] += lowered_content.count(".catch(")
-        error_style_counts["error-middleware"] += lowered_content.count("next(err)") + lowered_content.count("(err, req, res, next)")
-        custom_error_hits += len(re.findall(r"class\s+[A-Za-z_]\w*Error\s+extends\s+Error", lowered_content))
-        custom_error_hits += len(re.findall(r"class\s+[A-Za-z_]\w*Error\s*\(.*exception.*\)", lowered_content))
-        error_json_hits += lowered_content.count(".json(") + lowered_content.count("jsonify(")
-        error_text_hits += lowered_content.count(".send(") + lowered_content.count("return response(")
-
-    combined_content = "\n".join(combined_content_parts)
+        if combined_content:
+            combined_content += b"\n"
+        combined_content += result["lowered_bytes"]
+        line_length_hist += result["line_lengths"]
+        function_counts.append(result["function_count"])
+        if result["import_order"] != "unknown":
+            import_orders.append(result["import_order"])
+        variable_styles += result["variable_styles"]
+        function_styles += result["function_styles"]
+        component_styles += result["component_styles"]
+        indent_spaces += result["indent_spaces"]
+        totals.update({key: result[key] for key in FILE_TOTAL_KEYS})
+
+    semicolon_yes = totals["semicolon_yes"]
+    semicolon_no = totals["semicolon_no"]
+    quote_single = totals["quote_single"]
+    quote_double = totals["quote_double"]
+    trailing_commas = totals["trailing_commas"]
+    indent_tabs = totals["indent_tabs"]
+    module_es = totals["module_es"]
+    module_cjs = totals["module_cjs"]
+    alias_imports = totals["alias_imports"]
+    relative_imports = totals["relative_imports"]
+    custom_error_hits = totals["custom_error_hits"]
+
+    # No keyword contains a newline, so totals over the joined text equal per-file sums.
+    tally = tally_keywords(combined_content)
+    error_style_counts: Counter[str] = Counter(keyword_scores(tally, ERROR_STYLE_PATTERNS))
+    error_formats = keyword_scores(tally, ERROR_FORMAT_PATTERNS)
+    error_json_hits = error_formats["json"]
+    error_text_hits = error_formats["text"]
 
     module_system = "unknown"
     if module_es > 0 or module_cjs > 0:
@@ -593,6 +821,7 @@ def analyze(project_root: Path, sample_size: int) -> Dict[str, object]:
         else:
             module_system = "mixed"
 
+    import_order_counter = Counter(import_orders)
     import_ordering = "mixed"
     ordered = import_order_counter.get("ordered", 0)
     mixed = import_order_counter.get("mixed", 0)
@@ -636,11 +865,11 @@ def analyze(project_root: Path, sample_size: int) -> Dict[str, object]:
     avg_file_lines = round(total_file_lines / files_analyzed, 2) if files_analyzed else 0
     avg_functions = round(sum(function_counts) / len(function_counts), 2) if function_counts else 0
 
-    state_all = count_keyword_scores_multi(combined_content, STATE_PATTERNS)
-    data_fetching_all = count_keyword_scores_multi(combined_content, DATA_FETCH_PATTERNS)
-    routing_all = count_keyword_scores_multi(combined_content, ROUTING_PATTERNS)
-    orm_all = count_keyword_scores_multi(combined_content, ORM_PATTERNS)
-    auth_all = count_keyword_scores_multi(combined_content, AUTH_PATTERNS)
+    state_all = count_keyword_scores_multi(combined_content, STATE_PATTERNS, tally)
+    data_fetching_all = count_keyword_scores_multi(combined_content, DATA_FETCH_PATTERNS, tally)
+    routing_all = count_keyword_scores_multi(combined_content, ROUTING_PATTERNS, tally)
+    orm_all = count_keyword_scores_multi(combined_content, ORM_PATTERNS, tally)
+    auth_all = count_keyword_scores_multi(combined_content, AUTH_PATTERNS, tally)
 
     state_all_raw = list(state_all)
     entry_point = detect_entry_point(project_root)
@@ -674,7 +903,7 @@ def analyze(project_root: Path, sample_size: int) -> Dict[str, object]:
         confidence_score += 1
     if sum(variable_styles.values()) >= 20 and sum(function_styles.values()) >= 10:
         confidence_score += 1
-    if len(total_line_lengths) >= 300:
+    if sum(line_length_hist.values()) >= 300:
         confidence_score += 1
 
     confidence = "low"
@@ -698,7 +927,7 @@ def analyze(project_root: Path, sample_size: int) -> Dict[str, object]:
         "structure": {
             "avg_file_lines": avg_file_lines,
             "avg_functions_per_file": avg_functions,
-            "directories": detect_structure_directories(project_root),
+            "directories": detect_structure_directories(dir_counter),
             "entry_point": entry_point,
         },
         "imports": {
@@ -716,7 +945,7 @@ def analyze(project_root: Path, sample_size: int) -> Dict[str, object]:
             "quotes": quotes,
             "trailing_commas": trailing_commas > 0,
             "indent": indent,
-            "p90_line_length": p90(total_line_lengths),
+            "p90_line_length": p90(line_length_hist),
         },
         "patterns": {
             "state_management": state,
@@ -754,9 +983,7 @@ def main() -> int:
         analysis_payload = analyze(project_root, sample_size)
         profile = analysis_payload["profile"]
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with output_path.open("w", encoding="utf-8", newline="\n") as handle:
-            json.dump(profile, handle, ensure_ascii=False, indent=2)
-            handle.write("\n")
+        output_path.write_bytes(render_json(profile) + b"\n")
     except PermissionError as exc:
         emit({"status": "error", "path": "", "message": f"Permission denied: {exc}"})
         return 1
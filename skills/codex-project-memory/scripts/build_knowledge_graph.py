@@ -6,24 +6,52 @@ Build a project knowledge graph with dependencies, module boundaries, routes, an
 from __future__ import annotations
 
 import argparse
+import hashlib
+import importlib.machinery
 import importlib.util
 import json
+import multiprocessing
+import os
+import pickle
 import re
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    import tree_sitter_languages
+except ImportError:  # pragma: no cover - optional parser
+    tree_sitter_languages = None  # type: ignore[assignment]
+
 
 SCHEMA_VERSION = "2.0"
 GRAPH_ARTIFACT_TYPE = "knowledge-graph"
 GRAPH_CHUNK_SIZE = 80
 GRAPH_CHUNK_LIMIT = 5
+GRAPH_CACHE_INDEX_NAME = "knowledge-graph-cache.json"
+CODEBASE_INDEX_PATH = Path(".codex") / "knowledge" / "codebase-index.json"
+# Scripts whose code shapes the graph; their stamps retire cached graphs when extraction changes.
+GRAPH_BUILDER_SOURCES = (
+    "build_knowledge_graph.py",
+    "project_traversal.py",
+    "codebase_indexer.py",
+    "redaction.py",
+    "json_output.py",
+)
+# Below this many files, worker start-up costs more than the regex scanning it would spread out.
+PARALLEL_MIN_FILES = 64
+PARALLEL_CHUNK_SIZE = 32
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 if str(SCRIPT_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPT_DIR))
 
+from json_output import print_json, render_json
 from redaction import REDACTION_PATTERNS_VERSION, redact_artifact
 
 
@@ -45,9 +73,26 @@ SKIP_DIRS = {
 JAVASCRIPT_EXTENSIONS = {".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", ".vue", ".svelte"}
 PYTHON_EXTENSIONS = {".py"}
 TEST_EXTENSIONS = JAVASCRIPT_EXTENSIONS | PYTHON_EXTENSIONS
-
-IMPORT_FROM_PATTERN = re.compile(r"^\s*import\s+.+?\s+from\s+['\"]([^'\"]+)['\"]", re.MULTILINE)
-IMPORT_SIDE_PATTERN = re.compile(r"^\s*import\s+['\"]([^'\"]+)['\"]", re.MULTILINE)
+TEST_EXTENSION_SUFFIXES = tuple(sorted(TEST_EXTENSIONS))
+
+TREE_SITTER_GRAMMARS = {
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "tsx",
+}
+# Same statements the regex fallback covers: ES imports and single-argument require("...") calls.
+TREE_SITTER_IMPORT_QUERY = """
+(import_statement source: (string) @source)
+(call_expression
+  function: (identifier) @callee
+  arguments: (arguments . (string) @source .)
+  (#eq? @callee "require"))
+"""
+# `import x from "m"` and side-effect `import "m"` share one scan; the optional `from` clause covers both.
+IMPORT_PATTERN = re.compile(r"^\s*import\s+(?:.+?\s+from\s+)?['\"]([^'\"]+)['\"]", re.MULTILINE)
 REQUIRE_PATTERN = re.compile(r"require\(\s*['\"]([^'\"]+)['\"]\s*\)")
 PY_IMPORT_PATTERN = re.compile(r"^\s*import\s+([A-Za-z_][\w.]*)", re.MULTILINE)
 PY_FROM_IMPORT_PATTERN = re.compile(r"^\s*from\s+([A-Za-z_][\w.]*|\.+[\w.]*)\s+import\s+", re.MULTILINE)
@@ -67,10 +112,6 @@ SQL_INCLUDE_PATTERN = re.compile(r"^\s*(?:\\i|SOURCE)\s+([^\s;]+)", re.MULTILINE
 TERRAFORM_SOURCE_PATTERN = re.compile(r"\bsource\s*=\s*['\"]([^'\"]+)['\"]")
 YAML_REFERENCE_PATTERN = re.compile(r"^\s*(?:file|path|source):\s*['\"]?([^'\"\s]+)", re.MULTILINE)
 
-JS_IMPORT_DEFAULT_PATTERN = re.compile(r"^\s*import\s+([A-Za-z_$][\w$]*)\s+from\s+['\"]([^'\"]+)['\"]", re.MULTILINE)
-JS_IMPORT_NAMED_PATTERN = re.compile(r"^\s*import\s+\{([^}]+)\}\s+from\s+['\"]([^'\"]+)['\"]", re.MULTILINE)
-JS_REQUIRE_ALIAS_PATTERN = re.compile(r"^\s*(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*require\(\s*['\"]([^'\"]+)['\"]\s*\)", re.MULTILINE)
-JS_REQUIRE_NAMED_PATTERN = re.compile(r"^\s*(?:const|let|var)\s+\{([^}]+)\}\s*=\s*require\(\s*['\"]([^'\"]+)['\"]\s*\)", re.MULTILINE)
 JS_EXPORT_FUNCTION_PATTERN = re.compile(r"\bexport\s+(?:async\s+)?function\s+([A-Za-z_$][\w$]*)")
 JS_EXPORT_CONST_PATTERN = re.compile(r"\bexport\s+(?:const|let|var)\s+([A-Za-z_$][\w$]*)")
 JS_EXPORTS_PATTERN = re.compile(r"\bexports\.([A-Za-z_$][\w$]*)\s*=")
@@ -93,13 +134,97 @@ DANGEROUS_SINK_PATTERN = re.compile(
 )
 SECRET_FILE_HINT = re.compile(r"(\.env|secret|credential|token|private[-_]?key|id_rsa)", re.IGNORECASE)
 
-ROUTE_CALL_PATTERN = re.compile(
-    r"\b(?:router|app)\.(get|post|put|delete|patch|options|head|all)\s*\(\s*['\"`]([^'\"`]+)['\"`]\s*,\s*(.+)"
-)
+# Scanned over whole files, so whitespace and captures must stop at every str.splitlines()
+# boundary to keep the one-call-per-line semantics of the original per-line search.
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+_INLINE_SPACE = rf"[^\S{_LINE_BREAKS}]"
+# Route-file patterns only run on JS/TS route candidates, so they are compiled on first use
+# (see route_pattern) and Python-only projects never build them.
+ROUTE_PATTERN_SOURCES: Dict[str, str] = {
+    "route_call": (
+        rf"\b(?:router|app)\.(get|post|put|delete|patch|options|head|all){_INLINE_SPACE}*\({_INLINE_SPACE}*"
+        rf"['\"`]([^'\"`{_LINE_BREAKS}]+)['\"`]{_INLINE_SPACE}*,{_INLINE_SPACE}*([^{_LINE_BREAKS}]+)"
+    ),
+    # Default/named `import ... from` and `const ... = require(...)` bindings in one scan:
+    # groups are (import alias, import members, import module, require alias, require members, require module).
+    "binding": (
+        r"(?m)^\s*(?:"
+        r"import\s+(?:([A-Za-z_$][\w$]*)|\{([^}]+)\})\s+from\s+['\"]([^'\"]+)['\"]"
+        r"|(?:const|let|var)\s+(?:([A-Za-z_$][\w$]*)|\{([^}]+)\})\s*=\s*require\(\s*['\"]([^'\"]+)['\"]\s*\)"
+        r")"
+    ),
+    # `source`, `source as local` (import) or `source: local` (require destructuring).
+    "binding_member": r"([A-Za-z_$][\w$]*)(?:(?:\s+as\s+|\s*:\s*)([A-Za-z_$][\w$]*))?",
+    "handler_wrapper": r"^[A-Za-z_$][\w$]*\(([^()]+)\)$",
+}
 ROUTE_FILE_HINT = re.compile(r"route", re.IGNORECASE)
-
-
+ROUTE_EXTENSION_SUFFIXES = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")
+MODEL_SKIP_STEMS = frozenset({"index", "init", "setup", "associations", "connection"})
+
+GO_IMPORT_BLOCK_ITEM_PATTERN = re.compile(r'(?:^|\n)\s*(?:[._A-Za-z]\w*\s+)?["`]([^"`]+)["`]')
+RUST_USE_ALIAS_PATTERN = re.compile(r"\s+as\s+\w+")
+RUST_MOD_PATTERN = re.compile(r"\bmod\s+([A-Za-z_]\w*)\s*;")
+COMPONENT_MARKUP_PATTERN = re.compile(r"<script|<template", re.IGNORECASE)
+
+MODEL_NAME_PATTERNS = (
+    re.compile(r"mongoose\.model\(\s*['\"]([A-Za-z_]\w*)['\"]"),
+    re.compile(r"sequelize\.define\(\s*['\"]([A-Za-z_]\w*)['\"]"),
+    re.compile(r"class\s+([A-Za-z_]\w*)\s+extends\s+Model"),
+)
+MODEL_SUFFIX_PATTERN = re.compile(r"\.model$", re.IGNORECASE)
+MODEL_KEY_LINE_PATTERN = re.compile(r"^['\"]?([A-Za-z_][\w]*)['\"]?\s*:")
+MODEL_REF_RELATION_PATTERN = re.compile(r"([A-Za-z_]\w*)\s*:\s*\{[^{}]*ref\s*:\s*['\"]([A-Za-z_]\w*)['\"]", re.DOTALL)
+MODEL_ASSOCIATION_PATTERN = re.compile(r"\.(belongsTo|hasMany|hasOne|belongsToMany)\(\s*([A-Za-z_]\w*)")
+MODEL_SCHEMA_CALL_PATTERN = re.compile(r"new\s+(?:mongoose\.)?Schema\s*\(")
+MODEL_DEFINE_CALL_PATTERN = re.compile(r"sequelize\.define\s*\(")
+MODEL_INIT_CALL_PATTERN = re.compile(r"\.init\s*\(")
+# Quoted strings (closing quote optional, so an unterminated string runs to the end like the old
+# character walker), single braces, or runs of anything else.
+OBJECT_BLOCK_TOKEN_PATTERN = re.compile(r"""'(?:\\.|[^'\\])*'?|"(?:\\.|[^"\\])*"?|[{}]|[^{}'"]+""", re.DOTALL)
+MODEL_SCHEMA_META_KEYS = frozenset({
+    # Mongoose meta
+    "type",
+    "required",
+    "default",
+    "ref",
+    "unique",
+    "validate",
+    "index",
+    "sparse",
+    "enum",
+    "min",
+    "max",
+    "minlength",
+    "maxlength",
+    "lowercase",
+    "uppercase",
+    "trim",
+    "match",
+    "alias",
+    "immutable",
+    "select",
+    "get",
+    "set",
+    "transform",
+    "expires",
+    # Sequelize meta
+    "allownull",
+    "primarykey",
+    "autoincrement",
+    "defaultvalue",
+    "references",
+    "ondelete",
+    "onupdate",
+    "field",
+    "comment",
+    "constraints",
+    "through",
+})
+
+
+@lru_cache(maxsize=None)
 def load_traversal():
+    """Load the traversal helper once per process; per-file readers and pool workers call this for every file."""
     traversal_path = Path(__file__).with_name("project_traversal.py")
     spec = importlib.util.spec_from_file_location("codexai_project_traversal", traversal_path)
     if not spec or not spec.loader:
@@ -153,6 +278,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--output", default="", help="Output graph path")
     parser.add_argument("--include-tests", action="store_true", help="Include test files in graph")
     parser.add_argument("--no-redaction", action="store_true", help="Disable artifact redaction; not recommended")
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild even if the file set and mtimes match the cached graph")
     parser.add_argument("--print-full-json", action="store_true", help="Emit full graph JSON to stdout instead of summary envelope")
     load_traversal().add_traversal_args(parser)
     return parser.parse_args()
@@ -168,11 +294,11 @@ def normalize_warning_messages(warnings: List[Any]) -> List[str]:
             messages.append(": ".join(parts) if parts else json.dumps(item, sort_keys=True))
         else:
             messages.append(str(item))
-    return sorted(dict.fromkeys(messages))
+    return sorted(set(messages))
 
 
 def emit(payload: Dict[str, object]) -> None:
-    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    print_json(payload)
 
 
 def load_codebase_indexer():
@@ -207,16 +333,34 @@ def compact_codebase_index(index: Dict[str, object]) -> Dict[str, object]:
     }
 
 
+@lru_cache(maxsize=None)
+def resolved_path(path: Path) -> Path:
+    """Memoized Path.resolve(); build_graph clears it so each build sees the current tree."""
+    return path.resolve()
+
+
+@lru_cache(maxsize=None)
 def normalize_rel(path: Path, root: Path) -> str:
-    return path.resolve().relative_to(root.resolve()).as_posix()
+    return resolved_path(path).relative_to(resolved_path(root)).as_posix()
+
+
+# Directories listed by import resolution in the current build, with their mtime (None when missing) at listing time.
+PROBED_DIRECTORIES: Dict[str, Optional[int]] = {}
+
+
+def clear_path_caches() -> None:
+    PROBED_DIRECTORIES.clear()
+    resolved_path.cache_clear()
+    normalize_rel.cache_clear()
+    directory_files.cache_clear()
+    module_name.cache_clear()
 
 
 def is_test_file(rel_path: str) -> bool:
-    path = Path(rel_path)
-    if path.suffix.lower() not in TEST_EXTENSIONS:
-        return False
     lower = rel_path.lower()
-    name = path.name.lower()
+    if not lower.endswith(TEST_EXTENSION_SUFFIXES):
+        return False
+    name = lower.rsplit("/", 1)[-1]
     return (
         ".test." in name
         or ".spec." in name
@@ -231,13 +375,11 @@ def collect_code_files(project_root: Path, include_tests: bool) -> List[Path]:
     return [entry.path for entry in traversal.files]
 
 
-def collect_code_file_entries(
+def walk_code_files(
     project_root: Path,
     include_tests: bool,
     traversal_config=None,
 ):
-    traversal = load_traversal()
-
     def code_filter(rel: str, path: Path) -> bool:
         if path.suffix.lower() not in LANGUAGE_REGISTRY:
             return False
@@ -245,19 +387,49 @@ def collect_code_file_entries(
             return False
         return True
 
-    return traversal.traverse_project(project_root, traversal_config, file_filter=code_filter)
+    return load_traversal().walk_project(project_root, traversal_config, file_filter=code_filter)
+
+
+def collect_code_file_entries(
+    project_root: Path,
+    include_tests: bool,
+    traversal_config=None,
+):
+    return load_traversal().read_walked_files(walk_code_files(project_root, include_tests, traversal_config))
+
+
+def read_code_files(walk) -> Tuple[Any, Dict[Path, List[str]]]:
+    """Read a code-file walk and scan each file's imports in the same per-file worker.
+
+    Returns the traversal result plus the import modules found in each entry, keyed by entry path.
+    """
+    scanned: Dict[Path, List[str]] = {}
 
+    def read_samples(paths: List[Path], budgets: List[int]) -> List[Any]:
+        samples = []
+        for path, (sample, modules) in zip(paths, map_files(read_and_scan_file, paths, budgets)):
+            scanned[path] = modules
+            samples.append(sample)
+        return samples
 
-def read_limited(path: Path, warnings: List[dict[str, str]], rel_file: str) -> Tuple[str, List[str]]:
+    return load_traversal().read_walked_files(walk, read_samples), scanned
+
+
+@lru_cache(maxsize=None)
+def default_max_file_bytes() -> int:
+    return load_traversal().TraversalConfig().max_file_bytes
+
+
+def read_limited(path: Path, warnings: List[dict[str, str]], rel_file: str) -> str:
     traversal = load_traversal()
     try:
-        content, _bytes_read, large = traversal.sample_for_index(path, traversal.TraversalConfig().max_file_bytes)
+        content, _bytes_read, large = traversal.sample_for_index(path, default_max_file_bytes())
     except OSError as exc:
         warnings.append(traversal.structured_warning("read_error", rel_file, f"Unable to read file: {exc}", "warning"))
-        return "", []
+        return ""
     if large:
         warnings.append(traversal.structured_warning("large_file_sampled", rel_file, "sampled with header, symbol window, and tail metadata", "warning"))
-    return content, content.splitlines()
+    return content
 
 
 class LanguageProfile:
@@ -279,14 +451,59 @@ class LanguageProfile:
 
 
 def unique_sorted(values: Iterable[str]) -> List[str]:
-    return sorted(dict.fromkeys(value.strip() for value in values if value and value.strip()))
+    return sorted({value.strip() for value in values if value and value.strip()})
 
 
-def extract_javascript_imports(file_path: Path, content: str) -> List[str]:
+@lru_cache(maxsize=None)
+def tree_sitter_import_parser(grammar: str):
+    """Return a (parser, import query) pair for ``grammar``, or None when tree-sitter is unavailable."""
+    if tree_sitter_languages is None:
+        return None
+    try:
+        parser = tree_sitter_languages.get_parser(grammar)
+        query = tree_sitter_languages.get_language(grammar).query(TREE_SITTER_IMPORT_QUERY)
+    except Exception:
+        return None
+    return parser, query
+
+
+def extract_tree_sitter_imports(file_path: Path, content: str) -> Optional[List[str]]:
+    grammar = TREE_SITTER_GRAMMARS.get(file_path.suffix.lower())
+    loaded = tree_sitter_import_parser(grammar) if grammar else None
+    if loaded is None:
+        return None
+    parser, query = loaded
     modules: List[str] = []
-    modules.extend(IMPORT_FROM_PATTERN.findall(content))
-    modules.extend(IMPORT_SIDE_PATTERN.findall(content))
-    modules.extend(REQUIRE_PATTERN.findall(content))
+    try:
+        tree = parser.parse(content.encode("utf-8"))
+        captures = query.captures(tree.root_node)
+        # py-tree-sitter < 0.22 returns (node, name) pairs; later releases map name -> nodes.
+        if isinstance(captures, dict):
+            sources = list(captures.get("source", []))
+        else:
+            sources = [node for node, name in captures if name == "source"]
+        for node in sources:
+            if node.parent.type != "import_statement":
+                # Not every binding applies `#eq?`, so check the callee of require("...") here.
+                callee = node.parent.parent.child_by_field_name("function")
+                if callee is None or callee.text != b"require":
+                    continue
+            literal = node.text.decode("utf-8", errors="replace")
+            if len(literal) >= 2:
+                modules.append(literal[1:-1])
+    except Exception:
+        return None
+    return modules
+
+
+def extract_javascript_imports(file_path: Path, content: str) -> List[str]:
+    # One tree-sitter parse replaces the regex passes when the grammar is installed; the
+    # AST also ignores import-like text inside comments and strings.
+    modules = extract_tree_sitter_imports(file_path, content)
+    if modules is None:
+        modules = IMPORT_PATTERN.findall(content)
+        if "require(" in content:
+            modules.extend(REQUIRE_PATTERN.findall(content))
     return unique_sorted(modules)
 
 
@@ -300,7 +517,7 @@ def extract_python_imports(file_path: Path, content: str) -> List[str]:
 def extract_go_imports(file_path: Path, content: str) -> List[str]:
     modules = GO_IMPORT_SINGLE_PATTERN.findall(content)
     for block in GO_IMPORT_BLOCK_PATTERN.findall(content):
-        modules.extend(re.findall(r'(?:^|\n)\s*(?:[._A-Za-z]\w*\s+)?["`]([^"`]+)["`]', block))
+        modules.extend(GO_IMPORT_BLOCK_ITEM_PATTERN.findall(block))
     return unique_sorted(modules)
 
 
@@ -321,11 +538,11 @@ def normalize_rust_use_path(cleaned: str) -> str:
 def extract_rust_imports(file_path: Path, content: str) -> List[str]:
     modules: List[str] = []
     for raw in RUST_USE_PATTERN.findall(content):
-        cleaned = re.sub(r"\s+as\s+\w+", "", raw).strip()
+        cleaned = RUST_USE_ALIAS_PATTERN.sub("", raw).strip()
         normalized = normalize_rust_use_path(cleaned)
         if normalized:
             modules.append(normalized)
-    for match in re.findall(r"\bmod\s+([A-Za-z_]\w*)\s*;", content):
+    for match in RUST_MOD_PATTERN.findall(content):
         modules.append(f"self::{match}")
     return unique_sorted(modules)
 
@@ -411,7 +628,7 @@ def extract_fallback_definitions(file_path: Path, content: str) -> List[str]:
         names.update(f"config:{name}" for name in CONFIG_BLOCK_PATTERN.findall(content))
     elif ext == ".json":
         names.update(f"config:{name}" for name in JSON_KEY_PATTERN.findall(content))
-    elif ext in {".vue", ".svelte"} and re.search(r"<script|<template", content, flags=re.IGNORECASE):
+    elif ext in {".vue", ".svelte"} and COMPONENT_MARKUP_PATTERN.search(content):
         names.add(Path(file_path).stem)
     return unique_sorted(names)
 
@@ -565,6 +782,7 @@ def build_code_index(
     reverse_map: Dict[str, Set[str]],
     raw_content: Dict[str, str],
     lines_cache: Dict[str, List[str]],
+    dependency_tree: Optional[Dict[str, Dict[str, List[str]]]] = None,
 ) -> Tuple[Dict[str, Dict[str, object]], Dict[str, Dict[str, object]], List[Dict[str, object]], List[str]]:
     code_index: Dict[str, Dict[str, object]] = {}
     external_dependencies: Dict[str, Dict[str, object]] = {}
@@ -589,6 +807,8 @@ def build_code_index(
             risk_signals.append({"type": "auth_or_secret_logic", "file": rel, "reason": "File contains auth, token, password, or credential-related terms."})
 
         chunks = build_chunks(lines)
+        # Reuse the lists convert_dependency_map already sorted instead of sorting each file's edges twice.
+        dependencies = dependency_tree.get(rel) if dependency_tree is not None else None
         code_index[rel] = {
             "path": rel,
             "language": (language_profile(file_path).language if language_profile(file_path) else file_path.suffix.lstrip(".") or "unknown"),
@@ -599,8 +819,8 @@ def build_code_index(
             "preview": build_chunk_preview(lines),
             "chunks": chunks,
             "chunk_stats": chunk_stats(lines),
-            "imports": sorted(imports_map.get(rel, set())),
-            "imported_by": sorted(reverse_map.get(rel, set())),
+            "imports": dependencies["imports"] if dependencies else sorted(imports_map.get(rel, set())),
+            "imported_by": dependencies["imported_by"] if dependencies else sorted(reverse_map.get(rel, set())),
             "external_imports": externals,
             "is_test": is_test_file(rel),
             "is_entrypoint": rel in entrypoints,
@@ -690,21 +910,54 @@ def expand_candidates(base: Path) -> List[Path]:
 
 def inside_root(path: Path, root: Path) -> bool:
     try:
-        path.resolve().relative_to(root.resolve())
+        resolved_path(path).relative_to(resolved_path(root))
         return True
     except ValueError:
         return False
 
 
+@lru_cache(maxsize=None)
+def directory_files(directory: str) -> Tuple[frozenset, frozenset]:
+    """Names of regular files (symlinks followed) in a directory, plus their casefolded forms, listed once per build."""
+    names: Set[str] = set()
+    # Creating or deleting a file bumps its directory's mtime, so this stamp tracks resolution targets that are
+    # outside the traversed entries.
+    try:
+        PROBED_DIRECTORIES[directory] = os.stat(directory).st_mtime_ns
+    except OSError:
+        PROBED_DIRECTORIES[directory] = None
+    try:
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                try:
+                    if entry.is_file():
+                        names.add(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return frozenset(names), frozenset(name.casefold() for name in names)
+
+
 def choose_existing(candidates: Iterable[Path], root: Path, existing: Set[Path]) -> Optional[Path]:
     for candidate in candidates:
+        # Lexical normalization is a hash probe; only candidates present in a cached directory
+        # listing fall through to resolve(), which covers symlinks and files outside the graph.
+        # A name that matches the listing only by case (./Utils for utils.js) also falls through,
+        # so case-insensitive filesystems still resolve it and case-sensitive ones reject it there.
+        lexical = Path(os.path.normpath(candidate))
+        if lexical in existing:
+            return lexical
+        names, folded_names = directory_files(str(lexical.parent))
+        if lexical.name not in names and lexical.name.casefold() not in folded_names:
+            continue
         try:
-            resolved = candidate.resolve()
+            resolved = resolved_path(candidate)
         except OSError:
             continue
         if resolved in existing:
             return resolved
-        if resolved.exists() and resolved.is_file() and inside_root(resolved, root):
+        if resolved.is_file() and inside_root(resolved, root):
             return resolved
     return None
 
@@ -824,79 +1077,134 @@ def resolve_import_module(importer: Path, module: str, root: Path, existing: Set
     return None
 
 
+def scan_file_imports(file_path: Path, content: str) -> List[str]:
+    return parse_import_modules(file_path, content) if content else []
+
+
+def read_and_scan_file(file_path: Path, max_bytes: int) -> Tuple[Any, List[str]]:
+    sample = load_traversal().read_sample(file_path, max_bytes)
+    if isinstance(sample, OSError):
+        return sample, []
+    return sample, scan_file_imports(file_path, sample[0])
+
+
+def pool_can_import(func: Callable[..., Any]) -> bool:
+    """Whether worker processes can unpickle ``func``, which pickle stores as module name plus qualified name.
+
+    A forked child inherits ``sys.modules``, so the function only has to be registered there under its module name.
+    A spawned child (the default on Windows and macOS) re-imports that module by name, so it must also be findable on
+    ``sys.path``. build_knowledge_index loads this file under an unregistered alias, which fails both checks, so the
+    pool is skipped up front instead of failing after its workers have started.
+    """
+    func_module = getattr(func, "__module__", None) or ""
+    module = sys.modules.get(func_module)
+    if module is None or getattr(module, func.__qualname__, None) is not func:
+        return False
+    if multiprocessing.get_start_method() == "fork":
+        return True
+    module_file = getattr(module, "__file__", None)
+    if func_module == "__main__":
+        return module_file is not None
+    if "." in func_module or module_file is None:
+        return False
+    spec = importlib.machinery.PathFinder.find_spec(func_module)
+    return spec is not None and spec.origin is not None and Path(spec.origin).resolve() == Path(module_file).resolve()
+
+
+def map_files(func: Callable[..., Any], *columns: Sequence[Any]) -> List[Any]:
+    """Apply a per-file worker across processes; serial for small inputs or when a pool is unavailable."""
+    count = len(columns[0]) if columns else 0
+    workers = min(count, os.cpu_count() or 1)
+    if count >= PARALLEL_MIN_FILES and workers > 1 and pool_can_import(func):
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(func, *columns, chunksize=PARALLEL_CHUNK_SIZE))
+        except (OSError, BrokenProcessPool, pickle.PicklingError):
+            pass
+    return [func(*args) for args in zip(*columns)]
+
+
+def add_import_edges(
+    file_path: Path,
+    rel: str,
+    modules: Iterable[str],
+    project_root: Path,
+    existing: Set[Path],
+    imports_map: Dict[str, Set[str]],
+    reverse_map: Dict[str, Set[str]],
+    boundaries: Optional[Tuple[Dict[str, Dict[str, Set[str]]], Dict[str, Set[str]]]] = None,
+) -> None:
+    for module in modules:
+        resolved = resolve_import_module(file_path, module, project_root, existing)
+        if not resolved:
+            continue
+        target_rel = normalize_rel(resolved, project_root)
+        if target_rel == rel:
+            continue
+        imports_map[rel].add(target_rel)
+        reverse_map[target_rel].add(rel)
+        if boundaries is not None:
+            record_module_edge(boundaries, rel, target_rel)
+
+
 def build_dependency_graph_from_entries(
     project_root: Path,
     entries: List[object],
+    scanned_imports: Optional[Dict[Path, List[str]]] = None,
 ) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]], Dict[str, str], Dict[str, object]]:
     files = [entry.path for entry in entries]
-    existing = {path.resolve() for path in files}
+    existing = {resolved_path(path) for path in files}
     imports_map: Dict[str, Set[str]] = defaultdict(set)
     reverse_map: Dict[str, Set[str]] = defaultdict(set)
     raw_content: Dict[str, str] = {}
-    lines_cache: Dict[str, List[str]] = {}
     warnings: List[dict[str, str]] = []
 
+    # Module boundaries are filled in alongside file edges, so build_graph needs no second pass.
+    boundaries = new_module_boundaries()
+
+    # read_code_files scans imports in the workers that read each file; entries from elsewhere are scanned here.
     for entry in entries:
-        file_path = entry.path
         rel = entry.rel_path
-        content = entry.content
-        lines = entry.lines
-        raw_content[rel] = content
-        lines_cache[rel] = lines
-        if not content:
-            continue
-        for module in parse_import_modules(file_path, content):
-            resolved = resolve_import_module(file_path, module, project_root, existing)
-            if not resolved:
-                continue
-            target_rel = normalize_rel(resolved, project_root)
-            if target_rel == rel:
-                continue
-            imports_map[rel].add(target_rel)
-            reverse_map[target_rel].add(rel)
+        raw_content[rel] = entry.content
+        if scanned_imports is not None and entry.path in scanned_imports:
+            modules = scanned_imports[entry.path]
+        else:
+            modules = scan_file_imports(entry.path, entry.content)
+        add_import_edges(entry.path, rel, modules, project_root, existing, imports_map, reverse_map, boundaries)
 
     for rel in [normalize_rel(path, project_root) for path in files]:
         imports_map.setdefault(rel, set())
         reverse_map.setdefault(rel, set())
+        boundaries[0][module_name(rel)]
 
-    return imports_map, reverse_map, raw_content, {"warnings": warnings, "lines": lines_cache}
+    return imports_map, reverse_map, raw_content, {"warnings": warnings, "module_boundaries": boundaries}
 
 
 def build_dependency_graph(
     project_root: Path,
     files: List[Path],
-) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]], Dict[str, str], Dict[str, List[str]]]:
-    existing = {path.resolve() for path in files}
+) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]], Dict[str, str], List[dict[str, str]]]:
+    clear_path_caches()
+    existing = {resolved_path(path) for path in files}
     imports_map: Dict[str, Set[str]] = defaultdict(set)
     reverse_map: Dict[str, Set[str]] = defaultdict(set)
     raw_content: Dict[str, str] = {}
-    lines_cache: Dict[str, List[str]] = {}
     warnings: List[dict[str, str]] = []
 
-    for file_path in files:
-        rel = normalize_rel(file_path, project_root)
-        content, lines = read_limited(file_path, warnings, rel)
+    rels = [normalize_rel(file_path, project_root) for file_path in files]
+    for file_path, rel in zip(files, rels):
+        content = read_limited(file_path, warnings, rel)
         raw_content[rel] = content
-        lines_cache[rel] = lines
-        if not content:
-            continue
-        for module in parse_import_modules(file_path, content):
-            resolved = resolve_import_module(file_path, module, project_root, existing)
-            if not resolved:
-                continue
-            target_rel = normalize_rel(resolved, project_root)
-            if target_rel == rel:
-                continue
-            imports_map[rel].add(target_rel)
-            reverse_map[target_rel].add(rel)
+        add_import_edges(file_path, rel, scan_file_imports(file_path, content), project_root, existing, imports_map, reverse_map)
 
-    for rel in [normalize_rel(path, project_root) for path in files]:
+    for rel in rels:
         imports_map.setdefault(rel, set())
         reverse_map.setdefault(rel, set())
 
-    return imports_map, reverse_map, raw_content, {"warnings": warnings, "lines": lines_cache}  # type: ignore[return-value]
+    return imports_map, reverse_map, raw_content, warnings
 
 
+@lru_cache(maxsize=None)
 def module_name(rel_file: str) -> str:
     parts = list(Path(rel_file).parts)
     if not parts:
@@ -916,71 +1224,104 @@ def module_name(rel_file: str) -> str:
     return lowered[0]
 
 
-def build_module_boundaries(file_deps: Dict[str, Set[str]]) -> Tuple[Dict[str, Dict[str, Set[str]]], List[List[str]]]:
+def new_module_boundaries() -> Tuple[Dict[str, Dict[str, Set[str]]], Dict[str, Set[str]]]:
     module_map: Dict[str, Dict[str, Set[str]]] = defaultdict(lambda: {"imports_from": set(), "imported_by": set()})
     module_graph: Dict[str, Set[str]] = defaultdict(set)
+    return module_map, module_graph
+
+
+def record_module_edge(
+    boundaries: Tuple[Dict[str, Dict[str, Set[str]]], Dict[str, Set[str]]],
+    source: str,
+    target: str,
+) -> None:
+    module_map, module_graph = boundaries
+    source_module = module_name(source)
+    target_module = module_name(target)
+    module_map[source_module]
+    module_map[target_module]
+    if source_module == target_module:
+        return
+    module_map[source_module]["imports_from"].add(target_module)
+    module_map[target_module]["imported_by"].add(source_module)
+    module_graph[source_module].add(target_module)
+
 
+def build_module_boundaries(file_deps: Dict[str, Set[str]]) -> Tuple[Dict[str, Dict[str, Set[str]]], List[List[str]]]:
+    boundaries = new_module_boundaries()
     for source, imports in file_deps.items():
-        source_module = module_name(source)
-        module_map[source_module]
+        boundaries[0][module_name(source)]
         for target in imports:
-            target_module = module_name(target)
-            module_map[target_module]
-            if source_module == target_module:
-                continue
-            module_map[source_module]["imports_from"].add(target_module)
-            module_map[target_module]["imported_by"].add(source_module)
-            module_graph[source_module].add(target_module)
-
-    cycles = strongly_connected_components(module_graph)
-    return module_map, cycles
+            record_module_edge(boundaries, source, target)
+    return boundaries[0], strongly_connected_components(boundaries[1])
 
 
 def strongly_connected_components(graph: Dict[str, Set[str]]) -> List[List[str]]:
+    nodes = set(graph)
+    for neighbors in graph.values():
+        nodes.update(neighbors)
+    # Tarjan runs on dense integer ids; ids follow sorted names, so sorted id lists keep the
+    # deterministic name order and the bookkeeping lives in flat lists instead of dicts.
+    names = sorted(nodes)
+    node_ids = {name: node_id for node_id, name in enumerate(names)}
+    adjacency: List[List[int]] = [sorted(node_ids[neighbor] for neighbor in graph.get(name, ())) for name in names]
+
     index = 0
-    indices: Dict[str, int] = {}
-    low_links: Dict[str, int] = {}
-    stack: List[str] = []
-    on_stack: Set[str] = set()
+    indices: List[int] = [-1] * len(names)
+    low_links: List[int] = [0] * len(names)
+    stack: List[int] = []
+    on_stack: List[bool] = [False] * len(names)
     result: List[List[str]] = []
+    # Explicit DFS stack of (node, neighbor iterator) so deep graphs cannot hit the recursion limit.
+    work: List[Tuple[int, Iterator[int]]] = []
 
-    def strong_connect(node: str) -> None:
+    def visit(node: int) -> None:
         nonlocal index
         indices[node] = index
         low_links[node] = index
         index += 1
         stack.append(node)
-        on_stack.add(node)
-
-        for neighbor in sorted(graph.get(node, set())):
-            if neighbor not in indices:
-                strong_connect(neighbor)
-                low_links[node] = min(low_links[node], low_links[neighbor])
-            elif neighbor in on_stack:
-                low_links[node] = min(low_links[node], indices[neighbor])
-
-        if low_links[node] == indices[node]:
-            component: List[str] = []
-            while stack:
-                popped = stack.pop()
-                on_stack.discard(popped)
-                component.append(popped)
-                if popped == node:
-                    break
-            component = sorted(component)
-            if len(component) > 1:
-                result.append(component)
-            elif len(component) == 1 and component[0] in graph.get(component[0], set()):
-                result.append(component)
+        on_stack[node] = True
+        work.append((node, iter(adjacency[node])))
 
-    for node in sorted(set(graph.keys()) | {item for values in graph.values() for item in values}):
-        if node not in indices:
-            strong_connect(node)
+    for root in range(len(names)):
+        if indices[root] >= 0:
+            continue
+        visit(root)
+        while work:
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if indices[neighbor] < 0:
+                    visit(neighbor)
+                    break
+                if on_stack[neighbor]:
+                    low_links[node] = min(low_links[node], indices[neighbor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low_links[parent] = min(low_links[parent], low_links[node])
+                if low_links[node] != indices[node]:
+                    continue
+                component: List[int] = []
+                while stack:
+                    popped = stack.pop()
+                    on_stack[popped] = False
+                    component.append(popped)
+                    if popped == node:
+                        break
+                if len(component) > 1 or node in adjacency[node]:
+                    result.append([names[member] for member in sorted(component)])
 
     result.sort()
     return result
 
 
+@lru_cache(maxsize=None)
+def route_pattern(name: str) -> re.Pattern:
+    return re.compile(ROUTE_PATTERN_SOURCES[name])
+
+
 def parse_aliases_for_route_file(
     route_path: Path,
     route_rel: str,
@@ -997,45 +1338,16 @@ def parse_aliases_for_route_file(
             return None
         return normalize_rel(resolved, project_root)
 
-    for alias, module in JS_IMPORT_DEFAULT_PATTERN.findall(content):
-        module_rel = resolve(module)
-        if module_rel:
-            alias_to_module[alias.strip()] = module_rel
-
-    for inside, module in JS_IMPORT_NAMED_PATTERN.findall(content):
-        module_rel = resolve(module)
+    for import_alias, import_members, import_module, require_alias, require_members, require_module in route_pattern("binding").findall(content):
+        module_rel = resolve(import_module or require_module)
         if not module_rel:
             continue
-        for part in inside.split(","):
-            token = part.strip()
-            if not token:
-                continue
-            if " as " in token:
-                source, local = [value.strip() for value in token.split(" as ", 1)]
-            else:
-                source = token
-                local = token
-            symbol_to_module[local] = (module_rel, source)
-
-    for alias, module in JS_REQUIRE_ALIAS_PATTERN.findall(content):
-        module_rel = resolve(module)
-        if module_rel:
-            alias_to_module[alias.strip()] = module_rel
-
-    for inside, module in JS_REQUIRE_NAMED_PATTERN.findall(content):
-        module_rel = resolve(module)
-        if not module_rel:
+        alias = import_alias or require_alias
+        if alias:
+            alias_to_module[alias] = module_rel
             continue
-        for part in inside.split(","):
-            token = part.strip()
-            if not token:
-                continue
-            if ":" in token:
-                source, local = [value.strip() for value in token.split(":", 1)]
-            else:
-                source = token
-                local = token
-            symbol_to_module[local] = (module_rel, source)
+        for source, local in route_pattern("binding_member").findall(import_members or require_members):
+            symbol_to_module[local or source] = (module_rel, source)
 
     return alias_to_module, symbol_to_module
 
@@ -1049,7 +1361,7 @@ def normalize_handler(raw: str) -> str:
         parts = [part.strip() for part in token.split(",") if part.strip()]
         if parts:
             token = parts[-1]
-    wrapper = re.match(r"^[A-Za-z_$][\w$]*\(([^()]+)\)$", token)
+    wrapper = route_pattern("handler_wrapper").match(token)
     if wrapper:
         inner = wrapper.group(1).strip()
         if "." in inner:
@@ -1057,15 +1369,35 @@ def normalize_handler(raw: str) -> str:
     return token.strip()
 
 
-def model_names_from_controller(controller_rel: str, file_deps: Dict[str, Set[str]]) -> List[str]:
-    names: Set[str] = set()
-    for dep in file_deps.get(controller_rel, set()):
-        lower = dep.lower()
+def build_model_file_names(rels: Iterable[str]) -> Dict[str, str]:
+    model_file_names: Dict[str, str] = {}
+    for rel in rels:
+        lower = rel.lower()
         if "/models/" in lower or ".model." in lower:
-            stem = Path(dep).stem
-            stem = re.sub(r"\.model$", "", stem, flags=re.IGNORECASE)
-            names.add(stem)
-    return sorted(names)
+            model_file_names[rel] = MODEL_SUFFIX_PATTERN.sub("", Path(rel).stem)
+    return model_file_names
+
+
+def model_names_from_controller(
+    controller_rel: str,
+    file_deps: Dict[str, Set[str]],
+    model_file_names: Dict[str, str],
+) -> List[str]:
+    return sorted({model_file_names[dep] for dep in file_deps.get(controller_rel, ()) if dep in model_file_names})
+
+
+def is_route_candidate(rel: str, content: str) -> bool:
+    if not rel.lower().endswith(ROUTE_EXTENSION_SUFFIXES) or not content:
+        return False
+    return bool(ROUTE_FILE_HINT.search(rel)) or "router." in content or "app." in content
+
+
+def is_model_candidate(rel: str) -> bool:
+    lower = rel.lower()
+    stem = Path(lower).stem
+    if "/models/" not in lower and "model" not in stem:
+        return False
+    return stem not in MODEL_SKIP_STEMS
 
 
 def build_api_route_map(
@@ -1074,25 +1406,25 @@ def build_api_route_map(
     file_deps: Dict[str, Set[str]],
     raw_content: Dict[str, str],
 ) -> List[Dict[str, object]]:
-    existing = {path.resolve() for path in files}
+    existing = {resolved_path(path) for path in files}
     routes: List[Dict[str, object]] = []
+    # Model names per file are derived once; controllers shared by many routes are looked up once too.
+    model_file_names = build_model_file_names(file_deps)
+    controller_models: Dict[str, List[str]] = {}
+
+    def models_for(controller_rel: str) -> List[str]:
+        if controller_rel not in controller_models:
+            controller_models[controller_rel] = model_names_from_controller(controller_rel, file_deps, model_file_names)
+        return controller_models[controller_rel]
 
     for route_path in files:
-        ext = route_path.suffix.lower()
-        if ext not in {".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"}:
-            continue
         route_rel = normalize_rel(route_path, project_root)
         content = raw_content.get(route_rel, "")
-        if not content:
-            continue
-        if not ROUTE_FILE_HINT.search(route_rel) and "router." not in content and "app." not in content:
+        if not is_route_candidate(route_rel, content):
             continue
 
         alias_map, symbol_map = parse_aliases_for_route_file(route_path, route_rel, content, project_root, existing)
-        for line in content.splitlines():
-            match = ROUTE_CALL_PATTERN.search(line)
-            if not match:
-                continue
+        for match in route_pattern("route_call").finditer(content):
             method = match.group(1).upper()
             path_value = match.group(2).strip()
             handler_chunk = match.group(3).strip()
@@ -1105,13 +1437,13 @@ def build_api_route_map(
                 controller_rel = alias_map.get(alias.strip())
                 if controller_rel:
                     handler_label = f"{Path(controller_rel).stem}.{method_name.strip()}"
-                    model_hints = model_names_from_controller(controller_rel, file_deps)
+                    model_hints = models_for(controller_rel)
             else:
                 symbol = symbol_map.get(handler_token)
                 if symbol:
                     controller_rel, exported = symbol
                     handler_label = f"{Path(controller_rel).stem}.{exported}"
-                    model_hints = model_names_from_controller(controller_rel, file_deps)
+                    model_hints = models_for(controller_rel)
 
             route_item: Dict[str, object] = {
                 "method": method,
@@ -1131,95 +1463,31 @@ def extract_first_object_block(text: str, start_pos: int) -> str:
     if brace_start == -1:
         return ""
     depth = 0
-    in_single = False
-    in_double = False
-    escaped = False
-    for idx in range(brace_start, len(text)):
-        ch = text[idx]
-        if in_single:
-            if escaped:
-                escaped = False
-            elif ch == "\\":
-                escaped = True
-            elif ch == "'":
-                in_single = False
-            continue
-        if in_double:
-            if escaped:
-                escaped = False
-            elif ch == "\\":
-                escaped = True
-            elif ch == '"':
-                in_double = False
-            continue
-        if ch == "'":
-            in_single = True
-            continue
-        if ch == '"':
-            in_double = True
-            continue
-        if ch == "{":
+    for match in OBJECT_BLOCK_TOKEN_PATTERN.finditer(text, brace_start):
+        token = match.group()
+        if token == "{":
             depth += 1
-        elif ch == "}":
+        elif token == "}":
             depth -= 1
             if depth == 0:
-                return text[brace_start : idx + 1]
+                return text[brace_start : match.end()]
     return ""
 
 
 def extract_keys_from_block(block: str) -> List[str]:
-    schema_meta_keys = {
-        # Mongoose meta
-        "type",
-        "required",
-        "default",
-        "ref",
-        "unique",
-        "validate",
-        "index",
-        "sparse",
-        "enum",
-        "min",
-        "max",
-        "minlength",
-        "maxlength",
-        "lowercase",
-        "uppercase",
-        "trim",
-        "match",
-        "alias",
-        "immutable",
-        "select",
-        "get",
-        "set",
-        "transform",
-        "expires",
-        # Sequelize meta
-        "allownull",
-        "primarykey",
-        "autoincrement",
-        "defaultvalue",
-        "references",
-        "ondelete",
-        "onupdate",
-        "field",
-        "comment",
-        "constraints",
-        "through",
-    }
     keys: List[str] = []
     for line in block.splitlines():
         stripped = line.strip()
         if not stripped:
             continue
-        match = re.match(r"^['\"]?([A-Za-z_][\w]*)['\"]?\s*:", stripped)
+        match = MODEL_KEY_LINE_PATTERN.match(stripped)
         if not match:
             continue
         key = match.group(1)
-        if key.lower() in schema_meta_keys:
+        if key.lower() in MODEL_SCHEMA_META_KEYS:
             continue
         keys.append(key)
-    deduped = sorted(dict.fromkeys(keys))
+    deduped = sorted(set(keys))
     return deduped[:60]
 
 
@@ -1235,28 +1503,20 @@ def detect_model_type(text: str) -> str:
 
 
 def detect_model_name(rel_file: str, text: str) -> str:
-    patterns = [
-        re.compile(r"mongoose\.model\(\s*['\"]([A-Za-z_]\w*)['\"]"),
-        re.compile(r"sequelize\.define\(\s*['\"]([A-Za-z_]\w*)['\"]"),
-        re.compile(r"class\s+([A-Za-z_]\w*)\s+extends\s+Model"),
-    ]
-    for pattern in patterns:
+    for pattern in MODEL_NAME_PATTERNS:
         match = pattern.search(text)
         if match:
             return match.group(1)
     stem = Path(rel_file).stem
-    stem = re.sub(r"\.model$", "", stem, flags=re.IGNORECASE)
+    stem = MODEL_SUFFIX_PATTERN.sub("", stem)
     return stem
 
 
 def detect_relationships(text: str) -> List[Dict[str, str]]:
     relations: List[Dict[str, str]] = []
-    for match in re.finditer(r"([A-Za-z_]\w*)\s*:\s*\{[^{}]*ref\s*:\s*['\"]([A-Za-z_]\w*)['\"]", text, flags=re.DOTALL):
+    for match in MODEL_REF_RELATION_PATTERN.finditer(text):
         relations.append({"type": "ref", "target": match.group(2), "field": match.group(1)})
-    for relation_type, target in re.findall(
-        r"\.(belongsTo|hasMany|hasOne|belongsToMany)\(\s*([A-Za-z_]\w*)",
-        text,
-    ):
+    for relation_type, target in MODEL_ASSOCIATION_PATTERN.findall(text):
         relations.append({"type": relation_type, "target": target, "field": ""})
     unique: List[Dict[str, str]] = []
     seen: Set[Tuple[str, str, str]] = set()
@@ -1277,11 +1537,7 @@ def build_data_model_map(
     models: Dict[str, Dict[str, object]] = {}
     for file_path in files:
         rel = normalize_rel(file_path, project_root)
-        lower = rel.lower()
-        if "/models/" not in lower and "model" not in Path(rel).stem.lower():
-            continue
-        stem_lower = Path(rel).stem.lower()
-        if stem_lower in {"index", "init", "setup", "associations", "connection"}:
+        if not is_model_candidate(rel):
             continue
         content = raw_content.get(rel, "")
         if not content:
@@ -1291,9 +1547,9 @@ def build_data_model_map(
         model_name = detect_model_name(rel, content)
 
         block = ""
-        schema_match = re.search(r"new\s+(?:mongoose\.)?Schema\s*\(", content)
-        define_match = re.search(r"sequelize\.define\s*\(", content)
-        init_match = re.search(r"\.init\s*\(", content)
+        schema_match = MODEL_SCHEMA_CALL_PATTERN.search(content)
+        define_match = MODEL_DEFINE_CALL_PATTERN.search(content)
+        init_match = MODEL_INIT_CALL_PATTERN.search(content)
         if schema_match:
             block = extract_first_object_block(content, schema_match.end())
         elif define_match:
@@ -1314,7 +1570,7 @@ def build_data_model_map(
 
 def convert_dependency_map(imports_map: Dict[str, Set[str]], reverse_map: Dict[str, Set[str]]) -> Dict[str, Dict[str, List[str]]]:
     result: Dict[str, Dict[str, List[str]]] = {}
-    files = sorted(set(imports_map.keys()) | set(reverse_map.keys()))
+    files = sorted(imports_map.keys() | reverse_map.keys())
     for rel in files:
         result[rel] = {
             "imports": sorted(imports_map.get(rel, set())),
@@ -1338,14 +1594,24 @@ def build_graph(
     include_tests: bool,
     traversal_config=None,
     redaction_enabled: bool = True,
+    traversal_result=None,
+    scanned_imports: Optional[Dict[Path, List[str]]] = None,
 ) -> Dict[str, object]:
-    traversal_result = collect_code_file_entries(project_root, include_tests=include_tests, traversal_config=traversal_config)
+    clear_path_caches()
+    if traversal_result is None:
+        traversal_result, scanned_imports = read_code_files(
+            walk_code_files(project_root, include_tests=include_tests, traversal_config=traversal_config)
+        )
     files = [entry.path for entry in traversal_result.files]
-    imports_map, reverse_map, raw_content, aux = build_dependency_graph_from_entries(project_root, traversal_result.files)
+    imports_map, reverse_map, raw_content, aux = build_dependency_graph_from_entries(
+        project_root, traversal_result.files, scanned_imports
+    )
     warnings: List[dict[str, str]] = list(traversal_result.warnings) + list(aux["warnings"])
-    lines_cache: Dict[str, List[str]] = aux["lines"]  # type: ignore[assignment]
+    # Line lists come straight from the traversal entries; nothing downstream splits content again.
+    lines_cache: Dict[str, List[str]] = {entry.rel_path: entry.lines for entry in traversal_result.files}
 
-    module_boundaries_raw, module_cycles = build_module_boundaries(imports_map)
+    module_boundaries_raw, module_graph = aux["module_boundaries"]  # type: ignore[misc]
+    module_cycles = strongly_connected_components(module_graph)
     routes = build_api_route_map(project_root, files, imports_map, raw_content)
     models = build_data_model_map(project_root, files, raw_content)
     codebase_index: Dict[str, object] = {}
@@ -1353,7 +1619,7 @@ def build_graph(
         indexer = load_codebase_indexer()
         codebase_index = indexer.build_codebase_index(
             project_root,
-            output_path=project_root / ".codex" / "knowledge" / "codebase-index.json",
+            output_path=project_root / CODEBASE_INDEX_PATH,
             incremental=True,
             rebuild=False,
         )
@@ -1370,6 +1636,7 @@ def build_graph(
         reverse_map,
         raw_content,
         lines_cache,
+        dependency_tree,
     )
     codebase_files = set()
     if isinstance(codebase_index.get("files"), dict):
@@ -1443,6 +1710,85 @@ def build_graph(
     return graph
 
 
+def file_stamps(files: Iterable[Tuple[str, Path]]) -> List[Tuple[str, int, int]]:
+    stamps = []
+    for rel_path, path in files:
+        stat = path.stat()
+        stamps.append((rel_path, stat.st_mtime_ns, stat.st_size))
+    return sorted(stamps)
+
+
+def graph_cache_key(
+    project_root: Path,
+    walked_files: Sequence[Any],
+    options: Dict[str, object],
+    index_files: Sequence[Path] = (),
+) -> str:
+    # Stamps come from the stat-only walk, so a hit never reads file contents. The embedded codebase index walks
+    # its own file set (configs, docs-adjacent code), so its inputs are stamped separately.
+    script_dir = Path(__file__).resolve().parent
+    payload = json.dumps(
+        {
+            "schema_version": SCHEMA_VERSION,
+            "builder": file_stamps((name, script_dir / name) for name in GRAPH_BUILDER_SOURCES),
+            "project_root": project_root.as_posix(),
+            "options": options,
+            "files": sorted((item.rel_path, item.mtime_ns, item.size_bytes) for item in walked_files),
+            "codebase_index_files": file_stamps((path.relative_to(project_root).as_posix(), path) for path in index_files),
+        },
+        sort_keys=True,
+        default=lambda value: sorted(value) if isinstance(value, (set, frozenset)) else str(value),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def directory_stamp(directory: str) -> Optional[int]:
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_graph_cache_index(index_path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        data = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        str(key): value
+        for key, value in data.items()
+        if isinstance(value, dict) and isinstance(value.get("output"), str) and isinstance(value.get("directories"), dict)
+    }
+
+
+def load_cached_graph(index_path: Path, key: str, output_path: Path) -> Optional[Dict[str, object]]:
+    record = load_graph_cache_index(index_path).get(key)
+    if record is None or record["output"] != output_path.as_posix():
+        return None
+    # The key covers the traversed files; resolution may also have matched files outside them, so every directory
+    # it listed must still be as it was.
+    if any(directory_stamp(directory) != stamp for directory, stamp in record["directories"].items()):
+        return None
+    try:
+        graph = json.loads(output_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(graph, dict) or graph.get("schema_version") != SCHEMA_VERSION:
+        return None
+    return graph
+
+
+def record_graph_cache(index_path: Path, key: str, output_path: Path, directories: Dict[str, Optional[int]]) -> None:
+    target = output_path.as_posix()
+    # One entry per output path: a rebuild supersedes whatever key last pointed there.
+    index = {cached_key: record for cached_key, record in load_graph_cache_index(index_path).items() if record["output"] != target}
+    index[key] = {"output": target, "directories": dict(sorted(directories.items()))}
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index_path.write_text(json.dumps(index, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
 def main() -> int:
     args = parse_args()
     project_root = Path(args.project_root).expanduser().resolve()
@@ -1454,16 +1800,41 @@ def main() -> int:
 
     try:
         traversal_config = load_traversal().config_from_args(args)
-        graph = build_graph(
+        walk = walk_code_files(project_root, include_tests=args.include_tests, traversal_config=traversal_config)
+        cache_index_path = project_root / ".codex" / GRAPH_CACHE_INDEX_NAME
+        try:
+            index_files = load_codebase_indexer().discover_files(project_root)
+        except Exception:
+            # build_graph reports the indexer failure as a warning; the key just stops tracking its inputs.
+            index_files = []
+        cache_key = graph_cache_key(
             project_root,
-            include_tests=args.include_tests,
-            traversal_config=traversal_config,
-            redaction_enabled=not args.no_redaction,
+            walk.files,
+            {"include_tests": args.include_tests, "redaction": not args.no_redaction, "traversal": vars(traversal_config)},
+            index_files,
         )
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with output_path.open("w", encoding="utf-8", newline="\n") as handle:
-            json.dump(graph, handle, ensure_ascii=False, indent=2)
-            handle.write("\n")
+        graph = None if args.no_cache else load_cached_graph(cache_index_path, cache_key, output_path)
+        if graph is not None and not (project_root / CODEBASE_INDEX_PATH).is_file():
+            # A hit skips the indexer, so a deleted codebase index forces a rebuild to recreate it.
+            graph = None
+        cached = graph is not None
+        if graph is None:
+            # Create the output directories first: the build stamps directories it lists, and its own writes must
+            # not change those stamps.
+            for directory in {output_path.parent, cache_index_path.parent, (project_root / CODEBASE_INDEX_PATH).parent}:
+                directory.mkdir(parents=True, exist_ok=True)
+            traversal_result, scanned_imports = read_code_files(walk)
+            graph = build_graph(
+                project_root,
+                include_tests=args.include_tests,
+                traversal_config=traversal_config,
+                redaction_enabled=not args.no_redaction,
+                traversal_result=traversal_result,
+                scanned_imports=scanned_imports,
+            )
+            probed_directories = dict(PROBED_DIRECTORIES)
+            output_path.write_bytes(render_json(graph) + b"\n")
+            record_graph_cache(cache_index_path, cache_key, output_path, probed_directories)
     except PermissionError as exc:
         emit({"status": "error", "path": "", "message": f"Permission denied: {exc}"})
         return 1
@@ -1474,7 +1845,7 @@ def main() -> int:
         emit({"status": "error", "path": "", "message": f"Unexpected error: {exc}"})
         return 1
 
-    payload = {"status": "generated", "path": output_path.as_posix(), **graph}
+    payload = {"status": "generated", "path": output_path.as_posix(), **graph, "cached": cached}
     if args.print_full_json:
         emit(payload)
     else:
@@ -1485,6 +1856,7 @@ def main() -> int:
             "stats": graph.get("stats"),
             "warnings_count": len(graph.get("warnings", [])),
             "redaction": graph.get("redaction"),
+            "cached": cached,
         })
     return 0
 
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import sys
 from collections import Counter, defaultdict
@@ -14,16 +15,29 @@ from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
 
-SESSION_HEADER_RE = re.compile(r"^#\s*Session Summary:\s*(\d{4}-\d{2}-\d{2})\s*$", re.MULTILINE)
-COMMITS_RE = re.compile(r"^- Commits:\s*(\d+)\s*$", re.MULTILINE)
-FILES_CHANGED_RE = re.compile(r"^- Files changed:\s*(\d+)\s*$", re.MULTILINE)
+from json_output import print_json
+
+
+# Session header date, commit count and files-changed count in one scan; each field keeps its first match.
+SESSION_FIELDS_RE = re.compile(
+    r"^(?:#\s*Session Summary:\s*(?P<date>\d{4}-\d{2}-\d{2})"
+    r"|- Commits:\s*(?P<commits>\d+)"
+    r"|- Files changed:\s*(?P<files>\d+))\s*$",
+    re.MULTILINE,
+)
 DATE_FIELD_RE = re.compile(r"^Date:\s*(.+)$", re.MULTILINE)
 CATEGORY_FIELD_RE = re.compile(r"^Category:\s*(.+)$", re.MULTILINE)
+ISO_DATE_TOKEN_RE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
 
 FEEDBACK_ARCHIVE_THRESHOLD = 50
 MAX_SESSION_KEY_CHANGES = 8
 MAX_FEEDBACK_PATTERNS = 5
+# Sidecar in each archive directory listing sources that were summarized but could not be deleted.
+COMPACTED_INDEX_NAME = ".compacted.json"
 
 
 def parse_args() -> argparse.Namespace:
@@ -47,7 +61,7 @@ def parse_args() -> argparse.Namespace:
 
 
 def emit(payload: Dict[str, object]) -> None:
-    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    print_json(payload)
 
 
 def safe_read_text(path: Path) -> str:
@@ -57,23 +71,53 @@ def safe_read_text(path: Path) -> str:
         return ""
 
 
+def scan_markdown_files(directory: Path) -> List[Tuple[Path, os.stat_result]]:
+    """List ``*.md`` files in ``directory`` with the stat result from a single scandir pass."""
+    found: List[Tuple[Path, os.stat_result]] = []
+    try:
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                if not entry.name.endswith(".md"):
+                    continue
+                try:
+                    if entry.is_file():
+                        found.append((Path(entry.path), entry.stat()))
+                except OSError:
+                    continue
+    except OSError:
+        return []
+    return found
+
+
 def parse_iso_date(value: str) -> Optional[date]:
-    value = value.strip()
-    if not value:
+    # Build YYYY-MM-DD directly and skip text that cannot start an ISO date, so the common
+    # "not a date" case returns without raising; other shapes (e.g. compact YYYYMMDD) keep
+    # the date.fromisoformat semantics of the running Python.
+    value = value.strip()[:10]
+    if not value[:1].isdigit() or not value.isascii():
         return None
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        year, month, day = value[:4], value[5:7], value[8:10]
+        if year.isdigit() and month.isdigit() and day.isdigit():
+            try:
+                return date(int(year), int(month), int(day))
+            except ValueError:
+                return None
     try:
-        return date.fromisoformat(value[:10])
+        return date.fromisoformat(value)
     except ValueError:
         return None
 
 
 def parse_date_from_text(text: str) -> Optional[date]:
+    # Each line offers its leading date, then only its first date token; a line whose
+    # first token is not a real date is skipped rather than searched further.
     for line in text.splitlines():
         candidate = line.strip()
         parsed = parse_iso_date(candidate)
         if parsed:
             return parsed
-        token = re.search(r"\b(\d{4}-\d{2}-\d{2})\b", candidate)
+        token = ISO_DATE_TOKEN_RE.search(candidate)
         if token:
             parsed = parse_iso_date(token.group(1))
             if parsed:
@@ -81,23 +125,25 @@ def parse_date_from_text(text: str) -> Optional[date]:
     return None
 
 
-def parse_session_date(content: str, fallback_file: Path) -> date:
-    match = SESSION_HEADER_RE.search(content)
-    if match:
-        parsed = parse_iso_date(match.group(1))
+def parse_session_date(header_date: Optional[str], fallback_file: Path, mtime: float) -> date:
+    if header_date:
+        parsed = parse_iso_date(header_date)
         if parsed:
             return parsed
     fallback = parse_iso_date(fallback_file.stem)
     if fallback:
         return fallback
     try:
-        return datetime.fromtimestamp(fallback_file.stat().st_mtime, tz=timezone.utc).date()
+        return datetime.fromtimestamp(mtime, tz=timezone.utc).date()
     except OSError:
         return date.today()
 
 
 def section_lines(content: str, heading: str) -> List[str]:
-    lines = content.splitlines()
+    return section_lines_from(content.splitlines(), heading)
+
+
+def section_lines_from(lines: List[str], heading: str) -> List[str]:
     start_idx = -1
     for idx, raw in enumerate(lines):
         if raw.strip() == heading:
@@ -114,8 +160,8 @@ def section_lines(content: str, heading: str) -> List[str]:
     return out
 
 
-def extract_key_changes(content: str) -> List[str]:
-    change_lines = section_lines(content, "## Changes Made")
+def extract_key_changes(lines: List[str]) -> List[str]:
+    change_lines = section_lines_from(lines, "## Changes Made")
     key_changes: List[str] = []
     for raw in change_lines:
         line = raw.strip()
@@ -130,18 +176,17 @@ def extract_key_changes(content: str) -> List[str]:
     return key_changes
 
 
-def parse_session_file(path: Path) -> Dict[str, object]:
+def parse_session_file(path: Path, stat: os.stat_result) -> Dict[str, object]:
     content = safe_read_text(path)
-    session_date = parse_session_date(content, path)
-    commits = 0
-    files_changed = 0
-    commits_match = COMMITS_RE.search(content)
-    files_changed_match = FILES_CHANGED_RE.search(content)
-    if commits_match:
-        commits = int(commits_match.group(1))
-    if files_changed_match:
-        files_changed = int(files_changed_match.group(1))
-    key_changes = extract_key_changes(content)
+    fields: Dict[str, str] = {}
+    for match in SESSION_FIELDS_RE.finditer(content):
+        for name, value in match.groupdict().items():
+            if value is not None and name not in fields:
+                fields[name] = value
+    session_date = parse_session_date(fields.get("date"), path, stat.st_mtime)
+    commits = int(fields.get("commits", 0))
+    files_changed = int(fields.get("files", 0))
+    key_changes = extract_key_changes(content.splitlines())
     return {
         "source": path.name,
         "date": session_date.isoformat(),
@@ -152,32 +197,29 @@ def parse_session_file(path: Path) -> Dict[str, object]:
     }
 
 
-def render_session_archive(year: int, entries: List[Dict[str, object]], include_header: bool) -> str:
-    lines: List[str] = []
-    if include_header:
-        lines.append(f"# Session Archive: {year}")
-        lines.append("")
-        lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        lines.append("")
+def render_session_entry(entry: Dict[str, object]) -> str:
+    changes = entry.get("key_changes", [])
+    if isinstance(changes, list) and changes:
+        change_lines = "\n".join(f"  - {change}" for change in changes[:MAX_SESSION_KEY_CHANGES])
     else:
-        lines.append(f"## Compaction Batch: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        lines.append("")
+        change_lines = "  - (none captured)"
+    return (
+        f"## Session: {entry['date']}\n"
+        f"- Source: {entry['source']}\n"
+        f"- Commits: {entry['commits']}\n"
+        f"- Files changed: {entry['files_changed']}\n"
+        f"- Key changes:\n{change_lines}"
+    )
+
 
+def render_session_archive(year: int, entries: List[Dict[str, object]], include_header: bool, generated_at: str) -> str:
+    if include_header:
+        header = f"# Session Archive: {year}\n\nGenerated: {generated_at}\n\n"
+    else:
+        header = f"## Compaction Batch: {generated_at}\n\n"
     sorted_entries = sorted(entries, key=lambda item: str(item["date"]))
-    for entry in sorted_entries:
-        lines.append(f"## Session: {entry['date']}")
-        lines.append(f"- Source: {entry['source']}")
-        lines.append(f"- Commits: {entry['commits']}")
-        lines.append(f"- Files changed: {entry['files_changed']}")
-        lines.append("- Key changes:")
-        changes = entry.get("key_changes", [])
-        if isinstance(changes, list) and changes:
-            for change in changes[:MAX_SESSION_KEY_CHANGES]:
-                lines.append(f"  - {change}")
-        else:
-            lines.append("  - (none captured)")
-        lines.append("")
-    return "\n".join(lines).rstrip() + "\n"
+    blocks = "\n\n".join(render_session_entry(entry) for entry in sorted_entries)
+    return (header + blocks).rstrip() + "\n"
 
 
 def append_markdown(path: Path, content: str, dry_run: bool) -> None:
@@ -185,73 +227,119 @@ def append_markdown(path: Path, content: str, dry_run: bool) -> None:
         return
     path.parent.mkdir(parents=True, exist_ok=True)
     if path.exists():
-        existing = safe_read_text(path)
-        sep = "\n" if existing.endswith("\n") else "\n\n"
-        with path.open("a", encoding="utf-8", newline="\n") as handle:
-            handle.write(sep)
-            handle.write(content)
+        # Only the last byte decides the separator, so archives are never read back in full.
+        with path.open("rb+") as handle:
+            size = handle.seek(0, os.SEEK_END)
+            last = b""
+            if size:
+                handle.seek(size - 1)
+                last = handle.read(1)
+            sep = b"\n" if last == b"\n" else b"\n\n"
+            handle.write(sep + content.encode("utf-8"))
     else:
         with path.open("w", encoding="utf-8", newline="\n") as handle:
             handle.write(content)
 
 
+def compaction_key(stat: os.stat_result) -> List[int]:
+    return [int(stat.st_size), int(stat.st_mtime)]
+
+
+def load_compacted_index(archive_root: Path) -> Dict[str, List[int]]:
+    try:
+        data = json.loads((archive_root / COMPACTED_INDEX_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def pending_sources(
+    archive_root: Path, files: List[Tuple[Path, os.stat_result]]
+) -> List[Tuple[Path, os.stat_result]]:
+    """Drop files an earlier run already folded into the archive (same name, size and mtime)."""
+    seen = load_compacted_index(archive_root)
+    if not seen:
+        return files
+    return [(path, stat) for path, stat in files if seen.get(path.name) != compaction_key(stat)]
+
+
+def remove_archived_sources(archive_root: Path, files: List[Tuple[Path, os.stat_result]]) -> None:
+    """Delete archived sources and record any that survive so the next run does not summarize them twice."""
+    leftovers: Dict[str, List[int]] = {}
+    for path, stat in files:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            continue
+        except OSError:
+            leftovers[path.name] = compaction_key(stat)
+
+    index_path = archive_root / COMPACTED_INDEX_NAME
+    try:
+        if not leftovers:
+            index_path.unlink(missing_ok=True)
+            return
+        archive_root.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(leftovers, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(index_path)
+    except OSError:
+        return
+
+
 def compact_sessions(
     project_root: Path,
     dry_run: bool,
     max_age_days: int,
     keep_latest: int,
+    generated_at: str,
 ) -> Tuple[int, int]:
     sessions_dir = project_root / ".codex" / "sessions"
     if not sessions_dir.exists() or not sessions_dir.is_dir():
         return 0, 0
 
-    candidates = [path for path in sessions_dir.glob("*.md") if path.is_file()]
+    candidates = scan_markdown_files(sessions_dir)
     if not candidates:
         return 0, 0
 
-    candidates.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    candidates.sort(key=lambda item: item[1].st_mtime, reverse=True)
     keep_count = max(0, keep_latest)
-    keep_set = {path.resolve() for path in candidates[:keep_count]}
+    # Paths come from a single scandir of one directory, so they are already unique without resolve().
+    keep_set = {path for path, _stat in candidates[:keep_count]}
     cutoff = datetime.now(timezone.utc) - timedelta(days=max(0, max_age_days))
 
-    to_archive: List[Path] = []
-    for path in candidates:
-        if path.resolve() in keep_set:
+    to_archive: List[Tuple[Path, os.stat_result]] = []
+    for path, stat in candidates:
+        if path in keep_set:
             continue
-        file_time = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+        file_time = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
         if file_time <= cutoff:
-            to_archive.append(path)
+            to_archive.append((path, stat))
 
     if not to_archive:
         return 0, 0
 
+    archive_root = sessions_dir / "archive"
     grouped: Dict[int, List[Dict[str, object]]] = defaultdict(list)
-    bytes_freed = 0
-    for path in to_archive:
-        entry = parse_session_file(path)
+    for path, stat in pending_sources(archive_root, to_archive):
+        entry = parse_session_file(path, stat)
         grouped[int(entry["year"])].append(entry)
-        try:
-            bytes_freed += int(path.stat().st_size)
-        except OSError:
-            pass
+    bytes_freed = sum(int(stat.st_size) for _path, stat in to_archive)
 
-    archive_root = sessions_dir / "archive"
     for year, entries in grouped.items():
         archive_path = archive_root / f"{year}-summary.md"
-        content = render_session_archive(year, entries, include_header=not archive_path.exists())
+        content = render_session_archive(
+            year, entries, include_header=not archive_path.exists(), generated_at=generated_at
+        )
         append_markdown(archive_path, content, dry_run=dry_run)
 
     if not dry_run:
-        for path in to_archive:
-            try:
-                path.unlink()
-            except OSError:
-                continue
+        remove_archived_sources(archive_root, to_archive)
 
     return len(to_archive), bytes_freed
 
 
-def parse_feedback_entry(path: Path) -> Dict[str, str]:
+def parse_feedback_entry(path: Path, stat: os.stat_result) -> Dict[str, str]:
     content = safe_read_text(path)
     date_match = DATE_FIELD_RE.search(content)
     category_match = CATEGORY_FIELD_RE.search(content)
@@ -259,7 +347,7 @@ def parse_feedback_entry(path: Path) -> Dict[str, str]:
     if not parsed_date:
         parsed_date = parse_iso_date(path.name[:10])
     if not parsed_date:
-        parsed_date = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc).date()
+        parsed_date = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).date()
 
     category = (category_match.group(1).strip().lower() if category_match else "other") or "other"
     lesson_lines = section_lines(content, "## Lesson Learned")
@@ -275,26 +363,25 @@ def parse_feedback_entry(path: Path) -> Dict[str, str]:
     }
 
 
-def render_feedback_archive(month: str, entries: List[Dict[str, str]], include_header: bool) -> str:
+def render_feedback_archive(
+    month: str,
+    entry_count: int,
+    category_counts: Counter[str],
+    pattern_counts: Counter[str],
+    include_header: bool,
+    generated_at: str,
+) -> str:
     lines: List[str] = []
     if include_header:
         lines.append(f"# Feedback Archive: {month}")
         lines.append("")
-        lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+        lines.append(f"Generated: {generated_at}")
         lines.append("")
     else:
-        lines.append(f"## Compaction Batch: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+        lines.append(f"## Compaction Batch: {generated_at}")
         lines.append("")
 
-    category_counts: Counter[str] = Counter()
-    pattern_counts: Counter[str] = Counter()
-    for entry in entries:
-        category_counts[entry["category"]] += 1
-        lesson = entry["lesson"].strip()
-        if lesson:
-            pattern_counts[lesson] += 1
-
-    lines.append(f"- Total entries: {len(entries)}")
+    lines.append(f"- Total entries: {entry_count}")
     lines.append("")
     lines.append("## Category Counts")
     for category, count in sorted(category_counts.items(), key=lambda item: (-item[1], item[0])):
@@ -313,37 +400,44 @@ def render_feedback_archive(month: str, entries: List[Dict[str, str]], include_h
     return "\n".join(lines).rstrip() + "\n"
 
 
-def compact_feedback(project_root: Path, dry_run: bool) -> Tuple[int, int]:
+def compact_feedback(project_root: Path, dry_run: bool, generated_at: str) -> Tuple[int, int]:
     feedback_dir = project_root / ".codex" / "feedback"
     if not feedback_dir.exists() or not feedback_dir.is_dir():
         return 0, 0
 
-    files = [path for path in feedback_dir.glob("*.md") if path.is_file()]
+    files = scan_markdown_files(feedback_dir)
     if len(files) <= FEEDBACK_ARCHIVE_THRESHOLD:
         return 0, 0
 
-    grouped: Dict[str, List[Dict[str, str]]] = defaultdict(list)
-    bytes_freed = 0
-    for path in files:
-        grouped_key = parse_feedback_entry(path)
-        grouped[grouped_key["month"]].append(grouped_key)
-        try:
-            bytes_freed += int(path.stat().st_size)
-        except OSError:
-            pass
-
     archive_root = feedback_dir / "archive"
-    for month, entries in grouped.items():
+    # Per-month tallies are accumulated while parsing, so the renderer never walks the entries again.
+    entry_counts: Counter[str] = Counter()
+    category_counts: Dict[str, Counter[str]] = defaultdict(Counter)
+    pattern_counts: Dict[str, Counter[str]] = defaultdict(Counter)
+    for path, stat in pending_sources(archive_root, files):
+        entry = parse_feedback_entry(path, stat)
+        month = entry["month"]
+        entry_counts[month] += 1
+        category_counts[month][entry["category"]] += 1
+        lesson = entry["lesson"].strip()
+        if lesson:
+            pattern_counts[month][lesson] += 1
+    bytes_freed = sum(int(stat.st_size) for _path, stat in files)
+
+    for month, entry_count in entry_counts.items():
         archive_path = archive_root / f"{month}-summary.md"
-        content = render_feedback_archive(month, entries, include_header=not archive_path.exists())
+        content = render_feedback_archive(
+            month,
+            entry_count,
+            category_counts[month],
+            pattern_counts[month],
+            include_header=not archive_path.exists(),
+            generated_at=generated_at,
+        )
         append_markdown(archive_path, content, dry_run=dry_run)
 
     if not dry_run:
-        for path in files:
-            try:
-                path.unlink()
-            except OSError:
-                continue
+        remove_archived_sources(archive_root, files)
 
     return len(files), bytes_freed
 
@@ -352,7 +446,7 @@ def count_decisions(project_root: Path) -> int:
     decisions_dir = project_root / ".codex" / "decisions"
     if not decisions_dir.exists() or not decisions_dir.is_dir():
         return 0
-    return len([path for path in decisions_dir.glob("*.md") if path.is_file()])
+    return len(scan_markdown_files(decisions_dir))
 
 
 def main() -> int:
@@ -362,14 +456,19 @@ def main() -> int:
         emit({"status": "error", "message": f"Project root does not exist or is not a directory: {project_root}"})
         return 1
 
+    # One timestamp for every archive batch written in this run.
+    generated_at = datetime.now().strftime("%Y-%m-%d %H:%M")
     try:
         sessions_archived, session_bytes = compact_sessions(
             project_root=project_root,
             dry_run=args.dry_run,
             max_age_days=max(0, int(args.max_age_days)),
             keep_latest=max(0, int(args.keep_latest)),
+            generated_at=generated_at,
+        )
+        feedback_archived, feedback_bytes = compact_feedback(
+            project_root=project_root, dry_run=args.dry_run, generated_at=generated_at
         )
-        feedback_archived, feedback_bytes = compact_feedback(project_root=project_root, dry_run=args.dry_run)
         decisions_kept = count_decisions(project_root)
     except PermissionError as exc:
         emit({"status": "error", "message": f"Permission denied: {exc}"})
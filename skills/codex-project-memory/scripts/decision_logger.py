@@ -8,18 +8,28 @@ Writes decision records to:
 
 from __future__ import annotations
 
-import argparse
-import json
-import re
 import sys
 from datetime import date
 from pathlib import Path
-from typing import Dict
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+# Every option is a required "--key value" pair; main() reads them as attributes of the parsed namespace.
+ARG_NAMES = ("project-root", "title", "decision", "alternatives", "reasoning", "context")
+# Maps every ASCII character outside [a-z0-9] to "-" for titles that need no regex.
+SLUG_TABLE = str.maketrans(
+    {chr(code): "-" for code in range(0x80) if chr(code) not in "abcdefghijklmnopqrstuvwxyz0123456789"}
+)
 
 
 def sanitize_slug(raw: str) -> str:
     lowered = raw.strip().lower()
-    slug = re.sub(r"[^a-z0-9]+", "-", lowered).strip("-")
+    if lowered.isascii():
+        slug = "-".join(part for part in lowered.translate(SLUG_TABLE).split("-") if part)
+    else:
+        import re
+
+        slug = re.sub(r"[^a-z0-9]+", "-", lowered).strip("-")
     return slug or "decision"
 
 
@@ -37,10 +47,14 @@ def build_target_path(base_dir: Path, date_text: str, slug: str) -> Path:
 
 
 def emit(payload: Dict[str, str]) -> None:
+    import json
+
     print(json.dumps(payload, ensure_ascii=False))
 
 
-def parse_args() -> argparse.Namespace:
+def build_parser() -> Any:
+    import argparse
+
     parser = argparse.ArgumentParser(
 
         description="Log a project decision to .codex/decisions.",
@@ -66,7 +80,28 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--alternatives", required=True, help="Alternatives considered")
     parser.add_argument("--reasoning", required=True, help="Reasoning for chosen decision")
     parser.add_argument("--context", required=True, help="Decision context")
-    return parser.parse_args()
+    return parser
+
+
+def parse_fast_args(argv: List[str]) -> Optional[SimpleNamespace]:
+    """Parse the plain "--key value" form without importing argparse.
+
+    Returns None for anything else (help, "--key=value", unknown or missing options) so argparse can handle it.
+    """
+    if len(argv) != 2 * len(ARG_NAMES):
+        return None
+    values: Dict[str, str] = {}
+    for index in range(0, len(argv), 2):
+        flag, value = argv[index], argv[index + 1]
+        name = flag[2:]
+        if not flag.startswith("--") or name not in ARG_NAMES or name in values or value.startswith("-"):
+            return None
+        values[name] = value
+    return SimpleNamespace(**{name.replace("-", "_"): value for name, value in values.items()})
+
+
+def parse_args() -> Any:
+    return parse_fast_args(sys.argv[1:]) or build_parser().parse_args()
 
 
 def main() -> int:
@@ -10,9 +10,16 @@ import json
 import re
 import subprocess
 import sys
+import tempfile
+import threading
 from datetime import date
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import re2
+except ModuleNotFoundError:  # pragma: no cover - optional accelerator
+    re2 = None  # type: ignore[assignment]
 
 
 CATEGORY_ORDER = [
@@ -23,8 +30,56 @@ CATEGORY_ORDER = [
     ("documentation", "Documentation"),
 ]
 
-SKIP_PREFIXES = ("chore", "merge", "bump")
-TEST_PREFIXES = ("test",)
+GIT_TIMEOUT_SECONDS = 60
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Classifier branches in priority order: (group, keywords, anywhere). "anywhere" branches match the keyword
+# at any position in the lowercased subject; the others only match it as a prefix.
+CLASSIFIER_BRANCHES: List[Tuple[str, str, bool]] = [
+    ("breaking", "breaking", True),
+    ("skip", "chore|merge|bump", False),
+    ("tests", "test", False),
+    ("features", "feat|add|new", True),
+    ("bug_fixes", "fix|bug|patch|resolve", True),
+    ("improvements", "improve|update|enhance|refactor", True),
+    ("documentation", "doc|readme|comment", True),
+]
+# One match per subject; lookaheads keep the match at position 0 so the first branch that hits wins.
+CLASSIFIER_RE = re.compile(
+    "|".join(
+        f"(?=.*?(?P<{name}>{keywords}))" if anywhere else f"(?P<{name}>{keywords})"
+        for name, keywords, anywhere in CLASSIFIER_BRANCHES
+    ),
+    re.DOTALL,
+)
+CLASSIFIER_LABELS: Dict[str, Optional[str]] = {
+    "breaking": "breaking_changes",
+    "skip": None,
+    "tests": "tests",
+    "features": "features",
+    "bug_fixes": "bug_fixes",
+    "improvements": "improvements",
+    "documentation": "documentation",
+}
+CONVENTIONAL_PREFIX_RE = re.compile(r"^\s*(?:[A-Za-z]+(?:\([^)]*\))?!?:)\s*")
+
+
+def build_classifier_set() -> Any:
+    """Compile the classifier branches into one re2 DFA set, or return None when re2 is unavailable.
+
+    re2 has no lookaheads, so each branch is added on its own and the lowest matching index wins.
+    """
+    # Other packages also install as ``re2`` (pyre2 mirrors the ``re`` API and has no Set); treat them as absent.
+    if re2 is None or not hasattr(re2, "Set"):
+        return None
+    classifier_set = re2.Set.SearchSet()
+    for _, keywords, anywhere in CLASSIFIER_BRANCHES:
+        classifier_set.Add(f"(?:{keywords})" if anywhere else f"^(?:{keywords})")
+    classifier_set.Compile()
+    return classifier_set
+
+
+CLASSIFIER_SET = build_classifier_set()
 
 
 def parse_args() -> argparse.Namespace:
@@ -60,16 +115,64 @@ def run_git(project_root: Path, args: List[str]) -> Optional[subprocess.Complete
             encoding="utf-8",
             errors="replace",
             check=False,
-            timeout=60,
+            timeout=GIT_TIMEOUT_SECONDS,
         )
-    except subprocess.TimeoutExpired:
+    except (FileNotFoundError, subprocess.TimeoutExpired):
         return None
 
 
+def stream_git(project_root: Path, args: List[str], handle_record: Callable[[str], None]) -> Optional[Tuple[int, str]]:
+    """Run git and pass each NUL-terminated stdout record to ``handle_record`` as it arrives.
+
+    Returns ``(returncode, stderr)``, or None when git is killed after GIT_TIMEOUT_SECONDS.
+    """
+    # stderr goes to a file rather than a pipe: nothing reads it while stdout streams, so a full stderr pipe
+    # would block git, and this loop with it, until the watchdog fired.
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(
+            ["git", *args],
+            cwd=project_root,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        timed_out = threading.Event()
+
+        def kill() -> None:
+            timed_out.set()
+            proc.kill()
+
+        watchdog = threading.Timer(GIT_TIMEOUT_SECONDS, kill)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            assert proc.stdout is not None
+            pending = ""
+            for chunk in iter(lambda: proc.stdout.read(STREAM_CHUNK_SIZE), ""):
+                records = (pending + chunk).split("\x00")
+                pending = records.pop()
+                for record in records:
+                    handle_record(record)
+            if pending:
+                handle_record(pending)
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+            if proc.stdout is not None:
+                proc.stdout.close()
+        if timed_out.is_set():
+            return None
+        stderr = ""
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace")
+    return returncode, stderr
+
+
 def git_ready(project_root: Path) -> bool:
-    version = run_git(project_root, ["--version"])
-    if version is None or version.returncode != 0:
-        return False
+    # A missing git binary surfaces as None from run_git, so no separate --version probe is needed.
     inside = run_git(project_root, ["rev-parse", "--is-inside-work-tree"])
     if inside is None:
         return False
@@ -90,30 +193,20 @@ def build_log_args(project_root: Path, since_arg: str) -> Tuple[List[str], str]:
     since_text = since_arg.strip()
     if since_text:
         if ".." in since_text:
-            return ["log", "--oneline", "--no-merges", since_text], since_text
-        return ["log", "--oneline", "--no-merges", f"--since={since_text}"], since_text
+            return ["log", "--no-merges", "-z", "--format=%s", since_text], since_text
+        return ["log", "--no-merges", "-z", "--format=%s", f"--since={since_text}"], since_text
 
     tag = latest_tag(project_root)
     if tag:
         range_spec = f"{tag}..HEAD"
-        return ["log", "--oneline", "--no-merges", range_spec], range_spec
+        return ["log", "--no-merges", "-z", "--format=%s", range_spec], range_spec
 
     fallback = "30 days ago"
-    return ["log", "--oneline", "--no-merges", f"--since={fallback}"], fallback
-
-
-def parse_commit_line(line: str) -> Optional[Tuple[str, str]]:
-    raw = line.strip()
-    if not raw:
-        return None
-    parts = raw.split(" ", 1)
-    if len(parts) != 2:
-        return None
-    return parts[0], parts[1].strip()
+    return ["log", "--no-merges", "-z", "--format=%s", f"--since={fallback}"], fallback
 
 
 def normalize_subject(subject: str) -> str:
-    cleaned = re.sub(r"^\s*(?:[A-Za-z]+(?:\([^)]*\))?!?:)\s*", "", subject.strip())
+    cleaned = CONVENTIONAL_PREFIX_RE.sub("", subject.strip())
     cleaned = cleaned.strip()
     if not cleaned:
         return subject.strip()
@@ -124,24 +217,15 @@ def classify_subject(subject: str) -> Optional[str]:
     lowered = subject.lower().strip()
     if not lowered:
         return None
-
-    if "breaking" in subject or "breaking" in lowered:
-        return "breaking_changes"
-
-    if any(lowered.startswith(prefix) for prefix in SKIP_PREFIXES):
-        return None
-    if any(lowered.startswith(prefix) for prefix in TEST_PREFIXES):
-        return "tests"
-
-    if any(word in lowered for word in ["feat", "add", "new"]):
-        return "features"
-    if any(word in lowered for word in ["fix", "bug", "patch", "resolve"]):
-        return "bug_fixes"
-    if any(word in lowered for word in ["improve", "update", "enhance", "refactor"]):
+    if CLASSIFIER_SET is not None:
+        hits = CLASSIFIER_SET.Match(lowered)
+        if not hits:
+            return "improvements"
+        return CLASSIFIER_LABELS[CLASSIFIER_BRANCHES[min(hits)][0]]
+    match = CLASSIFIER_RE.match(lowered)
+    if match is None:
         return "improvements"
-    if any(word in lowered for word in ["doc", "readme", "comment"]):
-        return "documentation"
-    return "improvements"
+    return CLASSIFIER_LABELS[match.lastgroup or ""]
 
 
 def build_markdown(version: str, categories: Dict[str, List[str]]) -> str:
@@ -188,32 +272,30 @@ def main() -> int:
         return 1
 
     log_args, effective_since = build_log_args(project_root, args.since)
-    log_proc = run_git(project_root, log_args)
-    if log_proc is None:
-        emit({"status": "error", "message": "git log timed out after 60s", "since": effective_since})
+    categories: Dict[str, List[str]] = {key: [] for key, _ in CATEGORY_ORDER}
+
+    # Commits are classified while git is still producing the log instead of after buffering all of it.
+    def record(raw_subject: str) -> None:
+        subject = raw_subject.strip()
+        if not subject:
+            return
+        # Skipped and test-only commits have no bucket in CATEGORY_ORDER.
+        bucket = categories.get(classify_subject(subject) or "")
+        if bucket is None:
+            return
+        bucket.append(normalize_subject(subject))
+
+    log_result = stream_git(project_root, log_args, record)
+    if log_result is None:
+        emit({"status": "error", "message": f"git log timed out after {GIT_TIMEOUT_SECONDS}s", "since": effective_since})
         return 1
-    if log_proc.returncode != 0:
-        detail = (log_proc.stderr or log_proc.stdout).strip() or "git log failed"
+    returncode, stderr = log_result
+    if returncode != 0:
+        detail = stderr.strip() or "git log failed"
         emit({"status": "error", "message": detail, "since": effective_since})
         return 1
-
-    categories: Dict[str, List[str]] = {key: [] for key, _ in CATEGORY_ORDER}
-    counts: Dict[str, int] = {key: 0 for key, _ in CATEGORY_ORDER}
-    total_commits = 0
-
-    for raw_line in log_proc.stdout.splitlines():
-        parsed = parse_commit_line(raw_line)
-        if not parsed:
-            continue
-        _, subject = parsed
-        label = classify_subject(subject)
-        if label is None:
-            continue
-        if label == "tests":
-            continue
-        categories.setdefault(label, []).append(normalize_subject(subject))
-        counts[label] = counts.get(label, 0) + 1
-        total_commits += 1
+    counts: Dict[str, int] = {key: len(items) for key, items in categories.items()}
+    total_commits = sum(counts.values())
 
     markdown = build_markdown(args.version, categories)
 
@@ -46,7 +46,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--force",
         action="store_true",
-        help="Retained for backward compatibility; genome now regenerates on each run.",
+        help="Rescan every file instead of reusing the cached report from an unchanged tree.",
     )
     return parser.parse_args()
 
@@ -63,6 +63,7 @@ def build_payload(report: Dict[str, Any], genome_path: Path, output_format: str)
         "total_lines": report["total_lines"],
         "genome_path": genome_path.as_posix(),
         "module_maps_count": report["module_maps_count"],
+        "cached": report["cached"],
     }
     if output_format == "json":
         payload["sections"] = report["sections"]
@@ -77,7 +78,7 @@ def main() -> int:
         return 1
 
     try:
-        report = build_genome_report(project_root, args.depth, args.sections)
+        report = build_genome_report(project_root, args.depth, args.sections, use_cache=True, force=args.force)
         genome_path = write_genome_file(project_root, report["markdown"])
     except OSError as exc:
         emit_json({"status": "error", "message": f"Failed to write genome.md: {exc}"})
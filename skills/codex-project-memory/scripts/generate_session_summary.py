@@ -10,6 +10,7 @@ import json
 import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, time
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
@@ -307,21 +308,31 @@ def generate_summary(project_root: Path, since_raw: str, output_dir: Path) -> Di
     since_dt, since_label = resolve_since_datetime(since_raw, output_dir)
     since_git = since_dt.isoformat(sep=" ")
 
-    commit_log = run_git(project_root, ["log", f"--since={since_git}", "--pretty=format:%H|%cI|%s"])
+    # The three log passes are independent, so run them side by side and check them in order.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        commit_future = executor.submit(run_git, project_root, ["log", f"--since={since_git}", "--pretty=format:%H|%cI|%s"])
+        numstat_future = executor.submit(
+            run_git, project_root, ["log", f"--since={since_git}", "--pretty=tformat:", "--numstat"]
+        )
+        status_future = executor.submit(
+            run_git, project_root, ["log", f"--since={since_git}", "--pretty=tformat:", "--name-status"]
+        )
+        commit_log = commit_future.result()
+        numstat_result = numstat_future.result()
+        status_result = status_future.result()
+
     if commit_log is None:
         raise RuntimeError("git log timed out after 60s")
     if commit_log.returncode != 0:
         raise RuntimeError((commit_log.stderr or commit_log.stdout).strip() or "git log failed")
     commits = parse_commit_rows(commit_log.stdout)
 
-    numstat_result = run_git(project_root, ["log", f"--since={since_git}", "--pretty=tformat:", "--numstat"])
     if numstat_result is None:
         raise RuntimeError("git log --numstat timed out after 60s")
     if numstat_result.returncode != 0:
         raise RuntimeError((numstat_result.stderr or numstat_result.stdout).strip() or "git log --numstat failed")
     per_file_stats, total_added, total_deleted = aggregate_numstat(numstat_result.stdout)
 
-    status_result = run_git(project_root, ["log", f"--since={since_git}", "--pretty=tformat:", "--name-status"])
     if status_result is None:
         raise RuntimeError("git log --name-status timed out after 60s")
     if status_result.returncode != 0:
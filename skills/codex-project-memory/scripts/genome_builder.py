@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
+import io
 import json
 import os
 import re
-from collections import Counter, defaultdict
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Sequence
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
 
 try:
     import tomllib
@@ -16,7 +23,7 @@ except ModuleNotFoundError:  # pragma: no cover
 TOML_ERROR = tomllib.TOMLDecodeError if tomllib is not None else ValueError
 
 
-SKIP_DIRS = {
+SKIP_DIRS = frozenset({
     ".analytics",
     ".codex",
     ".git",
@@ -36,9 +43,9 @@ SKIP_DIRS = {
     "node_modules",
     "target",
     "venv",
-}
+})
 
-TEXT_EXTENSIONS = {
+TEXT_EXTENSIONS = frozenset({
     ".c",
     ".cpp",
     ".cs",
@@ -67,9 +74,9 @@ TEXT_EXTENSIONS = {
     ".vue",
     ".yaml",
     ".yml",
-}
+})
 
-PATTERN_SCAN_EXTENSIONS = {
+PATTERN_SCAN_EXTENSIONS = frozenset({
     ".c",
     ".cpp",
     ".cs",
@@ -92,7 +99,7 @@ PATTERN_SCAN_EXTENSIONS = {
     ".vue",
     ".yaml",
     ".yml",
-}
+})
 
 LANGUAGE_NAMES = {
     ".c": "C",
@@ -140,6 +147,18 @@ ENTRY_POINT_CANDIDATES = {
     "Program.cs",
 }
 
+# Lookup tables for the per-file candidate checks, built once instead of on every call.
+ENTRY_POINT_NAMES_LOWER = frozenset(name.lower() for name in ENTRY_POINT_CANDIDATES)
+API_PATH_KEYWORDS = frozenset(
+    {"api", "app", "backend", "controller", "controllers", "pages", "routes", "router", "server", "starters", "views"}
+)
+API_FILENAME_TOKENS = ("api", "route", "router", "server", "app", "view", "controller")
+DATA_PATH_KEYWORDS = frozenset(
+    {"db", "database", "entities", "entity", "migrations", "model", "models", "prisma", "schema", "schemas", "starters"}
+)
+DATA_FILENAME_TOKENS = ("model", "schema", "entity", "prisma", "migration", "db")
+EXAMPLE_PATH_PARTS = frozenset({"__tests__", "example", "examples", "fixture", "fixtures", "test", "tests"})
+
 MODULE_PURPOSES = {
     "api": "API layer and request handlers",
     "app": "application shell or service bootstrap",
@@ -165,7 +184,7 @@ MODULE_PURPOSES = {
     "utils": "utility functions and helpers",
 }
 
-SPECIAL_TEXT_FILES = {
+SPECIAL_TEXT_FILES = frozenset({
     ".env.example",
     ".env.sample",
     ".gitignore",
@@ -181,7 +200,7 @@ SPECIAL_TEXT_FILES = {
     "setup.py",
     "vite.config.ts",
     "vite.config.js",
-}
+})
 
 SECTION_ORDER = [
     "architecture",
@@ -201,6 +220,43 @@ SECTION_TITLES = {
     "file_map": "File Map",
 }
 
+# (label, section key) pairs rendered for every section except "api", which has its own layout.
+SECTION_RENDER_GROUPS: Dict[str, List[tuple[str, str]]] = {
+    "architecture": [
+        ("Entry points", "entry_points"),
+        ("Module boundaries", "module_boundaries"),
+        ("Key dependencies", "key_dependencies"),
+        ("Tech stack detected", "tech_stack"),
+        ("Scan summary", "scan_summary"),
+    ],
+    "data": [
+        ("Database type", "database_types"),
+        ("Models/schemas found", "models_and_schemas"),
+        ("Migration status", "migration_status"),
+        ("Config sources", "config_sources"),
+    ],
+    "security": [
+        (".env handling", "env_handling"),
+        ("Secrets exposure risk", "secret_exposure_risk"),
+        ("Auth middleware present", "auth_middleware_present"),
+        ("CORS configured", "cors_configured"),
+        ("Rate limiting", "rate_limiting"),
+        ("HTTPS enforcement", "https_enforcement"),
+    ],
+    "tests": [
+        ("Test directories found", "test_directories"),
+        ("Test frameworks detected", "test_frameworks"),
+        ("Files without corresponding test files", "files_without_tests"),
+        ("CI pipeline detected", "ci_pipeline"),
+    ],
+    "file_map": [
+        ("Directory tree (depth 2)", "directory_tree"),
+        ("Total files by language", "files_by_language"),
+        ("Largest files", "largest_files"),
+    ],
+}
+NOT_DETECTED = ("Not detected",)
+
 SECTION_ALIASES = {
     "all": "all",
     "api": "api",
@@ -224,6 +280,9 @@ ROUTE_PATTERNS = [
     re.compile(r"""@(app|router)\.(get|post|put|delete|patch)\s*\(\s*['"]([^'"]+)['"]""", re.IGNORECASE),
     re.compile(r"""(?<!\w)path\s*\(\s*['"]([^'"]+)['"]"""),
 ]
+# Django path() allows an empty route; the verb patterns need at least one character.
+PATH_ROUTE_VALUE_RE = re.compile(r"""[/\w:<>.*-]*""")
+VERB_ROUTE_VALUE_RE = re.compile(r"""[/\w:<>.*-]+""")
 
 MODEL_PATTERNS = [
     re.compile(r"""(mongoose\.model|Schema)\s*\(""", re.IGNORECASE),
@@ -232,6 +291,25 @@ MODEL_PATTERNS = [
     re.compile(r"""class\s+\w+\(.*Model\)""", re.IGNORECASE),
 ]
 
+IMPORT_ALIAS_PATTERNS = [
+    re.compile(r"""(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*require\(\s*['"]([^'"]+)['"]\s*\)"""),
+    re.compile(r"""import\s+([A-Za-z_$][\w$]*)\s+from\s+['"]([^'"]+)['"]"""),
+]
+NAMED_IMPORT_ALIAS_PATTERNS = [
+    re.compile(r"""(?:const|let|var)\s*\{([^}]+)\}\s*=\s*require\(\s*['"]([^'"]+)['"]\s*\)"""),
+    re.compile(r"""import\s*\{([^}]+)\}\s*from\s+['"]([^'"]+)['"]"""),
+]
+# Kept as two scans: a single alternation would let a stray "from '" swallow a require() that follows it.
+MODULE_REFERENCE_PATTERNS = [
+    re.compile(r"""require\(\s*['"]([^'"]+)['"]\s*\)"""),
+    re.compile(r"""from\s+['"]([^'"]+)['"]"""),
+]
+CAMEL_BOUNDARY_RE = re.compile(r"""([a-z0-9])([A-Z])""", re.ASCII)
+# The possessive run cannot give back anything useful: neither \s nor "(" is in the identifier class.
+CALL_TARGET_RE = re.compile(r"""([A-Za-z_$][\w$.]*+)\s*\(""")
+REQUIREMENT_NAME_END_RE = re.compile(r"[<>=~!]")
+PEP508_NAME_END_RE = re.compile(r"[<>=~! ]")
+
 MIDDLEWARE_PATTERNS = [
     re.compile(r"""app\.use\s*\(""", re.IGNORECASE),
     re.compile(r"""@app\.middleware""", re.IGNORECASE),
@@ -315,19 +393,41 @@ HTTPS_PATTERNS = [
     re.compile(r"""helmet\.hsts""", re.IGNORECASE),
 ]
 
-TEST_DIR_NAMES = {"__tests__", "spec", "test", "tests"}
+TEST_DIR_NAMES = frozenset({"__tests__", "spec", "test", "tests"})
+TESTABLE_SOURCE_EXTENSIONS = frozenset({".js", ".jsx", ".ts", ".tsx", ".py", ".go", ".java", ".rb", ".php"})
 CI_FILES = [
     ".gitlab-ci.yml",
     "azure-pipelines.yml",
     ".circleci/config.yml",
     ".github/workflows",
 ]
+CONFIG_SOURCE_NAMES = ("package.json", "requirements.txt", "pyproject.toml")
 MIGRATION_DIR_HINTS = {"alembic", "migrations", "prisma", "db"}
 MAX_SCAN_FILE_SIZE = 512_000
+DIRECTORY_TREE_DEPTH = 2
+GENOME_CACHE_NAME = ".genome-cache.json"
+# Below this many files, thread start-up costs more than the overlapped reads save.
+PARALLEL_MIN_FILES = 64
+CPU_COUNT = os.cpu_count() or 1
+READ_WORKERS = min(32, CPU_COUNT * 4)
+# Scanned files are capped at MAX_SCAN_FILE_SIZE, so one chunk normally covers the whole file.
+READ_CHUNK_SIZE = 1 << 20
+READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
 
 
 def emit_json(payload: Dict[str, Any]) -> None:
-    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    # Agents consume stdout through a pipe; only pretty-print for an interactive terminal.
+    if sys.stdout.isatty():
+        text = json.dumps(payload, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        print(text)
+        return
+    sys.stdout.flush()
+    buffer.write(text.encode("utf-8") + b"\n")
+    buffer.flush()
 
 
 def normalize_sections(value: str) -> List[str]:
@@ -349,47 +449,86 @@ def detect_scan_depth(depth_mode: str) -> int:
     return 3
 
 
-def safe_read_text(path: Path) -> str:
+def safe_read_text(path: Path, size: int | None = None) -> str:
+    """``path.read_text(encoding="utf-8", errors="ignore")`` over a raw descriptor, without the buffered/text IO layers.
+
+    With the ``size`` the walk already stat'ed, the first read asks for one byte more than that; a short read on a
+    regular file is EOF, so files that did not grow are read in a single syscall.
+    """
     try:
-        return path.read_text(encoding="utf-8", errors="ignore")
+        fd = os.open(path, READ_FLAGS)
     except OSError:
         return ""
-
-
-def count_lines(path: Path) -> int:
+    chunks: List[bytes] = []
+    request = READ_CHUNK_SIZE if size is None else size + 1
     try:
-        with path.open("r", encoding="utf-8", errors="ignore") as handle:
-            return sum(1 for _ in handle)
+        while True:
+            chunk = os.read(fd, request)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if len(chunk) < request and size is not None:
+                break
+            request = READ_CHUNK_SIZE
     except OSError:
+        return ""
+    finally:
+        os.close(fd)
+    text = b"".join(chunks).decode("utf-8", "ignore")
+    if "\r" in text:
+        # Universal-newline translation, as text-mode reads apply it.
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def read_texts(paths: Sequence[Path], sizes: Sequence[int]) -> List[str]:
+    """Read files in order, overlapping the reads on a thread pool once there are enough of them."""
+    if len(paths) < PARALLEL_MIN_FILES or CPU_COUNT < 2:
+        return [safe_read_text(path, size) for path, size in zip(paths, sizes)]
+    with ThreadPoolExecutor(max_workers=min(READ_WORKERS, len(paths))) as executor:
+        return list(executor.map(safe_read_text, paths, sizes))
+
+
+def count_text_lines(text: str) -> int:
+    # read_text already folded \r\n and \r into \n, so this matches iterating the file line by line.
+    if not text:
         return 0
+    return text.count("\n") + (0 if text.endswith("\n") else 1)
 
 
-def should_scan_text(path: Path) -> bool:
-    return path.suffix.lower() in TEXT_EXTENSIONS or path.name in SPECIAL_TEXT_FILES
+def file_suffix(name: str) -> str:
+    """Lowercased ``Path(name).suffix`` without building a Path."""
+    index = name.rfind(".")
+    if 0 < index < len(name) - 1:
+        return name[index:].lower()
+    return ""
+
+
+def should_scan_text(name: str, suffix: str) -> bool:
+    return suffix in TEXT_EXTENSIONS or name in SPECIAL_TEXT_FILES
 
 
 def supports_pattern_scan(item: Dict[str, Any]) -> bool:
-    name = str(item["name"])
-    suffix = str(item["suffix"])
+    name = item["name"]
+    suffix = item["suffix"]
     return suffix in PATTERN_SCAN_EXTENSIONS or name in SPECIAL_TEXT_FILES
 
 
 def is_api_candidate(rel_path: str) -> bool:
-    parts = [part.lower() for part in Path(rel_path).parts]
-    filename = Path(rel_path).name.lower()
-    keywords = {"api", "app", "backend", "controller", "controllers", "pages", "routes", "router", "server", "starters", "views"}
-    return filename in {name.lower() for name in ENTRY_POINT_CANDIDATES} or bool(keywords.intersection(parts)) or any(
-        token in filename for token in ("api", "route", "router", "server", "app", "view", "controller")
+    # rel_path is always "/"-separated, so splitting it gives the same parts as Path(rel_path).parts.
+    parts = rel_path.lower().split("/")
+    filename = parts[-1]
+    return (
+        filename in ENTRY_POINT_NAMES_LOWER
+        or not API_PATH_KEYWORDS.isdisjoint(parts)
+        or any(token in filename for token in API_FILENAME_TOKENS)
     )
 
 
 def is_data_candidate(rel_path: str) -> bool:
-    parts = [part.lower() for part in Path(rel_path).parts]
-    filename = Path(rel_path).name.lower()
-    keywords = {"db", "database", "entities", "entity", "migrations", "model", "models", "prisma", "schema", "schemas", "starters"}
-    return bool(keywords.intersection(parts)) or any(
-        token in filename for token in ("model", "schema", "entity", "prisma", "migration", "db")
-    )
+    parts = rel_path.lower().split("/")
+    filename = parts[-1]
+    return not DATA_PATH_KEYWORDS.isdisjoint(parts) or any(token in filename for token in DATA_FILENAME_TOKENS)
 
 
 def is_auth_candidate(rel_path: str, text: str, routes: Sequence[str]) -> bool:
@@ -401,37 +540,130 @@ def is_auth_candidate(rel_path: str, text: str, routes: Sequence[str]) -> bool:
     return any("/refresh" in route.lower() or "refresh" in route.lower() for route in routes)
 
 
-def walk_inventory(project_root: Path, max_depth: int) -> List[Dict[str, Any]]:
+def scan_directory(path: str) -> Tuple[List[os.DirEntry[str]], List[os.DirEntry[str]]]:
+    """Split one directory into sorted (files, subdirectories) the way os.walk would, skipping SKIP_DIRS."""
+    files: List[os.DirEntry[str]] = []
+    subdirs: List[os.DirEntry[str]] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry)
+                elif entry.name not in SKIP_DIRS:
+                    subdirs.append(entry)
+    except OSError:
+        return [], []
+    files.sort(key=lambda entry: entry.name)
+    subdirs.sort(key=lambda entry: entry.name)
+    return files, subdirs
+
+
+def walk_project_once(project_root: Path, max_depth: int) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Collect the file inventory and the directory-tree entries in a single walk.
+
+    An explicit scandir stack replaces os.walk so each file's stat comes from its DirEntry cache. Directories are
+    visited in the same sorted pre-order as before, and symlinked directories are listed but not entered. File
+    contents are not read here; see read_inventory_texts.
+
+    Every item carries the same keys with fixed types (str paths/names, int sizes and counts, str text), so the
+    section builders use them directly instead of re-coercing per file.
+    """
     inventory: List[Dict[str, Any]] = []
-    for root_str, dirs, files in os.walk(project_root):
-        root = Path(root_str)
-        rel_root = root.relative_to(project_root)
-        depth = len(rel_root.parts)
-        dirs[:] = sorted(item for item in dirs if item not in SKIP_DIRS)
-        if depth >= max_depth:
-            dirs[:] = []
-
-        for filename in sorted(files):
-            file_path = root / filename
+    directories: List[str] = []
+    stack: List[Tuple[str, str, int]] = [(os.fspath(project_root), "", 0)]
+    while stack:
+        dir_path, rel_root, depth = stack.pop()
+        files, subdirs = scan_directory(dir_path)
+        if 0 < depth <= DIRECTORY_TREE_DEPTH:
+            directories.append(rel_root)
+        if depth < max_depth:
+            prefix = f"{rel_root}/" if rel_root else ""
+            for entry in reversed(subdirs):
+                if not entry.is_symlink():
+                    stack.append((entry.path, prefix + entry.name, depth + 1))
+
+        for entry in files:
             try:
-                size = file_path.stat().st_size
+                stat = entry.stat()
             except OSError:
                 continue
 
-            rel_path = file_path.relative_to(project_root).as_posix()
+            filename = entry.name
+            suffix = file_suffix(filename)
+            rel_path = f"{rel_root}/{filename}" if rel_root else filename
             item: Dict[str, Any] = {
-                "path": file_path,
+                "path": Path(entry.path),
                 "rel_path": rel_path,
                 "name": filename,
-                "suffix": file_path.suffix.lower(),
-                "size": size,
-                "line_count": count_lines(file_path) if should_scan_text(file_path) and size <= MAX_SCAN_FILE_SIZE else 0,
+                "suffix": suffix,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "line_count": 0,
                 "text": "",
             }
-            if should_scan_text(file_path) and size <= MAX_SCAN_FILE_SIZE:
-                item["text"] = safe_read_text(file_path)
             inventory.append(item)
-    return inventory
+    return inventory, directories
+
+
+def read_inventory_texts(inventory: Sequence[Dict[str, Any]]) -> None:
+    # Empty and oversized files are settled by the walk's stat alone and never opened; empty ones keep the
+    # text "" and line count 0 that a read would have produced.
+    to_read = [
+        item
+        for item in inventory
+        if 0 < item["size"] <= MAX_SCAN_FILE_SIZE and should_scan_text(item["name"], item["suffix"])
+    ]
+    # Line counts come from the same read as the text, so each scanned file is opened once.
+    texts = read_texts([item["path"] for item in to_read], [item["size"] for item in to_read])
+    for item, text in zip(to_read, texts):
+        item["text"] = text
+        item["line_count"] = count_text_lines(text)
+
+
+def genome_cache_key(
+    project_root: Path,
+    inventory: Sequence[Dict[str, Any]],
+    directories: Sequence[str],
+    options: Dict[str, object],
+) -> str:
+    # Sections read only walked files plus the walked directory list (the file-map tree), so file stamps and the
+    # directory names together cover their inputs; an empty new directory changes no file stamp. The builder's own
+    # stamp retires cached reports when the scanner changes.
+    builder_stat = Path(__file__).stat()
+    stamps = sorted((item["rel_path"], item["mtime_ns"], item["size"]) for item in inventory)
+    payload = json.dumps(
+        {
+            "builder": [builder_stat.st_mtime_ns, builder_stat.st_size],
+            "project_root": project_root.as_posix(),
+            "options": options,
+            "files": stamps,
+            "directories": list(directories),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_cached_report(cache_path: Path, key: str) -> Dict[str, Any] | None:
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("key") != key or not isinstance(data.get("report"), dict):
+        return None
+    return data["report"]
+
+
+def record_cached_report(cache_path: Path, key: str, report: Dict[str, Any]) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps({"key": key, "report": report}, ensure_ascii=False), encoding="utf-8")
+    # Replace in one step so a concurrent run never reads a half-written cache.
+    os.replace(temp_path, cache_path)
 
 
 def limit_items(items: Sequence[str], size: int = 10) -> List[str]:
@@ -449,9 +681,31 @@ def unique_preserve(items: Iterable[str]) -> List[str]:
     return ordered
 
 
+def root_entry_probe(project_root: Path) -> Callable[[str], bool]:
+    """Answer ``(project_root / name).exists()`` from one scandir of the root instead of a stat per probe.
+
+    Names with no case-insensitive match in the listing are settled without a syscall; a name that only matches by
+    case falls back to a real ``exists()`` so case-insensitive filesystems keep their answer. For nested names only
+    the first component is checked against the listing.
+    """
+    try:
+        with os.scandir(project_root) as entries:
+            # A dangling symlink is listed but does not exist.
+            names = {entry.name for entry in entries if not entry.is_symlink() or os.path.exists(entry.path)}
+    except OSError:
+        names = set()
+    folded = {name.casefold() for name in names}
+
+    def exists(name: str) -> bool:
+        head, separator, _ = name.partition("/")
+        if head in names:
+            return not separator or (project_root / name).exists()
+        return head.casefold() in folded and (project_root / name).exists()
+
+    return exists
+
+
 def load_json_file(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        return {}
     try:
         payload = json.loads(path.read_text(encoding="utf-8"))
     except (OSError, json.JSONDecodeError):
@@ -475,20 +729,11 @@ def parse_named_aliases(raw_value: str) -> List[str]:
 
 def build_import_alias_map(text: str) -> Dict[str, str]:
     alias_map: Dict[str, str] = {}
-    patterns = [
-        re.compile(r"""(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*require\(\s*['"]([^'"]+)['"]\s*\)"""),
-        re.compile(r"""import\s+([A-Za-z_$][\w$]*)\s+from\s+['"]([^'"]+)['"]"""),
-    ]
-    named_patterns = [
-        re.compile(r"""(?:const|let|var)\s*\{([^}]+)\}\s*=\s*require\(\s*['"]([^'"]+)['"]\s*\)"""),
-        re.compile(r"""import\s*\{([^}]+)\}\s*from\s+['"]([^'"]+)['"]"""),
-    ]
-
-    for pattern in patterns:
+    for pattern in IMPORT_ALIAS_PATTERNS:
         for match in pattern.finditer(text):
             alias_map[match.group(1).strip()] = match.group(2).strip()
 
-    for pattern in named_patterns:
+    for pattern in NAMED_IMPORT_ALIAS_PATTERNS:
         for match in pattern.finditer(text):
             module_name = match.group(2).strip()
             for alias in parse_named_aliases(match.group(1)):
@@ -497,20 +742,22 @@ def build_import_alias_map(text: str) -> Dict[str, str]:
     return alias_map
 
 
-def extract_module_references(text: str) -> List[str]:
+@lru_cache(maxsize=32)
+def module_references(text: str) -> Tuple[str, ...]:
     modules: List[str] = []
-    patterns = [
-        re.compile(r"""require\(\s*['"]([^'"]+)['"]\s*\)"""),
-        re.compile(r"""from\s+['"]([^'"]+)['"]"""),
-    ]
-    for pattern in patterns:
+    for pattern in MODULE_REFERENCE_PATTERNS:
         for match in pattern.finditer(text):
             modules.append(match.group(1).strip())
-    return unique_preserve(modules)
+    return tuple(unique_preserve(modules))
+
+
+def extract_module_references(text: str) -> List[str]:
+    # Auth detection asks twice per file (candidate check, then details), so the scan is memoized per text.
+    return list(module_references(text))
 
 
 def kebab_case(value: str) -> str:
-    normalized = re.sub(r"""([a-z0-9])([A-Z])""", r"\1-\2", value)
+    normalized = CAMEL_BOUNDARY_RE.sub(r"\1-\2", value)
     normalized = normalized.replace("_", "-")
     normalized = normalized.strip("-").lower()
     return normalized
@@ -538,7 +785,7 @@ def normalize_middleware_name(expression: str, alias_map: Dict[str, str]) -> str
         return None
 
     base_expression = cleaned
-    function_match = re.match(r"""([A-Za-z_$][\w$.]*)\s*\(""", cleaned)
+    function_match = CALL_TARGET_RE.match(cleaned)
     if function_match:
         base_expression = function_match.group(1)
 
@@ -671,7 +918,7 @@ def extract_middleware_chain(text: str, rel_path: str) -> List[str]:
         args = split_top_level_commas(body)
         if not args:
             continue
-        candidate_args = args[1:] if re.match(r"""['"]""", args[0].strip()) else args
+        candidate_args = args[1:] if args[0].lstrip().startswith(("'", '"')) else args
         for candidate in candidate_args:
             label = normalize_middleware_name(candidate, alias_map)
             if label:
@@ -680,11 +927,10 @@ def extract_middleware_chain(text: str, rel_path: str) -> List[str]:
 
 
 def is_non_production_example_path(rel_path: str) -> bool:
-    parts = [part.lower() for part in Path(rel_path).parts]
-    filename = Path(rel_path).name.lower()
-    if any(part in {"__tests__", "example", "examples", "fixture", "fixtures", "test", "tests"} for part in parts):
+    parts = rel_path.lower().split("/")
+    if not EXAMPLE_PATH_PARTS.isdisjoint(parts):
         return True
-    return any(token in filename for token in ("example", "sample", "template"))
+    return any(token in parts[-1] for token in ("example", "sample", "template"))
 
 
 def detect_detailed_auth_patterns(text: str, rel_path: str, routes: Sequence[str]) -> List[str]:
@@ -712,12 +958,15 @@ def detect_test_frameworks_from_package(project_root: Path) -> List[str]:
         return []
 
     frameworks: List[str] = []
+    # package.json is untrusted JSON: check the shapes once, then the label loop is plain membership tests.
     dependencies = payload.get("dependencies", {})
     dev_dependencies = payload.get("devDependencies", {})
+    if not isinstance(dependencies, dict):
+        dependencies = {}
+    if not isinstance(dev_dependencies, dict):
+        dev_dependencies = {}
     for package_name, label in TEST_PACKAGE_LABELS.items():
-        if isinstance(dev_dependencies, dict) and package_name in dev_dependencies:
-            frameworks.append(label)
-        elif isinstance(dependencies, dict) and package_name in dependencies:
+        if package_name in dev_dependencies or package_name in dependencies:
             frameworks.append(label)
 
     scripts = payload.get("scripts", {})
@@ -751,15 +1000,13 @@ def parse_package_dependencies(path: Path) -> List[str]:
 
 
 def parse_requirements(path: Path) -> List[str]:
-    if not path.exists():
-        return []
     names: List[str] = []
     try:
         for line in path.read_text(encoding="utf-8", errors="ignore").splitlines():
             stripped = line.strip()
             if not stripped or stripped.startswith("#"):
                 continue
-            normalized = re.split(r"[<>=~!]", stripped, maxsplit=1)[0].strip()
+            normalized = REQUIREMENT_NAME_END_RE.split(stripped, maxsplit=1)[0].strip()
             if normalized:
                 names.append(normalized)
     except OSError:
@@ -768,7 +1015,7 @@ def parse_requirements(path: Path) -> List[str]:
 
 
 def parse_pyproject_dependencies(path: Path) -> List[str]:
-    if not path.exists() or tomllib is None:
+    if tomllib is None:
         return []
     try:
         payload = tomllib.loads(path.read_text(encoding="utf-8"))
@@ -782,7 +1029,7 @@ def parse_pyproject_dependencies(path: Path) -> List[str]:
         if isinstance(deps, list):
             for item in deps:
                 if isinstance(item, str):
-                    names.append(re.split(r"[<>=~! ]", item, maxsplit=1)[0].strip())
+                    names.append(PEP508_NAME_END_RE.split(item, maxsplit=1)[0].strip())
 
     poetry = payload.get("tool", {}).get("poetry", {}) if isinstance(payload.get("tool"), dict) else {}
     if isinstance(poetry, dict):
@@ -797,12 +1044,13 @@ def parse_pyproject_dependencies(path: Path) -> List[str]:
 
 def detect_tech_stack(project_root: Path, inventory: Sequence[Dict[str, Any]]) -> List[str]:
     signals: List[str] = []
-    suffix_counts = Counter(str(item["suffix"]) for item in inventory)
-    if (project_root / "package.json").exists():
+    suffix_counts = Counter(item["suffix"] for item in inventory)
+    exists = root_entry_probe(project_root)
+    if exists("package.json"):
         signals.append("Node.js")
-    if (project_root / "requirements.txt").exists() or (project_root / "pyproject.toml").exists():
+    if exists("requirements.txt") or exists("pyproject.toml"):
         signals.append("Python")
-    if (project_root / "Dockerfile").exists() or (project_root / "docker-compose.yml").exists():
+    if exists("Dockerfile") or exists("docker-compose.yml"):
         signals.append("Docker")
     if suffix_counts.get(".ts", 0) or suffix_counts.get(".tsx", 0):
         signals.append("TypeScript")
@@ -814,9 +1062,9 @@ def detect_tech_stack(project_root: Path, inventory: Sequence[Dict[str, Any]]) -
         signals.append("Vue")
     if suffix_counts.get(".tsx", 0) or suffix_counts.get(".jsx", 0):
         signals.append("React")
-    if any("fastapi" in str(item["text"]).lower() for item in inventory if item.get("text")):
+    if any("fastapi" in item["text"].lower() for item in inventory if item["text"]):
         signals.append("FastAPI")
-    if any("express" in str(item["text"]).lower() for item in inventory if item.get("text")):
+    if any("express" in item["text"].lower() for item in inventory if item["text"]):
         signals.append("Express")
     return unique_preserve(signals)
 
@@ -825,17 +1073,16 @@ def build_architecture_section(project_root: Path, inventory: Sequence[Dict[str,
     entry_points = sorted(
         item["rel_path"]
         for item in inventory
-        if str(item["name"]) in ENTRY_POINT_CANDIDATES or str(item["rel_path"]).startswith("src/main.")
+        if item["name"] in ENTRY_POINT_CANDIDATES or item["rel_path"].startswith("src/main.")
     )
 
-    top_level_dirs: Dict[str, int] = defaultdict(int)
-    for item in inventory:
-        rel_path = str(item["rel_path"])
-        top = rel_path.split("/", 1)[0] if "/" in rel_path else "."
-        top_level_dirs[top] += 1
+    top_level_dirs = Counter(
+        rel_path.partition("/")[0] if "/" in rel_path else "."
+        for rel_path in (item["rel_path"] for item in inventory)
+    )
 
     module_boundaries = []
-    for name, count in sorted(top_level_dirs.items(), key=lambda pair: (-pair[1], pair[0])):
+    for name, count in heapq.nsmallest(12, top_level_dirs.items(), key=lambda pair: (-pair[1], pair[0])):
         if name == ".":
             purpose = "root-level config and entry files"
         else:
@@ -850,10 +1097,10 @@ def build_architecture_section(project_root: Path, inventory: Sequence[Dict[str,
     )
 
     total_files = len(inventory)
-    total_lines = sum(int(item.get("line_count", 0)) for item in inventory)
+    total_lines = sum(item["line_count"] for item in inventory)
     return {
         "entry_points": entry_points or ["Not detected"],
-        "module_boundaries": limit_items(module_boundaries, 12) or ["Not detected"],
+        "module_boundaries": module_boundaries or ["Not detected"],
         "key_dependencies": dependencies or ["Not detected"],
         "tech_stack": detect_tech_stack(project_root, inventory) or ["Not detected"],
         "scan_summary": {
@@ -868,15 +1115,15 @@ def detect_routes(text: str) -> List[str]:
     routes: List[str] = []
     for pattern in ROUTE_PATTERNS:
         for match in pattern.finditer(text):
-            if pattern.pattern.startswith("path"):
+            if pattern.groups == 1:
                 path_value = match.group(1).strip()
-                if re.fullmatch(r"""[/\w:<>.*-]*""", path_value):
+                if PATH_ROUTE_VALUE_RE.fullmatch(path_value):
                     routes.append(f"PATH {path_value or '/'}")
             else:
                 path_value = match.group(3).strip()
                 if "\n" in path_value or "," in path_value:
                     continue
-                if re.fullmatch(r"""[/\w:<>.*-]+""", path_value):
+                if VERB_ROUTE_VALUE_RE.fullmatch(path_value):
                     routes.append(f"{match.group(2).upper()} {path_value}")
     return routes
 
@@ -891,11 +1138,11 @@ def build_api_section(inventory: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
     for item in inventory:
         if not supports_pattern_scan(item):
             continue
-        text = str(item.get("text", ""))
+        text = item["text"]
         if not text:
             continue
 
-        rel_path = str(item["rel_path"])
+        rel_path = item["rel_path"]
         routes = detect_routes(text)
         if is_api_candidate(rel_path):
             for route in routes:
@@ -929,8 +1176,8 @@ def build_data_section(project_root: Path, inventory: Sequence[Dict[str, Any]])
     for item in inventory:
         if not supports_pattern_scan(item):
             continue
-        text = str(item.get("text", ""))
-        rel_path = str(item["rel_path"])
+        text = item["text"]
+        rel_path = item["rel_path"]
         lower_path = rel_path.lower()
         if not is_data_candidate(rel_path):
             continue
@@ -948,19 +1195,12 @@ def build_data_section(project_root: Path, inventory: Sequence[Dict[str, Any]])
                 parent = str(Path(rel_path).parent).replace("\\", "/")
                 migration_dirs.append(parent or ".")
 
+    exists = root_entry_probe(project_root)
     return {
         "database_types": unique_preserve(databases) or ["Not detected"],
-        "models_and_schemas": limit_items(sorted(unique_preserve(models)), 20) or ["Not detected"],
+        "models_and_schemas": heapq.nsmallest(20, set(filter(None, models))) or ["Not detected"],
         "migration_status": sorted(unique_preserve(migration_dirs)) or ["Not detected"],
-        "config_sources": [
-            path.name
-            for path in (
-                project_root / "package.json",
-                project_root / "requirements.txt",
-                project_root / "pyproject.toml",
-            )
-            if path.exists()
-        ] or ["Not detected"],
+        "config_sources": [name for name in CONFIG_SOURCE_NAMES if exists(name)] or ["Not detected"],
     }
 
 
@@ -968,7 +1208,7 @@ def build_security_section(project_root: Path, inventory: Sequence[Dict[str, Any
     env_files = sorted(
         item["rel_path"]
         for item in inventory
-        if str(item["name"]).startswith(".env")
+        if item["name"].startswith(".env")
     )
     gitignore_path = project_root / ".gitignore"
     gitignore_text = safe_read_text(gitignore_path)
@@ -986,11 +1226,11 @@ def build_security_section(project_root: Path, inventory: Sequence[Dict[str, Any
     for item in inventory:
         if not supports_pattern_scan(item):
             continue
-        text = str(item.get("text", ""))
+        text = item["text"]
         if not text:
             continue
 
-        rel_path = str(item["rel_path"])
+        rel_path = item["rel_path"]
         if is_non_production_example_path(rel_path):
             continue
         if any(pattern.search(text) for pattern in SECRET_PATTERNS):
@@ -1013,7 +1253,7 @@ def build_security_section(project_root: Path, inventory: Sequence[Dict[str, Any
 
     return {
         "env_handling": [env_summary],
-        "secret_exposure_risk": limit_items(sorted(unique_preserve(secret_risks)), 10) or ["Not detected"],
+        "secret_exposure_risk": heapq.nsmallest(10, set(filter(None, secret_risks))) or ["Not detected"],
         "auth_middleware_present": sorted(unique_preserve(auth_middleware)) or ["Not detected"],
         "cors_configured": sorted(unique_preserve(cors_hits)) or ["Not detected"],
         "rate_limiting": sorted(unique_preserve(rate_limits)) or ["Not detected"],
@@ -1021,136 +1261,146 @@ def build_security_section(project_root: Path, inventory: Sequence[Dict[str, Any
     }
 
 
-def normalize_test_stem(path: str) -> str:
-    stem = Path(path).stem.lower()
-    stem = re.sub(r"""(\.test|\.spec)$""", "", stem)
-    stem = re.sub(r"""^test_""", "", stem)
-    stem = re.sub(r"""_test$""", "", stem)
+def normalize_test_stem(stem: str) -> str:
+    """Strip test affixes from a file stem so a test and its source file share one key."""
+    stem = stem.lower()
+    if stem.endswith((".test", ".spec")):
+        stem = stem[: -len(".test")]
+    if stem.startswith("test_"):
+        stem = stem[len("test_") :]
+    if stem.endswith("_test"):
+        stem = stem[: -len("_test")]
     return stem
 
 
 def build_test_section(project_root: Path, inventory: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    # rel_path is "/"-separated, so rpartition/split give Path(rel_path).parent and .parts without building a Path.
     test_dirs = sorted(
         unique_preserve(
-            str(Path(item["rel_path"]).parent).replace("\\", "/")
-            for item in inventory
-            if TEST_DIR_NAMES.intersection({part.lower() for part in Path(str(item["rel_path"])).parts})
+            rel_path.rpartition("/")[0] or "."
+            for rel_path in (item["rel_path"] for item in inventory)
+            if not TEST_DIR_NAMES.isdisjoint(rel_path.lower().split("/"))
         )
     )
 
     frameworks: List[str] = detect_test_frameworks_from_package(project_root)
     test_stems: set[str] = set()
-    source_candidates: List[str] = []
+    # (rel_path, normalized stem) pairs, so the missing-test check below is a pure set lookup.
+    source_candidates: List[Tuple[str, str]] = []
 
     for item in inventory:
         if not supports_pattern_scan(item):
             continue
-        text = str(item.get("text", ""))
-        rel_path = str(item["rel_path"])
+        text = item["text"]
+        rel_path = item["rel_path"]
         lower_path = rel_path.lower()
 
         for label, pattern in TEST_FRAMEWORK_PATTERNS.items():
             if text and pattern.search(text):
                 frameworks.append(label)
 
+        path = Path(rel_path)
         is_test_file = (
-            any(part.lower() in TEST_DIR_NAMES for part in Path(rel_path).parts)
+            any(part.lower() in TEST_DIR_NAMES for part in path.parts)
             or ".spec." in lower_path
             or ".test." in lower_path
-            or Path(rel_path).name.startswith("test_")
-            or Path(rel_path).stem.endswith("_test")
+            or path.name.startswith("test_")
+            or path.stem.endswith("_test")
         )
         if is_test_file:
-            test_stems.add(normalize_test_stem(rel_path))
-        elif Path(rel_path).suffix.lower() in {".js", ".jsx", ".ts", ".tsx", ".py", ".go", ".java", ".rb", ".php"}:
-            source_candidates.append(rel_path)
-
-    missing_tests = [
-        path
-        for path in source_candidates
-        if normalize_test_stem(path) not in test_stems and "migrations/" not in path and "/scripts/" not in path
-    ]
+            test_stems.add(normalize_test_stem(path.stem))
+        elif item["suffix"] in TESTABLE_SOURCE_EXTENSIONS:
+            source_candidates.append((rel_path, normalize_test_stem(path.stem)))
+
+    # Only the first ten are reported, so stop scanning once they are found.
+    missing_tests = list(
+        islice(
+            (
+                path
+                for path, stem in source_candidates
+                if stem not in test_stems and "migrations/" not in path and "/scripts/" not in path
+            ),
+            10,
+        )
+    )
 
     ci_pipelines = []
+    exists = root_entry_probe(project_root)
     for candidate in CI_FILES:
-        if (project_root / candidate).exists():
+        if exists(candidate):
             ci_pipelines.append(candidate)
-    if (project_root / ".github" / "workflows").exists():
+    if exists(".github/workflows"):
         workflows = sorted(path.relative_to(project_root).as_posix() for path in (project_root / ".github" / "workflows").glob("*.y*ml"))
         ci_pipelines.extend(workflows)
 
     return {
         "test_directories": test_dirs or ["Not detected"],
         "test_frameworks": unique_preserve(frameworks) or ["Not detected"],
-        "files_without_tests": limit_items(missing_tests, 10) or ["Not detected"],
+        "files_without_tests": missing_tests or ["Not detected"],
         "ci_pipeline": unique_preserve(ci_pipelines) or ["Not detected"],
     }
 
 
-def build_directory_tree(project_root: Path, max_depth: int = 2) -> List[str]:
+def build_directory_tree(directories: Sequence[str], max_depth: int = DIRECTORY_TREE_DEPTH) -> List[str]:
     lines: List[str] = []
-    for root_str, dirs, _files in os.walk(project_root):
-        root = Path(root_str)
-        rel_root = root.relative_to(project_root)
-        depth = len(rel_root.parts)
-        dirs[:] = [item for item in dirs if item not in SKIP_DIRS]
+    for rel_dir in directories:
+        depth = rel_dir.count("/") + 1
         if depth > max_depth:
-            dirs[:] = []
-            continue
-        if depth == 0:
             continue
-        indent = "  " * (depth - 1)
-        lines.append(f"{indent}- {rel_root.as_posix()}/")
-        if depth >= max_depth:
-            dirs[:] = []
-    return lines[:30]
+        lines.append(f"{'  ' * (depth - 1)}- {rel_dir}/")
+        if len(lines) >= 30:
+            break
+    return lines
 
 
-def build_file_map_section(project_root: Path, inventory: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
-    language_counts: Counter[str] = Counter()
-    for item in inventory:
-        label = LANGUAGE_NAMES.get(str(item["suffix"]))
-        if label:
-            language_counts[label] += 1
+def build_file_map_section(inventory: Sequence[Dict[str, Any]], directories: Sequence[str]) -> Dict[str, Any]:
+    language_counts = Counter(
+        label for label in (LANGUAGE_NAMES.get(item["suffix"]) for item in inventory) if label
+    )
 
+    # nlargest keeps sorted(..., reverse=True)[:10]'s tie order without sorting the whole inventory.
     largest_files = [
-        f"{item['rel_path']} ({round(int(item['size']) / 1024, 1)} KB)"
-        for item in sorted(inventory, key=lambda current: int(current["size"]), reverse=True)
+        f"{item['rel_path']} ({round(item['size'] / 1024, 1)} KB)"
+        for item in heapq.nlargest(10, inventory, key=lambda current: current["size"])
     ]
 
     return {
-        "directory_tree": build_directory_tree(project_root, max_depth=2) or ["Not detected"],
+        "directory_tree": build_directory_tree(directories) or ["Not detected"],
         "files_by_language": [
             f"{language}: {count}"
             for language, count in language_counts.most_common()
         ] or ["Not detected"],
-        "largest_files": limit_items(largest_files, 10) or ["Not detected"],
+        "largest_files": largest_files or ["Not detected"],
     }
 
 
-def render_section_lines(title: str, groups: Sequence[tuple[str, Sequence[str] | Dict[str, Any]]]) -> List[str]:
-    lines = [title]
+def write_section_lines(
+    write: Callable[[str], Any], title: str, groups: Sequence[tuple[str, Sequence[str] | Dict[str, Any]]]
+) -> None:
+    write(f"{title}\n")
     for label, values in groups:
-        lines.append(f"- {label}")
+        write(f"- {label}\n")
         if isinstance(values, dict):
             for key, value in values.items():
-                lines.append(f"  - {key.replace('_', ' ').title()}: {value}")
+                write(f"  - {key.replace('_', ' ').title()}: {value}\n")
             continue
         items = list(values)
         if not items:
-            lines.append("  - Not detected")
+            write("  - Not detected\n")
             continue
         for item in items:
-            lines.append(f"  - {item}")
-    return lines
+            write(f"  - {item}\n")
+
+
+def write_bullets(write: Callable[[str], Any], items: Iterable[str]) -> None:
+    for item in items:
+        write(f"  - {item}\n")
 
 
 def render_markdown(project_root: Path, generated_at: str, sections: Dict[str, Dict[str, Any]]) -> str:
-    lines = [
-        f"# Project Genome: {project_root.name}",
-        f"Generated: {generated_at}",
-        "",
-    ]
+    buffer = io.StringIO()
+    write = buffer.write
+    write(f"# Project Genome: {project_root.name}\nGenerated: {generated_at}\n\n")
 
     visible_index = 1
     for section_name in SECTION_ORDER:
@@ -1158,93 +1408,38 @@ def render_markdown(project_root: Path, generated_at: str, sections: Dict[str, D
         if not section:
             continue
         heading = f"## {visible_index}. {SECTION_TITLES[section_name]}"
-        if section_name == "architecture":
-            lines.extend(
-                render_section_lines(
-                    heading,
-                    [
-                        ("Entry points", section.get("entry_points", ["Not detected"])),
-                        ("Module boundaries", section.get("module_boundaries", ["Not detected"])),
-                        ("Key dependencies", section.get("key_dependencies", ["Not detected"])),
-                        ("Tech stack detected", section.get("tech_stack", ["Not detected"])),
-                        ("Scan summary", section.get("scan_summary", {})),
-                    ],
-                )
-            )
-        elif section_name == "api":
-            lines.append(heading)
-            lines.append("- Routes/endpoints found")
-            for item in section.get("routes", ["Not detected"]):
-                lines.append(f"  - {item}")
+        if section_name == "api":
+            write(f"{heading}\n- Routes/endpoints found\n")
+            write_bullets(write, section.get("routes", NOT_DETECTED))
             middleware_groups = section.get("middleware_chain_groups", {})
             if isinstance(middleware_groups, dict) and middleware_groups:
                 for file_path, middleware_items in middleware_groups.items():
-                    lines.append(f"- Middleware chain ({file_path})")
-                    for middleware_name in middleware_items:
-                        lines.append(f"  - {middleware_name}")
+                    write(f"- Middleware chain ({file_path})\n")
+                    write_bullets(write, middleware_items)
             else:
-                lines.append("- Middleware chain")
-                for item in section.get("middleware_chain", ["Not detected"]):
-                    lines.append(f"  - {item}")
-            lines.append("- Auth patterns detected")
-            for item in section.get("auth_patterns", ["Not detected"]):
-                lines.append(f"  - {item}")
-        elif section_name == "data":
-            lines.extend(
-                render_section_lines(
-                    heading,
-                    [
-                        ("Database type", section.get("database_types", ["Not detected"])),
-                        ("Models/schemas found", section.get("models_and_schemas", ["Not detected"])),
-                        ("Migration status", section.get("migration_status", ["Not detected"])),
-                        ("Config sources", section.get("config_sources", ["Not detected"])),
-                    ],
-                )
-            )
-        elif section_name == "security":
-            lines.extend(
-                render_section_lines(
-                    heading,
-                    [
-                        (".env handling", section.get("env_handling", ["Not detected"])),
-                        ("Secrets exposure risk", section.get("secret_exposure_risk", ["Not detected"])),
-                        ("Auth middleware present", section.get("auth_middleware_present", ["Not detected"])),
-                        ("CORS configured", section.get("cors_configured", ["Not detected"])),
-                        ("Rate limiting", section.get("rate_limiting", ["Not detected"])),
-                        ("HTTPS enforcement", section.get("https_enforcement", ["Not detected"])),
-                    ],
-                )
-            )
-        elif section_name == "tests":
-            lines.extend(
-                render_section_lines(
-                    heading,
-                    [
-                        ("Test directories found", section.get("test_directories", ["Not detected"])),
-                        ("Test frameworks detected", section.get("test_frameworks", ["Not detected"])),
-                        ("Files without corresponding test files", section.get("files_without_tests", ["Not detected"])),
-                        ("CI pipeline detected", section.get("ci_pipeline", ["Not detected"])),
-                    ],
-                )
-            )
-        elif section_name == "file_map":
-            lines.extend(
-                render_section_lines(
-                    heading,
-                    [
-                        ("Directory tree (depth 2)", section.get("directory_tree", ["Not detected"])),
-                        ("Total files by language", section.get("files_by_language", ["Not detected"])),
-                        ("Largest files", section.get("largest_files", ["Not detected"])),
-                    ],
-                )
-            )
-        lines.append("")
+                write("- Middleware chain\n")
+                write_bullets(write, section.get("middleware_chain", NOT_DETECTED))
+            write("- Auth patterns detected\n")
+            write_bullets(write, section.get("auth_patterns", NOT_DETECTED))
+        else:
+            groups = [
+                (label, section.get(key, {} if key == "scan_summary" else NOT_DETECTED))
+                for label, key in SECTION_RENDER_GROUPS[section_name]
+            ]
+            write_section_lines(write, heading, groups)
+        write("\n")
         visible_index += 1
 
-    return "\n".join(lines).rstrip() + "\n"
+    return buffer.getvalue().rstrip() + "\n"
 
 
-def build_sections(project_root: Path, inventory: Sequence[Dict[str, Any]], selected_sections: Sequence[str], scan_depth: int) -> Dict[str, Dict[str, Any]]:
+def build_sections(
+    project_root: Path,
+    inventory: Sequence[Dict[str, Any]],
+    directories: Sequence[str],
+    selected_sections: Sequence[str],
+    scan_depth: int,
+) -> Dict[str, Dict[str, Any]]:
     sections: Dict[str, Dict[str, Any]] = {}
     for section_name in selected_sections:
         if section_name == "architecture":
@@ -1258,16 +1453,34 @@ def build_sections(project_root: Path, inventory: Sequence[Dict[str, Any]], sele
         elif section_name == "tests":
             sections[section_name] = build_test_section(project_root, inventory)
         elif section_name == "file_map":
-            sections[section_name] = build_file_map_section(project_root, inventory)
+            sections[section_name] = build_file_map_section(inventory, directories)
     return sections
 
 
-def build_genome_report(project_root: Path, depth_mode: str, sections_value: str) -> Dict[str, Any]:
+def build_genome_report(
+    project_root: Path, depth_mode: str, sections_value: str, use_cache: bool = False, force: bool = False
+) -> Dict[str, Any]:
+    """Scan the project and build the genome report.
+
+    With ``use_cache`` the report is stored under ``.codex/context`` and returned as-is on the next run when no
+    scanned file changed; ``force`` skips that lookup but still refreshes the stored report.
+    """
     scan_depth = detect_scan_depth(depth_mode)
     selected_sections = normalize_sections(sections_value)
-    inventory = walk_inventory(project_root, max_depth=scan_depth)
+    inventory, directories = walk_project_once(project_root, max_depth=scan_depth)
+
+    cache_path = project_root / ".codex" / "context" / GENOME_CACHE_NAME
+    cache_key = ""
+    if use_cache:
+        cache_key = genome_cache_key(project_root, inventory, directories, {"depth": depth_mode, "sections": selected_sections})
+        cached = None if force else load_cached_report(cache_path, cache_key)
+        if cached is not None:
+            cached["cached"] = True
+            return cached
+
+    read_inventory_texts(inventory)
     generated_at = datetime.now().strftime("%Y-%m-%d %H:%M")
-    sections = build_sections(project_root, inventory, selected_sections, scan_depth)
+    sections = build_sections(project_root, inventory, directories, selected_sections, scan_depth)
     markdown = render_markdown(project_root, generated_at, sections)
 
     report: Dict[str, Any] = {
@@ -1278,11 +1491,17 @@ def build_genome_report(project_root: Path, depth_mode: str, sections_value: str
         "scan_depth": scan_depth,
         "sections_scanned": selected_sections,
         "total_files": len(inventory),
-        "total_lines": sum(int(item.get("line_count", 0)) for item in inventory),
+        "total_lines": sum(item["line_count"] for item in inventory),
         "module_maps_count": 0,
         "sections": sections,
         "markdown": markdown,
     }
+    if cache_key:
+        try:
+            record_cached_report(cache_path, cache_key, report)
+        except OSError:
+            pass
+    report["cached"] = False
     return report
 
 
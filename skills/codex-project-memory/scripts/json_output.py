@@ -0,0 +1,29 @@
+"""Shared JSON rendering for project-memory scripts and artifacts."""
+from __future__ import annotations
+
+import json
+import sys
+from typing import Any
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional accelerator
+    orjson = None  # type: ignore[assignment]
+
+
+def render_json(payload: Any) -> bytes:
+    """Pretty-print JSON as UTF-8 with orjson when it is installed, else the stdlib encoder."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def print_json(payload: Any) -> None:
+    """Write render_json(payload) and a newline to stdout, as raw bytes when stdout has a buffer."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        print(render_json(payload).decode("utf-8"))
+        return
+    sys.stdout.flush()
+    buffer.write(render_json(payload) + b"\n")
+    buffer.flush()
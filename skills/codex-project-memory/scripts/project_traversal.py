@@ -130,6 +130,29 @@ class TraversalResult:
     coverage: dict[str, object]
 
 
+@dataclass(frozen=True)
+class WalkedFile:
+    path: Path
+    rel_path: str
+    size_bytes: int
+    mtime_ns: int
+
+
+@dataclass
+class TraversalWalk:
+    root: Path
+    config: TraversalConfig
+    files: list[WalkedFile] = field(default_factory=list)
+    warnings: list[dict[str, str]] = field(default_factory=list)
+    skipped_reasons: dict[str, int] = field(default_factory=dict)
+    candidate_files: int = 0
+
+    def skip(self, reason: str, rel: str, warning_type: str = "skipped", severity: str = "info") -> None:
+        self.skipped_reasons[reason] = self.skipped_reasons.get(reason, 0) + 1
+        if warning_type != "ignored":
+            self.warnings.append(structured_warning(warning_type, rel, reason, severity))
+
+
 def parse_bool(value: str | bool) -> bool:
     if isinstance(value, bool):
         return value
@@ -297,113 +320,188 @@ def sample_for_index(path: Path, max_bytes: int) -> tuple[str, int, bool]:
     return text, min(size, max_bytes), True
 
 
-def traverse_project(
+def read_sample(path: Path, max_bytes: int) -> tuple[str, int, bool] | OSError:
+    """sample_for_index, with a read failure returned instead of raised so batch readers can report it per file."""
+    try:
+        return sample_for_index(path, max_bytes)
+    except OSError as exc:
+        return exc
+
+
+def walk_project(
     project_root: Path,
     config: TraversalConfig | None = None,
     file_filter: Callable[[str, Path], bool] | None = None,
-) -> TraversalResult:
+) -> TraversalWalk:
+    """Collect the files a traversal would consider, using directory entries and stat only (no file reads)."""
     root = project_root.expanduser().resolve()
     cfg = config or TraversalConfig()
     ignore_patterns = load_ignore_patterns(root)
-    warnings: list[dict[str, str]] = []
-    files: list[TraversedFile] = []
-    skipped_reasons: dict[str, int] = {}
-    total_bytes = 0
-    candidate_files = 0
-
-    def skip(reason: str, rel: str, warning_type: str = "skipped", severity: str = "info") -> None:
-        skipped_reasons[reason] = skipped_reasons.get(reason, 0) + 1
-        if warning_type != "ignored":
-            warnings.append(structured_warning(warning_type, rel, reason, severity))
-
-    for current_root, dirs, names in os.walk(root, topdown=True, followlinks=cfg.follow_symlinks):
-        current_path = Path(current_root)
-        dir_entries = sorted(dirs)
-        kept_dirs: list[str] = []
-        for dirname in dir_entries:
-            dir_path = current_path / dirname
-            rel = safe_rel(dir_path, root)
-            if dirname in cfg.hard_skip_dirs:
-                skip("hard-coded skip dir", rel, "ignored", "info")
+    walk = TraversalWalk(root=root, config=cfg)
+
+    def entry_rel(entry: os.DirEntry, rel_dir: str | None) -> str:
+        # Below the root and outside followed symlinks, the relative path is lexical; only
+        # symlinked entries need resolve() to report where they actually point.
+        if rel_dir is None or entry.is_symlink():
+            return safe_rel(Path(entry.path), root)
+        return f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+
+    # Explicit stack of (directory, lexical rel or None once a symlink was followed); visit order
+    # matches a top-down os.walk with sorted names.
+    stack: list[tuple[str, str | None]] = [(str(root), "")]
+    while stack:
+        current_root, rel_dir = stack.pop()
+        try:
+            with os.scandir(current_root) as iterator:
+                entries = sorted(iterator, key=lambda item: item.name)
+        except OSError:
+            continue
+        dir_entries: list[os.DirEntry] = []
+        file_entries: list[os.DirEntry] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dir_entries if is_dir else file_entries).append(entry)
+
+        kept_dirs: list[tuple[str, str | None]] = []
+        for entry in dir_entries:
+            rel = entry_rel(entry, rel_dir)
+            if entry.name in cfg.hard_skip_dirs:
+                walk.skip("hard-coded skip dir", rel, "ignored", "info")
                 continue
             if ignored_by_patterns(rel, ignore_patterns) or ignored_by_patterns(rel + "/", ignore_patterns):
-                skip("ignore pattern", rel, "ignored", "info")
+                walk.skip("ignore pattern", rel, "ignored", "info")
                 continue
-            if dir_path.is_symlink():
+            if entry.is_symlink():
                 if not cfg.follow_symlinks:
-                    skip("symlink traversal disabled", rel, "symlink_skipped", "warning")
+                    walk.skip("symlink traversal disabled", rel, "symlink_skipped", "warning")
                     continue
-                if not inside_root(dir_path, root):
-                    skip("symlink escapes project root", rel, "symlink_skipped", "warning")
+                if not inside_root(Path(entry.path), root):
+                    walk.skip("symlink escapes project root", rel, "symlink_skipped", "warning")
                     continue
-            kept_dirs.append(dirname)
-        dirs[:] = kept_dirs
-
-        for name in sorted(names):
-            path = current_path / name
-            rel = safe_rel(path, root)
-            candidate_files += 1
-            if path.is_symlink():
+                kept_dirs.append((entry.path, None))
+                continue
+            kept_dirs.append((entry.path, None if rel_dir is None else rel))
+        stack.extend(reversed(kept_dirs))
+
+        for entry in file_entries:
+            path = Path(entry.path)
+            rel = entry_rel(entry, rel_dir)
+            walk.candidate_files += 1
+            is_link = entry.is_symlink()
+            if is_link:
                 if not cfg.follow_symlinks:
-                    skip("symlink traversal disabled", rel, "symlink_skipped", "warning")
+                    walk.skip("symlink traversal disabled", rel, "symlink_skipped", "warning")
                     continue
                 if not inside_root(path, root):
-                    skip("symlink escapes project root", rel, "symlink_skipped", "warning")
+                    walk.skip("symlink escapes project root", rel, "symlink_skipped", "warning")
                     continue
             if ignored_by_patterns(rel, ignore_patterns):
-                skip("ignore pattern", rel, "ignored", "info")
+                walk.skip("ignore pattern", rel, "ignored", "info")
                 continue
             if not included_by_patterns(rel, cfg.include):
-                skip("include pattern", rel, "ignored", "info")
+                walk.skip("include pattern", rel, "ignored", "info")
                 continue
             if ignored_by_patterns(rel, cfg.exclude):
-                skip("exclude pattern", rel, "ignored", "info")
+                walk.skip("exclude pattern", rel, "ignored", "info")
                 continue
             if file_filter and not file_filter(rel, path):
                 continue
-            if len(files) >= cfg.max_files:
-                skip("max-files limit", rel, "limit_exceeded", "warning")
-                continue
             try:
-                if not path.is_file():
-                    continue
-                size = path.stat().st_size
-                if is_binary_file(path):
-                    skip("binary file", rel, "binary_skipped", "warning")
-                    continue
-                if total_bytes >= cfg.max_total_bytes:
-                    skip("max-total-bytes limit", rel, "limit_exceeded", "warning")
+                if not entry.is_file():
                     continue
-                remaining = max(cfg.max_total_bytes - total_bytes, 0)
-                per_file_budget = max(min(cfg.max_file_bytes, remaining), 0)
-                if per_file_budget <= 0:
-                    skip("max-total-bytes limit", rel, "limit_exceeded", "warning")
-                    continue
-                content, bytes_read, large = sample_for_index(path, per_file_budget)
+                stat = entry.stat()
             except OSError as exc:
-                skip(f"read error: {exc}", rel, "read_error", "warning")
+                walk.skip(f"read error: {exc}", rel, "read_error", "warning")
                 continue
-            total_bytes += bytes_read
-            if large:
-                warnings.append(structured_warning("large_file_sampled", rel, f"sampled {bytes_read} of {size} bytes", "warning"))
-            files.append(
-                TraversedFile(
-                    path=path.resolve(),
+            walk.files.append(
+                WalkedFile(
+                    path=path.resolve() if rel_dir is None or is_link else path,
                     rel_path=rel,
-                    size_bytes=size,
-                    bytes_read=bytes_read,
-                    content=content,
-                    lines=content.splitlines(),
-                    large_file=large,
+                    size_bytes=stat.st_size,
+                    mtime_ns=stat.st_mtime_ns,
                 )
             )
+    return walk
+
+
+def read_walked_files(
+    walk: TraversalWalk,
+    read_samples: Callable[[list[Path], list[int]], list[tuple[str, int, bool] | OSError]] | None = None,
+) -> TraversalResult:
+    """Apply the file and byte limits to a walk, then read the files that fit.
+
+    Budgets come from the walked sizes, so every read is known up front and ``read_samples`` may fetch them in
+    any order or in parallel; it returns one ``read_sample`` result per path.
+    """
+    cfg = walk.config
+    warnings = list(walk.warnings)
+    skipped_reasons = dict(walk.skipped_reasons)
+
+    def skip(reason: str, rel: str, warning_type: str = "skipped", severity: str = "info") -> None:
+        skipped_reasons[reason] = skipped_reasons.get(reason, 0) + 1
+        if warning_type != "ignored":
+            warnings.append(structured_warning(warning_type, rel, reason, severity))
+
+    selected: list[tuple[WalkedFile, int]] = []
+    planned_bytes = 0
+    for item in walk.files:
+        if len(selected) >= cfg.max_files:
+            skip("max-files limit", item.rel_path, "limit_exceeded", "warning")
+            continue
+        try:
+            if is_binary_file(item.path):
+                skip("binary file", item.rel_path, "binary_skipped", "warning")
+                continue
+        except OSError as exc:
+            skip(f"read error: {exc}", item.rel_path, "read_error", "warning")
+            continue
+        if planned_bytes >= cfg.max_total_bytes:
+            skip("max-total-bytes limit", item.rel_path, "limit_exceeded", "warning")
+            continue
+        remaining = max(cfg.max_total_bytes - planned_bytes, 0)
+        per_file_budget = max(min(cfg.max_file_bytes, remaining), 0)
+        if per_file_budget <= 0:
+            skip("max-total-bytes limit", item.rel_path, "limit_exceeded", "warning")
+            continue
+        selected.append((item, per_file_budget))
+        # sample_for_index reads min(size, budget) bytes, so the running total is known before any read.
+        planned_bytes += min(item.size_bytes, per_file_budget)
+
+    paths = [item.path for item, _budget in selected]
+    budgets = [budget for _item, budget in selected]
+    samples = read_samples(paths, budgets) if read_samples else [read_sample(path, budget) for path, budget in zip(paths, budgets)]
+
+    files: list[TraversedFile] = []
+    total_bytes = 0
+    for (item, _budget), sample in zip(selected, samples):
+        if isinstance(sample, OSError):
+            skip(f"read error: {sample}", item.rel_path, "read_error", "warning")
+            continue
+        content, bytes_read, large = sample
+        total_bytes += bytes_read
+        if large:
+            warnings.append(structured_warning("large_file_sampled", item.rel_path, f"sampled {bytes_read} of {item.size_bytes} bytes", "warning"))
+        files.append(
+            TraversedFile(
+                path=item.path,
+                rel_path=item.rel_path,
+                size_bytes=item.size_bytes,
+                bytes_read=bytes_read,
+                content=content,
+                lines=content.splitlines(),
+                large_file=large,
+            )
+        )
 
     files.sort(key=lambda item: item.rel_path)
     warnings.sort(key=lambda item: (item["severity"], item["type"], item["path"], item["reason"]))
     coverage = {
         "files_scanned": len(files),
         "files_skipped": sum(skipped_reasons.values()),
-        "candidate_files": candidate_files,
+        "candidate_files": walk.candidate_files,
         "bytes_scanned": total_bytes,
         "skipped_reasons": dict(sorted(skipped_reasons.items())),
         "warnings": len(warnings),
@@ -415,3 +513,11 @@ def traverse_project(
         },
     }
     return TraversalResult(files=files, warnings=warnings, coverage=coverage)
+
+
+def traverse_project(
+    project_root: Path,
+    config: TraversalConfig | None = None,
+    file_filter: Callable[[str, Path], bool] | None = None,
+) -> TraversalResult:
+    return read_walked_files(walk_project(project_root, config, file_filter))
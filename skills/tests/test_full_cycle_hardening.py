@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import importlib.util
 import json
+import os
 import subprocess
 import sys
+from datetime import date
 from pathlib import Path
 
+import pytest
+
 
 SKILLS_ROOT = Path(__file__).resolve().parents[1]
 
@@ -28,6 +32,7 @@ knowledge_index = load_script_module("full_cycle_knowledge_index", "codex-projec
 knowledge_graph = load_script_module("full_cycle_knowledge_graph", "codex-project-memory/scripts/build_knowledge_graph.py")
 codebase_indexer = load_script_module("full_cycle_codebase_indexer", "codex-project-memory/scripts/codebase_indexer.py")
 memory_status = load_script_module("full_cycle_memory_status", "codex-project-memory/scripts/memory_status.py")
+compact_context = load_script_module("full_cycle_compact_context", "codex-project-memory/scripts/compact_context.py")
 project_traversal = load_script_module("full_cycle_project_traversal", "codex-project-memory/scripts/project_traversal.py")
 sync_global = load_script_module("full_cycle_sync_global", ".system/scripts/sync_global_skills.py")
 auto_gate = load_script_module("full_cycle_auto_gate", "codex-execution-quality-gate/scripts/auto_gate.py")
@@ -587,6 +592,215 @@ def test_knowledge_graph_marks_preview_chunks_as_truncated(tmp_path: Path) -> No
     assert "graph preview limited" in stats["cap_reason"]
 
 
+def test_knowledge_graph_cache_key_tracks_file_mtimes(tmp_path: Path) -> None:
+    write(tmp_path / "src" / "app.py", "print('hello')\n")
+    output_path = tmp_path / ".codex" / "knowledge-graph.json"
+    index_path = tmp_path / ".codex" / knowledge_graph.GRAPH_CACHE_INDEX_NAME
+
+    walked = knowledge_graph.walk_code_files(tmp_path, include_tests=False).files
+    key = knowledge_graph.graph_cache_key(tmp_path, walked, {"include_tests": False})
+    assert knowledge_graph.load_cached_graph(index_path, key, output_path) is None
+
+    graph = knowledge_graph.build_graph(tmp_path, include_tests=False)
+    write(output_path, json.dumps(graph))
+    knowledge_graph.record_graph_cache(index_path, key, output_path, dict(knowledge_graph.PROBED_DIRECTORIES))
+    assert knowledge_graph.load_cached_graph(index_path, key, output_path) == graph
+
+    app = tmp_path / "src" / "app.py"
+    stat = app.stat()
+    os.utime(app, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    walked = knowledge_graph.walk_code_files(tmp_path, include_tests=False).files
+    assert knowledge_graph.graph_cache_key(tmp_path, walked, {"include_tests": False}) != key
+
+
+def test_knowledge_graph_cache_tracks_import_targets_outside_the_traversal(tmp_path: Path, monkeypatch, capsys) -> None:
+    write(tmp_path / "src" / "app.js", "import Generated from './Generated.vue';\n")
+    argv = ["build_knowledge_graph.py", "--project-root", str(tmp_path), "--exclude", "src/Generated.vue", "--print-full-json"]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    def run_main() -> tuple:
+        assert knowledge_graph.main() == 0
+        payload = json.loads(capsys.readouterr().out)
+        return payload["cached"], payload["file_dependencies"]["src/app.js"]["imports"]
+
+    assert run_main() == (False, [])
+    assert run_main() == (True, [])
+    # Neither the graph walk (excluded) nor the codebase indexer (no .vue) stamps this file; only the stamp of
+    # the directory resolution listed sees it appear.
+    write(tmp_path / "src" / "Generated.vue", "<template><div /></template>\n")
+    assert run_main() == (False, ["src/Generated.vue"])
+    assert run_main() == (True, ["src/Generated.vue"])
+    (tmp_path / "src" / "Generated.vue").unlink()
+    assert run_main() == (False, [])
+
+
+def test_knowledge_graph_tree_sitter_imports_match_regex_fallback(monkeypatch) -> None:
+    tree_sitter_languages = pytest.importorskip("tree_sitter_languages")
+    content = (
+        'import React from "react";\n'
+        'import "./styles.css";\n'
+        'import { a, b } from "../lib/util";\n'
+        'const api = require("./api");\n'
+        'const other = load("./not-an-import");\n'
+    )
+    file_path = Path("src/app.tsx")
+    expected = ["../lib/util", "./api", "./styles.css", "react"]
+    assert sorted(knowledge_graph.extract_tree_sitter_imports(file_path, content)) == expected
+    monkeypatch.setattr(knowledge_graph, "tree_sitter_languages", None)
+    assert knowledge_graph.extract_javascript_imports(file_path, content) == expected
+
+    # Newer bindings return {name: [nodes]} and may not evaluate `#eq?`; both must still match.
+    parser = tree_sitter_languages.get_parser("tsx")
+    query = tree_sitter_languages.get_language("tsx").query(
+        knowledge_graph.TREE_SITTER_IMPORT_QUERY.replace('(#eq? @callee "require")', "")
+    )
+
+    class DictQuery:
+        def captures(self, node):
+            grouped = {}
+            for captured, name in query.captures(node):
+                grouped.setdefault(name, []).append(captured)
+            return grouped
+
+    monkeypatch.setattr(knowledge_graph, "tree_sitter_import_parser", lambda grammar: (parser, DictQuery()))
+    assert sorted(knowledge_graph.extract_tree_sitter_imports(file_path, content)) == expected
+
+
+def test_knowledge_graph_main_reuses_cache_but_keeps_codebase_index_current(tmp_path: Path, monkeypatch, capsys) -> None:
+    write(tmp_path / "src" / "app.py", "print('hello')\n")
+    codebase_index_path = tmp_path / ".codex" / "knowledge" / "codebase-index.json"
+    monkeypatch.setattr(sys, "argv", ["build_knowledge_graph.py", "--project-root", str(tmp_path)])
+
+    def run_main() -> dict:
+        assert knowledge_graph.main() == 0
+        return json.loads(capsys.readouterr().out)
+
+    assert run_main()["cached"] is False
+    assert codebase_index_path.is_file()
+    with monkeypatch.context() as patch:
+        patch.setattr(knowledge_graph.load_traversal(), "read_sample", lambda *args: pytest.fail("cache hit read a file"))
+        assert run_main()["cached"] is True
+
+    codebase_index_path.unlink()
+    assert run_main()["cached"] is False
+    assert codebase_index_path.is_file()
+
+    # package.json is indexed by the codebase indexer but is not a graph traversal entry.
+    write(tmp_path / "package.json", '{"name": "demo"}\n')
+    assert run_main()["cached"] is False
+    graph = json.loads((tmp_path / ".codex" / "knowledge-graph.json").read_text(encoding="utf-8"))
+    assert "package.json" in graph["codebase_index"]["files"]
+    assert run_main()["cached"] is True
+
+
+def test_knowledge_graph_reads_files_in_a_pool_only_when_workers_can_import_the_worker(tmp_path: Path, monkeypatch) -> None:
+    for index in range(knowledge_graph.PARALLEL_MIN_FILES):
+        write(tmp_path / "src" / f"m{index}.js", f"import x from './m{index + 1}';\n")
+
+    def graph_shape(graph: dict) -> tuple:
+        coverage = graph["coverage"]
+        return graph["file_dependencies"], graph["code_index"], coverage["files_scanned"], coverage["bytes_scanned"]
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    expected = graph_shape(knowledge_graph.build_graph(tmp_path, include_tests=False))
+    assert expected[0]["src/m0.js"]["imports"] == ["src/m1.js"]
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+
+    pools = []
+    real_pool = knowledge_graph.ProcessPoolExecutor
+
+    class CountingPool(real_pool):
+        def __init__(self, *args, **kwargs) -> None:
+            pools.append(kwargs.get("max_workers"))
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(knowledge_graph, "ProcessPoolExecutor", CountingPool)
+    assert graph_shape(knowledge_graph.build_graph(tmp_path, include_tests=False)) == expected
+    assert pools == ([4] if knowledge_graph.pool_can_import(knowledge_graph.read_and_scan_file) else [])
+
+    # build_knowledge_index loads the builder under an alias that is not in sys.modules.
+    spec = importlib.util.spec_from_file_location(
+        "unregistered_graph_builder", SKILLS_ROOT / "codex-project-memory" / "scripts" / "build_knowledge_graph.py"
+    )
+    assert spec and spec.loader
+    aliased = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(aliased)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("pool started for a worker the children cannot import")
+
+    monkeypatch.setattr(aliased, "ProcessPoolExecutor", no_pool)
+    assert not aliased.pool_can_import(aliased.read_and_scan_file)
+    assert graph_shape(aliased.build_graph(tmp_path, include_tests=False)) == expected
+
+
+def test_knowledge_graph_resolves_imports_whose_case_differs_from_disk(tmp_path: Path, monkeypatch) -> None:
+    write(tmp_path / "src" / "utils.js", "export const x = 1;\n")
+    write(tmp_path / "src" / "app.js", "import { x } from './Utils';\n")
+    importer = tmp_path / "src" / "app.js"
+    target = (tmp_path / "src" / "utils.js").resolve()
+    knowledge_graph.clear_path_caches()
+
+    # Stand in for a case-insensitive filesystem, where resolve() returns the on-disk spelling.
+    def resolve_case_insensitively(path: Path) -> Path:
+        normalized = Path(os.path.normpath(path))
+        return target if normalized.name.casefold() == target.name else normalized
+
+    monkeypatch.setattr(knowledge_graph, "resolved_path", resolve_case_insensitively)
+    existing = {target, importer.resolve()}
+    assert knowledge_graph.resolve_js_module(importer, "./Utils", tmp_path, existing) == target
+    assert knowledge_graph.resolve_js_module(importer, "./Missing", tmp_path, existing) is None
+
+
+def test_compaction_does_not_resummarize_sources_it_could_not_delete(tmp_path: Path, monkeypatch) -> None:
+    sessions_dir = tmp_path / ".codex" / "sessions"
+    for day in ("01", "02"):
+        session = sessions_dir / f"2024-01-{day}.md"
+        write(session, f"# Session Summary: 2024-01-{day}\n- Commits: 1\n")
+        os.utime(session, (1_704_067_200, 1_704_067_200))
+
+    locked = sessions_dir / "2024-01-01.md"
+    original_unlink = os.unlink
+
+    def unlink(path, *args, **kwargs) -> None:
+        if Path(path) == locked:
+            raise PermissionError(str(path))
+        original_unlink(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "unlink", unlink)
+    for _ in range(2):
+        compact_context.compact_sessions(tmp_path, dry_run=False, max_age_days=0, keep_latest=0, generated_at="now")
+
+    archive = (sessions_dir / "archive" / "2024-summary.md").read_text(encoding="utf-8")
+    assert archive.count("- Source: 2024-01-01.md") == 1
+    assert archive.count("- Source: 2024-01-02.md") == 1
+    assert locked.exists()
+
+    monkeypatch.setattr(os, "unlink", original_unlink)
+    compact_context.compact_sessions(tmp_path, dry_run=False, max_age_days=0, keep_latest=0, generated_at="now")
+    assert not locked.exists()
+    assert not (sessions_dir / "archive" / compact_context.COMPACTED_INDEX_NAME).exists()
+
+
+def test_compaction_parses_iso_dates_like_fromisoformat() -> None:
+    for value in ("2024-01-31", "2024-01-31T10:00", "20240131", "20240131-notes", "2024-13-40", "notes", ""):
+        try:
+            expected = date.fromisoformat(value.strip()[:10])
+        except ValueError:
+            expected = None
+        assert compact_context.parse_iso_date(value) == expected
+
+    if sys.version_info >= (3, 11):
+        assert compact_context.parse_session_date(None, Path("20240131-notes.md"), 0.0) == date(2024, 1, 31)
+
+
+def test_compaction_date_from_text_uses_the_first_date_token_of_each_line() -> None:
+    assert compact_context.parse_date_from_text("Date: 2026-13-40 moved to 2026-02-01") is None
+    assert compact_context.parse_date_from_text("Date: 2026-13-40 moved\nDone 2026-02-01") == date(2026, 2, 1)
+    assert compact_context.parse_date_from_text("  2024-01-31T10:00 standup") == date(2024, 1, 31)
+    assert compact_context.parse_date_from_text("no dates here") is None
+
+
 def test_codebase_index_reports_chunk_and_symbol_truncation(tmp_path: Path) -> None:
     symbols = "\n".join(f"def generated_{index}():\n    return {index}\n" for index in range(240))
     write(tmp_path / "src" / "many_symbols.py", symbols)
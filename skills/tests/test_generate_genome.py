@@ -143,3 +143,36 @@ def test_generate_genome_handles_empty_repo(tmp_path: Path) -> None:
     assert payload["status"] == "generated"
     assert payload["total_files"] == 0
     assert "Not detected" in genome_text
+
+
+def test_generate_genome_lists_django_path_routes(tmp_path: Path) -> None:
+    write(
+        tmp_path / "api" / "urls.py",
+        """
+        from django.urls import path
+        urlpatterns = [path('users/', views.users), path('users/<int:pk>/', views.user_detail)]
+        """,
+    )
+
+    payload = run_genome(tmp_path, "--sections", "api", "--format", "json")
+
+    routes = payload["sections"]["api"]["routes"]
+    assert any("PATH users/<int:pk>/" in route for route in routes)
+
+
+def test_generate_genome_reuses_cached_report_until_a_file_changes(tmp_path: Path) -> None:
+    write(tmp_path / "app.py", "from fastapi import FastAPI\napp = FastAPI()\n")
+
+    first = run_genome(tmp_path, "--format", "json")
+    second = run_genome(tmp_path, "--format", "json")
+    forced = run_genome(tmp_path, "--format", "json", "--force")
+    write(tmp_path / "app.py", "from fastapi import FastAPI\napp = FastAPI()\n\n@app.get('/health')\ndef health():\n    return {}\n")
+    changed = run_genome(tmp_path, "--format", "json")
+    (tmp_path / "newdir" / "sub").mkdir(parents=True)
+    new_directory = run_genome(tmp_path, "--format", "json")
+
+    assert (first["cached"], second["cached"], forced["cached"], changed["cached"]) == (False, True, False, False)
+    assert second["sections"] == first["sections"]
+    assert changed["total_lines"] > first["total_lines"]
+    assert new_directory["cached"] is False
+    assert "newdir/sub/" in "\n".join(new_directory["sections"]["file_map"]["directory_tree"])
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import importlib.util
 import json
+import subprocess
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Set
@@ -63,6 +64,10 @@ map_changes_to_docs = load_script_module(
     "skills_map_changes_to_docs",
     "codex-docs-change-sync/scripts/map_changes_to_docs.py",
 )
+generate_changelog = load_script_module(
+    "skills_generate_changelog",
+    "codex-project-memory/scripts/generate_changelog.py",
+)
 
 
 def write_text(path: Path, text: str) -> None:
@@ -899,3 +904,71 @@ def test_docs_build_report_ok_with_mocked_git(tmp_path: Path, monkeypatch: pytes
     doc_paths = {item["doc_path"] for item in report["docs_candidates"]}
     assert "README.md" in doc_paths
     assert "CHANGELOG.md" in doc_paths
+
+
+def test_changelog_stream_git_survives_stderr_larger_than_a_pipe_buffer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    script = (
+        "import sys; sys.stderr.write('w' * 1_000_000); sys.stderr.flush(); "
+        "sys.stdout.write('first\\x00second\\x00'); sys.exit(1)"
+    )
+    real_popen = subprocess.Popen
+    monkeypatch.setattr(
+        generate_changelog.subprocess,
+        "Popen",
+        lambda _args, **kwargs: real_popen([sys.executable, "-c", script], **kwargs),
+    )
+    monkeypatch.setattr(generate_changelog, "GIT_TIMEOUT_SECONDS", 10)
+    records: List[str] = []
+
+    result = generate_changelog.stream_git(tmp_path, ["log"], records.append)
+
+    assert result is not None
+    assert result[0] == 1
+    assert len(result[1]) == 1_000_000
+    assert records == ["first", "second"]
+
+
+def test_changelog_classifier_set_matches_regex_classifier(monkeypatch: pytest.MonkeyPatch) -> None:
+    class FakeSet:
+        def __init__(self) -> None:
+            self.patterns: List[Any] = []
+
+        @classmethod
+        def SearchSet(cls) -> "FakeSet":
+            return cls()
+
+        def Add(self, pattern: str) -> int:
+            self.patterns.append(generate_changelog.re.compile(pattern))
+            return len(self.patterns) - 1
+
+        def Compile(self) -> None:
+            return None
+
+        def Match(self, text: str) -> Any:
+            return [index for index, pattern in enumerate(self.patterns) if pattern.search(text)] or None
+
+    subjects = [
+        "feat: add export",
+        "Fix crash on empty input",
+        "chore: bump deps",
+        "merge branch 'main'",
+        "test: cover parser",
+        "docs: update readme",
+        "refactor!: breaking API cleanup",
+        "Improve fixture docs",
+        "rename module",
+        "",
+    ]
+    monkeypatch.setattr(generate_changelog, "CLASSIFIER_SET", None)
+    expected = [generate_changelog.classify_subject(subject) for subject in subjects]
+
+    # pyre2 also imports as re2 but has no Set; the script must fall back instead of failing at import.
+    monkeypatch.setattr(generate_changelog, "re2", type(sys)("re2"))
+    assert generate_changelog.build_classifier_set() is None
+
+    fake_re2 = type(sys)("re2")
+    fake_re2.Set = FakeSet  # type: ignore[attr-defined]
+    monkeypatch.setattr(generate_changelog, "re2", fake_re2)
+    monkeypatch.setattr(generate_changelog, "CLASSIFIER_SET", generate_changelog.build_classifier_set())
+    assert generate_changelog.CLASSIFIER_SET is not None
+    assert [generate_changelog.classify_subject(subject) for subject in subjects] == expected